@@ -0,0 +1,38 @@
+"""
+Runs the benchmark suite.
+
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 1.5
+"""
+import argparse
+import sys
+
+from benchmarks.cases import CASES
+from benchmarks.harness import run, save_baseline, load_baseline, compare
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="fail when a case is slower than this baseline")
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help="allowed slowdown factor before a case counts as a regression (default: 1.5)")
+    parser.add_argument('--filter', metavar='TEXT', help="only run cases whose name contains TEXT")
+    parser.add_argument('--repeat', type=int, default=5, help="timing repeats per case (default: 5)")
+    args = parser.parse_args(argv)
+
+    results = run(CASES, args.filter, args.repeat)
+    if args.save:
+        save_baseline(results, args.save)
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression.name}: {regression.baseline_ops_per_second:.1f} -> "
+                  f"{regression.ops_per_second:.1f} ops/s ({regression.slowdown:.2f}x slower)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""Compares the single-matrix affine helpers, called in a loop, with their batched counterparts."""
+import timeit
+
+import numpy as np
+
+from common.affine import rotational_affine, affine_matrix_from_rotation_and_translation
+from common.batched_affine import rotational_affines, affine_matrices_from_rotations_and_translations
+
+
+def bench(label: str, statement, number: int):
+    seconds = min(timeit.repeat(statement, number=number, repeat=5)) / number
+    print(f"{label:<55}{seconds * 1e6:>12.2f} us")
+    return seconds
+
+
+def main(sizes=(1, 10, 100, 1000)):
+    for size in sizes:
+        angles = np.linspace(0, 360, size)
+        translations = np.column_stack([np.cos(angles), np.sin(angles)])
+        out = np.empty((size, 4, 4))
+        number = max(1, 2000 // size)
+        print(f"--- N = {size}")
+        loop_time = bench("rotational_affine (loop)",
+                           lambda: [rotational_affine('z', angle) for angle in angles], number)
+        batched_time = bench("rotational_affines (closed form)", lambda: rotational_affines('z', angles), number)
+        bench("rotational_affines (closed form, out=)", lambda: rotational_affines('z', angles, out=out), number)
+        bench("affine_matrix_from_rotation_and_translation (loop)",
+              lambda: [affine_matrix_from_rotation_and_translation(angle, translation)
+                       for angle, translation in zip(angles, translations)], number)
+        bench("affine_matrices_from_rotations_and_translations",
+              lambda: affine_matrices_from_rotations_and_translations(angles, translations, out=out), number)
+        print(f"{'speed-up (rotation)':<55}{loop_time / batched_time:>12.1f} x")
+
+
+if __name__ == '__main__':
+    main()
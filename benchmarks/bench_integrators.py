@@ -0,0 +1,67 @@
+"""
+Error versus wall time of every integrator for each wheeled model.
+
+Commands are piecewise constant (one per control period), so the exact integrator run at the control period is
+the true solution; every other run is compared against it at the end of the horizon.
+"""
+import time
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.integrators import INTEGRATORS
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+CONTROL_PERIOD = 1.0
+SUBSTEPS = (1, 2, 5, 10, 20, 50, 100)
+
+
+def run_unicycle(integrator, commands, dt, substeps):
+    robot = UnicycleRobot(0.5, 0.2, integrator=integrator)
+    for command in commands:
+        for _ in range(substeps):
+            robot.update_position(command, dt)
+    return np.array([robot.x, robot.y])
+
+
+def run_ackermann(integrator, commands, dt, substeps):
+    car = AckermannCar(integrator=integrator)
+    for velocity, steering_angle in commands:
+        for _ in range(substeps):
+            car.update(velocity, steering_angle, dt)
+    return car.state[:2].copy()
+
+
+def run_omnidirectional(integrator, commands, dt, substeps):
+    robot = RadialOmnidirectionalRobot(3, 0.3, wheel_diameter=0.1, integrator=integrator)
+    for motor_velocities in commands:
+        for _ in range(substeps):
+            robot.move(dt, motor_velocities)
+    return np.array(robot.position, dtype=float)
+
+
+def main(num_commands=10, seed=0):
+    rng = np.random.default_rng(seed)
+    models = {
+        'UnicycleRobot': (run_unicycle, rng.uniform(-10, 10, (num_commands, 2))),
+        'AckermannCar': (run_ackermann, np.column_stack([rng.uniform(1, 5, num_commands),
+                                                        rng.uniform(-30, 30, num_commands)])),
+        'OmnidirectionalRobot': (run_omnidirectional, rng.uniform(-20, 20, (num_commands, 3))),
+    }
+    print(f"{'model':<22}{'integrator':<10}{'dt':>8}{'wall time (ms)':>16}{'position error':>16}")
+    for model, (run, commands) in models.items():
+        reference = run('exact', commands, CONTROL_PERIOD, 1)
+        for name in INTEGRATORS:
+            for substeps in SUBSTEPS:
+                dt = CONTROL_PERIOD / substeps
+                start = time.perf_counter()
+                position = run(name, commands, dt, substeps)
+                elapsed = time.perf_counter() - start
+                error = np.linalg.norm(position - reference)
+                print(f"{model:<22}{name:<10}{dt:>8.3f}{elapsed * 1e3:>16.3f}{error:>16.3e}")
+
+
+if __name__ == '__main__':
+    main()
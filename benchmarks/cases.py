@@ -0,0 +1,258 @@
+"""Reproducible benchmark cases for the affine, wheeled-robot and link-chain hot paths."""
+import itertools
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from benchmarks.harness import BenchmarkCase
+
+
+def _rng():
+    return np.random.default_rng(0)
+
+
+# --- imports, each in a fresh interpreter so that nothing is cached
+
+
+def _fresh_import(module: str):
+    command = [sys.executable, '-c', f'import {module}']
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return lambda: subprocess.run(command, cwd=root, check=True)
+
+
+# --- common/affine.py
+
+
+def _rotational_affine():
+    from common.affine import rotational_affine
+    return lambda: rotational_affine('z', 30.0)
+
+
+def _affine_from_rotation_and_translation():
+    from common.affine import affine_matrix_from_rotation_and_translation
+    translation = np.array([0.5, 0.2])
+    return lambda: affine_matrix_from_rotation_and_translation(30.0, translation)
+
+
+def _batched_rotational_affines():
+    from common.batched_affine import rotational_affines
+    angles, out = _rng().uniform(0, 360, 1000), np.empty((1000, 4, 4))
+    return lambda: rotational_affines('z', angles, out=out)
+
+
+# --- car_robot.py
+
+
+def _ackermann_update():
+    from kinematic_models.wheeled_robots.car_robot import AckermannCar
+    car = AckermannCar()
+    return lambda: car.update(2.0, 10.0, 0.01)
+
+
+def _ackermann_update_loop():
+    from kinematic_models.wheeled_robots.car_robot import AckermannCar
+    car = AckermannCar()
+    velocities, steering_angles = _rng().uniform(0, 5, 1000), _rng().uniform(-30, 30, 1000)
+
+    def loop():
+        for velocity, steering_angle in zip(velocities, steering_angles):
+            car.update(velocity, steering_angle, 0.01)
+    return loop
+
+
+def _ackermann_rollout():
+    from kinematic_models.wheeled_robots.car_robot import AckermannCar
+    car = AckermannCar()
+    velocities, steering_angles = _rng().uniform(0, 5, 1000), _rng().uniform(-30, 30, 1000)
+    return lambda: car.rollout(velocities, steering_angles, 0.01)
+
+
+def _ackermann_batched_rollout():
+    from kinematic_models.wheeled_robots.car_robot import ackermann_rollout
+    velocities, steering_angles = _rng().uniform(0, 5, (256, 50)), _rng().uniform(-30, 30, (256, 50))
+    out = np.empty((256, 50, 6))
+    return lambda: ackermann_rollout(np.zeros(6), velocities, steering_angles, 0.02, out=out)
+
+
+def _mppi_command():
+    from kinematic_models.wheeled_robots.mppi import MPPIController
+    angles = np.linspace(0, 1.5 * np.pi, 300)
+    path = np.column_stack([10 * np.sin(angles), 10 - 10 * np.cos(angles)])
+    controller = MPPIController(path, num_samples=1024, horizon=30, dt=0.05, seed=0)
+    state = np.zeros(6)
+    return lambda: controller.command(state)
+
+
+# --- omni_wheel.py / omnidirectional_robot.py
+
+
+def _radial_robot():
+    from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+        RadialOmnidirectionalRobot
+    return RadialOmnidirectionalRobot(4, 1.0, motor_velocities=np.array([1.0, 2.0, -1.0, 0.5]))
+
+
+def _wheel_velocity_components():
+    wheel = _radial_robot().wheels[1]
+    return lambda: wheel.get_velocity_components(2.0)
+
+
+def _omni_global_velocity():
+    robot = _radial_robot()
+    return robot.global_velocity
+
+
+def _omni_move():
+    robot = _radial_robot()
+    return lambda: robot.move(0.01)
+
+
+def _omni_simulate():
+    robot = _radial_robot()
+    motor_velocities = _rng().uniform(-5, 5, (10000, 4))
+    return lambda: robot.simulate(motor_velocities, 0.01)
+
+
+def _omni_inverse_kinematics():
+    robot = _radial_robot()
+    twists = _rng().uniform(-1, 1, (10000, 3))
+    return lambda: robot.motor_velocities_from_twist(twists, max_wheel_speed=5.0)
+
+
+# --- unicycle_robot.py
+
+
+def _unicycle_update():
+    from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+    robot = UnicycleRobot(0.5, 0.2)
+    return lambda: robot.update_position([1.0, 2.0], 0.01)
+
+
+def _unicycle_fleet():
+    from kinematic_models.wheeled_robots.unicycle_fleet import UnicycleFleet
+    fleet = UnicycleFleet(10000, 0.5, 0.2)
+    motor_velocities = _rng().uniform(-5, 5, (10000, 2))
+    return lambda: fleet.update_position(motor_velocities, 0.01)
+
+
+# --- spatial_index.py
+
+
+def _spatial_index_update_and_query():
+    from kinematic_models.wheeled_robots.spatial_index import SpatialIndex
+    rng = _rng()
+    index = SpatialIndex()
+    index.add_circles(rng.uniform(0, 300, (5000, 2)), rng.uniform(0.3, 0.6, 5000))
+    index.add_rectangles(rng.uniform(0, 300, (5000, 2)), 2.0, 1.0, rng.uniform(-np.pi, np.pi, 5000))
+    steps = rng.normal(0, 0.05, (10000, 2))
+
+    def update():
+        index.update(index.centers + steps)
+        return index.overlapping_pairs()
+    return update
+
+
+# --- lidar.py
+
+
+def _lidar_scan():
+    from kinematic_models.wheeled_robots.lidar import Lidar, OccupancyGrid
+    rng = _rng()
+    grid = OccupancyGrid.empty((40, 40), 0.05)
+    grid.add_border()
+    for center, radius in zip(rng.uniform(2, 38, (60, 2)), rng.uniform(0.2, 1.5, 60)):
+        grid.add_circle(center, radius)
+    poses = np.column_stack([rng.uniform(2, 38, (200, 2)), rng.uniform(-np.pi, np.pi, 200)])
+    lidar = Lidar(360, max_range=30.0)
+    grid.mirrored_clearance  # built once, outside the timed scans
+    return lambda: lidar.scan(grid, poses)
+
+
+# --- robot_link.py / link chains
+
+
+def _arm_links():
+    from robotic_models.affine_based.robot_link import RotationalLink, TranslationalLink
+    return [RotationalLink('z', 0.3), RotationalLink('y', [0, 0, 0.5], initial_frame_rotation=[('x', 90)]),
+            RotationalLink('y', [0, 0, 0.6]), TranslationalLink('tz', [0, 0, 0.1]),
+            RotationalLink('z', [0, 0, 0.4]), RotationalLink('y', [0, 0, 0.2])]
+
+
+def _link_set_state():
+    link = _arm_links()[1]
+    return lambda: link.set_state(45.0)
+
+
+def _chain_tip_update():
+    from robotic_models.affine_based.kinematic_chain import KinematicChain
+    chain = KinematicChain(_arm_links())
+    states = itertools.cycle(_rng().uniform(-90, 90, (64, 6)))
+
+    def update():
+        chain.set_joint_states(next(states))
+        return chain.tip
+    return update
+
+
+def _chain_last_joint_update():
+    from robotic_models.affine_based.kinematic_chain import KinematicChain
+    chain = KinematicChain(_arm_links())
+    angles = itertools.cycle(_rng().uniform(-90, 90, 64).tolist())
+
+    def update():
+        chain.set_joint_state(5, next(angles))
+        return chain.tip
+    return update
+
+
+def _chain_forward_batch():
+    from robotic_models.affine_based.kinematic_chain import KinematicChain
+    chain = KinematicChain(_arm_links())
+    states = _rng().uniform(-90, 90, (1000, 6))
+    return lambda: chain.forward_batch(states)
+
+
+def _compiled_chain_forward_batch():
+    from robotic_models.affine_based.chain_compiler import compile_chain
+    compiled = compile_chain(_arm_links())
+    states = _rng().uniform(-90, 90, (1000, 6))
+    return lambda: compiled.forward_batch(states)
+
+
+def _chain_jacobian_batch():
+    from robotic_models.affine_based.jacobian import batched_geometric_jacobian
+    from robotic_models.affine_based.kinematic_chain import KinematicChain
+    chain = KinematicChain(_arm_links())
+    states = _rng().uniform(-90, 90, (1000, 6))
+    return lambda: batched_geometric_jacobian(chain, states)
+
+
+CASES = [
+    BenchmarkCase('import.car_robot', lambda: _fresh_import('kinematic_models.wheeled_robots.car_robot'), 5),
+    BenchmarkCase('import.rendering', lambda: _fresh_import('kinematic_models.wheeled_robots.rendering'), 5),
+    BenchmarkCase('affine.rotational_affine', _rotational_affine, 1000),
+    BenchmarkCase('affine.affine_matrix_from_rotation_and_translation', _affine_from_rotation_and_translation, 1000),
+    BenchmarkCase('batched_affine.rotational_affines[1000]', _batched_rotational_affines, 200),
+    BenchmarkCase('car.update', _ackermann_update, 1000),
+    BenchmarkCase('car.update_loop[1000]', _ackermann_update_loop, 3),
+    BenchmarkCase('car.rollout[1000]', _ackermann_rollout, 200),
+    BenchmarkCase('car.batched_rollout[256x50]', _ackermann_batched_rollout, 50),
+    BenchmarkCase('mppi.command[1024x30]', _mppi_command, 20),
+    BenchmarkCase('omni_wheel.get_velocity_components', _wheel_velocity_components, 1000),
+    BenchmarkCase('omni.global_velocity', _omni_global_velocity, 1000),
+    BenchmarkCase('omni.move', _omni_move, 1000),
+    BenchmarkCase('omni.simulate[10000]', _omni_simulate, 20),
+    BenchmarkCase('omni.motor_velocities_from_twist[10000]', _omni_inverse_kinematics, 50),
+    BenchmarkCase('unicycle.update_position', _unicycle_update, 1000),
+    BenchmarkCase('unicycle_fleet.update_position[10000]', _unicycle_fleet, 200),
+    BenchmarkCase('spatial_index.update+overlapping_pairs[10000]', _spatial_index_update_and_query, 20),
+    BenchmarkCase('lidar.scan[200x360]', _lidar_scan, 5),
+    BenchmarkCase('robot_link.set_state', _link_set_state, 1000),
+    BenchmarkCase('chain.set_joint_states+tip', _chain_tip_update, 500),
+    BenchmarkCase('chain.set_joint_state(last)+tip', _chain_last_joint_update, 500),
+    BenchmarkCase('chain.forward_batch[1000]', _chain_forward_batch, 50),
+    BenchmarkCase('chain_compiler.forward_batch[1000]', _compiled_chain_forward_batch, 50),
+    BenchmarkCase('jacobian.batched_geometric_jacobian[1000]', _chain_jacobian_batch, 50),
+]
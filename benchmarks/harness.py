@@ -0,0 +1,96 @@
+"""
+Benchmark harness: runs registered cases, records ops/sec and tracemalloc allocations, and compares the results
+with a JSON baseline.
+"""
+import json
+import platform
+import time
+import tracemalloc
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+
+class BenchmarkCase(NamedTuple):
+    name: str
+    setup: Callable[[], Callable[[], object]]  # builds the state and returns the operation to time
+    number: int = 100  # operations per timing repeat
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    ops_per_second: float
+    allocated_blocks: int  # memory blocks allocated by one operation and still alive when it returns
+    peak_bytes: int  # peak traced memory during one operation
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline_ops_per_second: float
+    ops_per_second: float
+    slowdown: float
+
+
+def measure(case: BenchmarkCase, repeat: int = 5) -> BenchmarkResult:
+    """Best-of-repeat throughput, then one traced operation for its allocations."""
+    operation = case.setup()
+    operation()  # warm up caches and lazy imports
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(case.number):
+            operation()
+        best = min(best, (time.perf_counter() - start) / case.number)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = operation()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+    return BenchmarkResult(case.name, 1 / best if best > 0 else float('inf'), blocks, peak - base)
+
+
+def run(cases: list[BenchmarkCase], pattern: str = None, repeat: int = 5, report=print) -> list[BenchmarkResult]:
+    results = []
+    for case in cases:
+        if pattern and pattern not in case.name:
+            continue
+        result = measure(case, repeat)
+        report(f"{result.name:<48}{result.ops_per_second:>14.1f} ops/s{result.allocated_blocks:>10} blocks"
+               f"{result.peak_bytes / 1024:>12.1f} KiB peak")
+        results.append(result)
+    return results
+
+
+def save_baseline(results: list[BenchmarkResult], path: str):
+    baseline = {'machine': platform.platform(), 'python': platform.python_version(), 'numpy': np.__version__,
+                'results': {result.name: result._asdict() for result in results}}
+    with open(path, 'w') as file:
+        json.dump(baseline, file, indent=2)
+
+
+def load_baseline(path: str) -> dict[str, BenchmarkResult]:
+    with open(path) as file:
+        baseline = json.load(file)
+    return {name: BenchmarkResult(**result) for name, result in baseline['results'].items()}
+
+
+def compare(results: list[BenchmarkResult], baseline: dict[str, BenchmarkResult],
+            threshold: float = 1.5) -> list[Regression]:
+    """Cases whose throughput dropped by more than the threshold factor; cases missing from the baseline pass."""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            continue
+        slowdown = reference.ops_per_second / result.ops_per_second
+        if slowdown > threshold:
+            regressions.append(Regression(result.name, reference.ops_per_second, result.ops_per_second, slowdown))
+    return regressions
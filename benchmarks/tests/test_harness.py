@@ -0,0 +1,42 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmarks.__main__ import main
+from benchmarks.cases import CASES
+from benchmarks.harness import BenchmarkCase, BenchmarkResult, measure, save_baseline, load_baseline, compare
+
+
+class TestHarness(TestCase):
+    def test_measure_counts_allocations(self):
+        result = measure(BenchmarkCase('allocate', lambda: lambda: [object() for _ in range(100)], 10), repeat=1)
+        self.assertGreater(result.ops_per_second, 0)
+        self.assertGreaterEqual(result.peak_bytes, 0)
+        self.assertEqual(result.name, 'allocate')
+
+    def test_baseline_round_trip(self):
+        results = [BenchmarkResult('a', 100.0, 3, 1024), BenchmarkResult('b', 10.0, 0, 0)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(results, path)
+            self.assertEqual(load_baseline(path), {result.name: result for result in results})
+
+    def test_compare_threshold(self):
+        baseline = {'fast': BenchmarkResult('fast', 100.0, 0, 0), 'slow': BenchmarkResult('slow', 100.0, 0, 0)}
+        results = [BenchmarkResult('fast', 80.0, 0, 0), BenchmarkResult('slow', 50.0, 0, 0),
+                   BenchmarkResult('new', 1.0, 0, 0)]
+        regressions = compare(results, baseline, threshold=1.5)
+        self.assertEqual([regression.name for regression in regressions], ['slow'])
+        self.assertAlmostEqual(regressions[0].slowdown, 2.0)
+
+    def test_case_names_are_unique(self):
+        names = [case.name for case in CASES]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_cli_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline([BenchmarkResult('unicycle.update_position', 1e12, 0, 0)], path)
+            arguments = ['--filter', 'unicycle.update_position', '--repeat', '1', '--compare', path]
+            self.assertEqual(main(arguments), 1)
+            self.assertEqual(main(arguments + ['--threshold', '1e13']), 0)
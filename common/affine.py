@@ -1,15 +1,16 @@
 import numpy as np
-from scipy.spatial.transform import Rotation
 
+from common.batched_affine import rotational_affines
+from common.profiling import hot_path
 
+
+@hot_path
 def rotational_affine(axis: str, angle: float, degrees=True) -> np.ndarray:
-    if axis not in 'xyz':
-        raise ValueError(f"Invalid axis: {axis}")
-    rotation_matrix = np.eye(4)
-    rotation_matrix[:3, :3] = Rotation.from_euler(axis, angle, degrees=degrees).as_matrix()
-    return rotation_matrix
+    """Calculates a single-axis rotation affine matrix in closed form."""
+    return rotational_affines(axis, angle, degrees=degrees)
 
 
+@hot_path
 def translational_affine(axis: str, displacement: float) -> np.ndarray:
     """Calculates a translational affine matrix for a specific displacement."""
     if axis not in ["tx", "ty", "tz"]:
@@ -25,6 +26,7 @@ def translational_affine(axis: str, displacement: float) -> np.ndarray:
     return transform
 
 
+@hot_path
 def affine_matrix_from_rotation_and_translation(rotation: float, translation: np.ndarray, axis='z', degrees=True) \
         -> np.ndarray:
     """Calculates the affine matrix from an axis rotation and a translation vector."""
@@ -33,7 +35,6 @@ def affine_matrix_from_rotation_and_translation(rotation: float, translation: np
             np.array([translation[0], translation[1], 0]))
     else:
         raise ValueError("Translation vector must have 3 elements.")
-    rotation_matrix = np.eye(4)
-    rotation_matrix[:3, :3] = Rotation.from_euler(axis, rotation, degrees=degrees).as_matrix()
+    rotation_matrix = rotational_affines(axis, rotation, degrees=degrees)
     rotation_matrix[:3, 3] = translation
     return rotation_matrix
@@ -0,0 +1,86 @@
+import numpy as np
+from numpy import ndarray
+
+# Rows and columns of the 3x3 block holding (cos, -sin, sin, cos) for each single-axis rotation
+ROTATION_INDICES = {
+    'x': ((1, 1), (1, 2), (2, 1), (2, 2)),
+    'y': ((2, 2), (2, 0), (0, 2), (0, 0)),
+    'z': ((0, 0), (0, 1), (1, 0), (1, 1)),
+}
+# Row of the translation column moved by each single-axis displacement
+TRANSLATION_ROWS = {'tx': 0, 'ty': 1, 'tz': 2}
+
+
+def _identity_stack(shape: tuple, out: ndarray = None) -> ndarray:
+    """Returns an identity stack of the given leading shape, reusing out when provided."""
+    if out is None:
+        out = np.zeros(shape + (4, 4))
+    elif out.shape != shape + (4, 4):
+        raise ValueError(f"Output buffer must have shape {shape + (4, 4)}")
+    else:
+        out[...] = 0
+    np.einsum('...ii->...i', out)[...] = 1  # writable view of the diagonals
+    return out
+
+
+def rotational_affines(axis: str, angles: float | ndarray, degrees=True, out: ndarray = None) -> ndarray:
+    """
+    Closed-form single-axis rotation affine matrices.
+
+    Args:
+        axis (str): 'x', 'y' or 'z'.
+        angles (float or ndarray): A scalar angle or an array of angles (N,).
+        degrees (bool): Whether the angles are given in degrees.
+        out (ndarray): Optional buffer with shape angles.shape + (4, 4).
+
+    Returns:
+        ndarray: A (4, 4) matrix for a scalar angle or a (N, 4, 4) stack.
+    """
+    if axis not in ROTATION_INDICES:
+        raise ValueError(f"Invalid axis: {axis}")
+    angles = np.asarray(angles, dtype=float)
+    if degrees:
+        angles = np.deg2rad(angles)
+    cos, sin = np.cos(angles), np.sin(angles)
+
+    out = _identity_stack(angles.shape, out)
+    (c0_row, c0_col), (ms_row, ms_col), (s_row, s_col), (c1_row, c1_col) = ROTATION_INDICES[axis]
+    out[..., c0_row, c0_col] = cos
+    out[..., ms_row, ms_col] = -sin
+    out[..., s_row, s_col] = sin
+    out[..., c1_row, c1_col] = cos
+    return out
+
+
+def translational_affines(axis: str, displacements: float | ndarray, out: ndarray = None) -> ndarray:
+    """Single-axis translation affine matrices for a scalar or an array of displacements (N,)."""
+    if axis not in TRANSLATION_ROWS:
+        raise ValueError(f"Invalid axis: {axis}")
+    displacements = np.asarray(displacements, dtype=float)
+
+    out = _identity_stack(displacements.shape, out)
+    out[..., TRANSLATION_ROWS[axis], 3] = displacements
+    return out
+
+
+def affine_matrices_from_rotations_and_translations(rotations: float | ndarray, translations: ndarray, axis='z',
+                                                   degrees=True, out: ndarray = None) -> ndarray:
+    """
+    Affine matrices combining a single-axis rotation with a translation vector.
+
+    Args:
+        rotations (float or ndarray): A scalar angle or an array of angles (N,).
+        translations (ndarray): Translation vectors (..., 2) or (..., 3), broadcast against the angles.
+        axis (str): Rotation axis.
+        degrees (bool): Whether the angles are given in degrees.
+        out (ndarray): Optional buffer with the broadcast shape + (4, 4).
+    """
+    translations = np.asarray(translations, dtype=float)
+    if translations.ndim == 0 or not 0 < translations.shape[-1] <= 3:
+        raise ValueError("Translation vectors must have between 1 and 3 elements.")
+    rotations = np.asarray(rotations, dtype=float)
+    shape = np.broadcast_shapes(rotations.shape, translations.shape[:-1])
+
+    out = rotational_affines(axis, np.broadcast_to(rotations, shape), degrees=degrees, out=out)
+    out[..., :translations.shape[-1], 3] = translations
+    return out
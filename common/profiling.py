@@ -0,0 +1,216 @@
+"""
+Opt-in call counters, cumulative timers and Chrome traces for the kinematics hot paths.
+
+Hot functions and methods are registered with the hot_path decorator, which returns them unchanged: while profiling
+is disabled the original functions are the ones in place and cost nothing extra. Enabling profiling swaps timing
+wrappers into their modules and classes; disabling puts the originals back.
+
+Module functions are also rebound where they were imported by name, which is a global side effect: enabling rewrites
+every module-level name bound to a hot function in the imported modules of the packages that registered hot paths
+(common, kinematic_models and robotic_models), test modules excepted. Code outside those packages that imported a hot
+function by name keeps the original and is not profiled; calling it through its module, e.g. affine.rotational_affine,
+always reaches the installed version.
+
+The counters and the trace are shared by all threads and updated under a lock.
+
+Profiling is enabled with the profiling context manager, with enable/disable, or for a whole process with the
+ROBOTICS_PROFILE environment variable: any non-empty value prints the summary table to stderr at exit, and a value
+ending in .json also writes the Chrome trace (chrome://tracing or Perfetto) to that path.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, NamedTuple
+
+ENV_VAR = 'ROBOTICS_PROFILE'
+
+
+class HotPath(NamedTuple):
+    name: str
+    module: str
+    qualname: str
+    original: Callable
+    wrapper: Callable
+
+
+class Profiler:
+    def __init__(self, max_events: int = 1_000_000):
+        """
+        Call counts, cumulative (inclusive) times and trace events of the wrapped functions.
+
+        Args:
+            max_events (int): Trace events kept; later calls are still counted and timed but not traced.
+        """
+        self.max_events = max_events
+        self.trace = True
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls: dict[str, int] = {}
+            self.total_ns: dict[str, int] = {}
+            self.events: list[tuple[str, int, int, int]] = []  # (name, start ns, duration ns, thread)
+            self.dropped_events = 0
+            self.origin_ns = time.perf_counter_ns()
+
+    def record(self, name: str, start_ns: int, end_ns: int):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.total_ns[name] = self.total_ns.get(name, 0) + end_ns - start_ns
+            if self.trace:
+                if len(self.events) < self.max_events:
+                    self.events.append((name, start_ns, end_ns - start_ns, threading.get_ident()))
+                else:
+                    self.dropped_events += 1
+
+    def summary(self) -> list[dict]:
+        """One row per called function, by decreasing cumulative time."""
+        with self._lock:
+            rows = [{'name': name, 'calls': calls, 'total': self.total_ns[name] / 1e9,
+                     'per_call': self.total_ns[name] / calls / 1e9} for name, calls in self.calls.items()]
+        return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+    def summary_table(self) -> str:
+        rows = self.summary()
+        width = max([len('function')] + [len(row['name']) for row in rows])
+        lines = [f"{'function':<{width}} {'calls':>10} {'total ms':>12} {'per call us':>12}"]
+        lines += [f"{row['name']:<{width}} {row['calls']:>10} {row['total'] * 1e3:>12.3f} "
+                  f"{row['per_call'] * 1e6:>12.3f}" for row in rows]
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Trace in the Chrome trace event format: one complete ('X') event per call, times in microseconds."""
+        pid = os.getpid()
+        with self._lock:
+            events = [{'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'ts': (start - self.origin_ns) / 1e3,
+                       'dur': duration / 1e3, 'pid': pid, 'tid': thread}
+                      for name, start, duration, thread in self.events]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'dropped_events': self.dropped_events}}
+
+    def save_chrome_trace(self, path: str):
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
+
+
+PROFILER = Profiler()
+_registry: list[HotPath] = []
+_enabled = False
+_lock = threading.Lock()
+
+
+def _timed(func: Callable, name: str) -> Callable:
+    record = PROFILER.record
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(name, start, clock())
+
+    return wrapper
+
+
+def hot_path(func: Callable) -> Callable:
+    """Registers a function or method for profiling; it is returned as is unless profiling is already enabled."""
+    if func.__module__ not in sys.modules:
+        raise ValueError(f"hot_path must decorate functions of imported modules, got {func.__module__}")
+    prefix = func.__module__.rsplit('.', 1)[-1] if '.' not in func.__qualname__ else ''
+    name = f"{prefix}.{func.__qualname__}" if prefix else func.__qualname__
+    entry = HotPath(name, func.__module__, func.__qualname__, func, _timed(func, name))
+    _registry.append(entry)
+    return entry.wrapper if _enabled else func
+
+
+def registered() -> list[str]:
+    """Names of the registered hot paths."""
+    return [entry.name for entry in _registry]
+
+
+def _importers() -> list[dict]:
+    """Namespaces of the imported modules that may bind hot functions by name, see the module docstring."""
+    packages = {entry.module.split('.')[0] for entry in _registry}
+    return [vars(module) for name, module in list(sys.modules.items())
+            if name.split('.')[0] in packages and 'tests' not in name.split('.')]
+
+
+def _install(entry: HotPath, enabled: bool, importers: list[dict]):
+    new, old = (entry.wrapper, entry.original) if enabled else (entry.original, entry.wrapper)
+    owner = sys.modules[entry.module]
+    *path, attribute = entry.qualname.split('.')
+    for part in path:
+        owner = getattr(owner, part)
+    if owner.__dict__.get(attribute) is new:
+        return
+    setattr(owner, attribute, new)
+    if not path:
+        for namespace in importers:
+            for key, value in list(namespace.items()):
+                if value is old:
+                    namespace[key] = new
+
+
+def enable():
+    """Installs the timing wrappers of every registered hot path."""
+    global _enabled
+    with _lock:
+        importers = _importers()
+        for entry in _registry:
+            _install(entry, True, importers)
+        _enabled = True
+
+
+def disable():
+    """Puts the original functions back."""
+    global _enabled
+    with _lock:
+        importers = _importers()
+        for entry in _registry:
+            _install(entry, False, importers)
+        _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def profiling(reset: bool = True, trace: bool = True):
+    """
+    Profiles the hot paths within a with block and yields the Profiler; the previous state is restored on exit.
+
+    Args:
+        reset (bool): Clear the counters, timers and events first.
+        trace (bool): Keep one trace event per call, for chrome_trace; counters and timers are always kept.
+    """
+    was_enabled, was_tracing = _enabled, PROFILER.trace
+    if reset:
+        PROFILER.reset()
+    PROFILER.trace = trace
+    enable()
+    try:
+        yield PROFILER
+    finally:
+        PROFILER.trace = was_tracing
+        if not was_enabled:
+            disable()
+
+
+def _report_at_exit(destination: str):
+    print(PROFILER.summary_table(), file=sys.stderr)
+    if destination.endswith('.json'):
+        PROFILER.save_chrome_trace(destination)
+
+
+if os.environ.get(ENV_VAR):
+    enable()
+    atexit.register(_report_at_exit, os.environ[ENV_VAR])
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from common.affine import rotational_affine, translational_affine, affine_matrix_from_rotation_and_translation
+from common.batched_affine import (rotational_affines, translational_affines,
+                                   affine_matrices_from_rotations_and_translations)
+
+
+class TestBatchedAffine(TestCase):
+    def setUp(self):
+        self.angles = np.linspace(-400, 400, 37)
+
+    def test_rotational_affines_match_scipy(self):
+        for axis in 'xyz':
+            expected = Rotation.from_euler(axis, self.angles[:, None], degrees=True).as_matrix()
+            np.testing.assert_allclose(rotational_affines(axis, self.angles)[:, :3, :3], expected, atol=1e-12)
+
+    def test_rotational_affines_radians(self):
+        radians = np.deg2rad(self.angles)
+        expected = np.array([rotational_affine('y', angle, degrees=False) for angle in radians])
+        np.testing.assert_allclose(rotational_affines('y', radians, degrees=False), expected, atol=1e-12)
+
+    def test_scalar_angle(self):
+        np.testing.assert_allclose(rotational_affines('z', 30), rotational_affine('z', 30), atol=1e-12)
+
+    def test_translational_affines(self):
+        for axis in ['tx', 'ty', 'tz']:
+            expected = np.array([translational_affine(axis, d) for d in self.angles])
+            np.testing.assert_array_equal(translational_affines(axis, self.angles), expected)
+
+    def test_affine_from_rotations_and_translations(self):
+        translations = np.column_stack([self.angles / 10, -self.angles / 20])
+        expected = np.array([affine_matrix_from_rotation_and_translation(angle, translation)
+                             for angle, translation in zip(self.angles, translations)])
+        np.testing.assert_allclose(affine_matrices_from_rotations_and_translations(self.angles, translations),
+                                   expected, atol=1e-12)
+
+    def test_output_buffer_is_reused(self):
+        out = np.full((len(self.angles), 4, 4), np.nan)
+        result = rotational_affines('x', self.angles, out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, rotational_affines('x', self.angles))
+        translational_affines('tz', self.angles, out=out)
+        np.testing.assert_array_equal(out, translational_affines('tz', self.angles))
+
+    def test_invalid_output_buffer(self):
+        self.assertRaises(ValueError, rotational_affines, 'x', self.angles, out=np.empty((4, 4)))
+
+    def test_invalid_axis(self):
+        self.assertRaises(ValueError, rotational_affines, 'tx', self.angles)
+        self.assertRaises(ValueError, translational_affines, 'x', self.angles)
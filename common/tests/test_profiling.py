@@ -0,0 +1,136 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest import TestCase
+
+import numpy as np
+
+import common.affine
+from common import profiling
+from common.affine import rotational_affine
+from common.profiling import PROFILER, ENV_VAR, profiling as profiled
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.omnidirectional_robots import omni_wheel
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+from robotic_models.affine_based.robot_link import RotationalLink
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ORIGINALS = {'update': AckermannCar.update, 'rotational_affine': common.affine.rotational_affine}
+
+
+class TestProfiling(TestCase):
+    def test_disabled_leaves_functions_untouched(self):
+        self.assertFalse(profiling.is_enabled())
+        self.assertIs(AckermannCar.update, ORIGINALS['update'])
+        self.assertIs(omni_wheel.rotational_affine, ORIGINALS['rotational_affine'])
+        self.assertFalse(hasattr(ORIGINALS['update'], '__wrapped__'))
+
+    def test_counts_calls(self):
+        car = AckermannCar()
+        with profiled() as profiler:
+            self.assertIsNot(AckermannCar.update, ORIGINALS['update'])
+            for _ in range(10):
+                car.update(1.0, 5.0, 0.1)
+        self.assertEqual(profiler.calls['AckermannCar.update'], 10)
+        self.assertEqual(profiler.calls['AckermannCar.body_velocity_from_state'], 10)
+        self.assertGreater(profiler.total_ns['AckermannCar.update'],
+                           profiler.total_ns['AckermannCar.body_velocity_from_state'])
+        self.assertIs(AckermannCar.update, ORIGINALS['update'])
+
+    def test_wraps_imported_names(self):
+        # rotational_affine is bound by name in omni_wheel, which must see the wrapper too
+        robot = RadialOmnidirectionalRobot(3, 1.0, motor_velocities=np.array([1.0, 2.0, 3.0]))
+        with profiled() as profiler:
+            self.assertIsNot(omni_wheel.rotational_affine, ORIGINALS['rotational_affine'])
+            robot.wheels[0].get_velocity_components(1.0)
+            robot.move(0.1)
+        self.assertEqual(profiler.calls['OmniWheel.get_velocity_components'], 1)
+        self.assertGreaterEqual(profiler.calls['affine.rotational_affine'], 1)
+        self.assertEqual(profiler.calls['OmnidirectionalRobot.move'], 1)
+        self.assertIs(omni_wheel.rotational_affine, ORIGINALS['rotational_affine'])
+
+    def test_only_library_modules_rebound(self):
+        # Test modules, like any code outside the library packages, keep the names they imported
+        with profiled() as profiler:
+            self.assertIs(rotational_affine, ORIGINALS['rotational_affine'])
+            rotational_affine('z', 30)
+            common.affine.rotational_affine('z', 30)
+        self.assertEqual(profiler.calls['affine.rotational_affine'], 1)
+
+    def test_threads(self):
+        car = AckermannCar()
+
+        def drive():
+            for _ in range(500):
+                car.body_velocity_from_state()
+
+        with profiled() as profiler:
+            threads = [threading.Thread(target=drive) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(profiler.calls['AckermannCar.body_velocity_from_state'], 2000)
+        self.assertEqual(len(profiler.events), sum(profiler.calls.values()))
+
+    def test_nested_contexts(self):
+        chain = KinematicChain([RotationalLink('z'), RotationalLink('y', translational_offset=1.0)])
+        with profiled():
+            with profiled(reset=False):
+                chain.forward([10, 20])
+            self.assertTrue(profiling.is_enabled())
+            chain.forward([30, 40])
+        self.assertFalse(profiling.is_enabled())
+        self.assertEqual(PROFILER.calls['RotationalLink.joint_transforms'], 4)
+
+    def test_chrome_trace(self):
+        car = AckermannCar()
+        with profiled() as profiler:
+            car.update(1.0, 5.0, 0.1)
+        trace = json.loads(json.dumps(profiler.chrome_trace()))
+        events = {event['name']: event for event in trace['traceEvents']}
+        self.assertTrue(all(event['ph'] == 'X' for event in trace['traceEvents']))
+        outer, inner = events['AckermannCar.update'], events['AckermannCar.get_robot_velocity']
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertGreaterEqual(outer['ts'] + outer['dur'], inner['ts'] + inner['dur'])
+
+    def test_event_limit_and_no_trace(self):
+        car = AckermannCar()
+        PROFILER.max_events = 3
+        try:
+            with profiled() as profiler:
+                for _ in range(5):
+                    car.update(1.0, 5.0, 0.1)
+            self.assertEqual(len(profiler.events), 3)
+            self.assertGreater(profiler.dropped_events, 0)
+        finally:
+            PROFILER.max_events = 1_000_000
+        with profiled(trace=False) as profiler:
+            car.update(1.0, 5.0, 0.1)
+        self.assertEqual(profiler.events, [])
+        self.assertEqual(profiler.calls['AckermannCar.update'], 1)
+
+    def test_summary_table(self):
+        with profiled() as profiler:
+            common.affine.rotational_affine('z', 30)
+        self.assertEqual([row['name'] for row in profiler.summary()], ['affine.rotational_affine'])
+        self.assertIn('affine.rotational_affine', profiler.summary_table().splitlines()[1])
+
+    def test_environment_variable(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            code = ("from kinematic_models.wheeled_robots.car_robot import AckermannCar\n"
+                    "car = AckermannCar()\n"
+                    "for _ in range(3): car.update(1.0, 5.0, 0.1)\n")
+            result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True,
+                                    env={**os.environ, ENV_VAR: path, 'PYTHONPATH': ROOT})
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertRegex(result.stderr, r'AckermannCar\.update\s+3 ')
+            with open(path) as file:
+                names = [event['name'] for event in json.load(file)['traceEvents']]
+            self.assertEqual(names.count('AckermannCar.update'), 3)
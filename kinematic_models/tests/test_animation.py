@@ -0,0 +1,144 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+from matplotlib import patches
+
+from kinematic_models.wheeled_robots import rendering
+from kinematic_models.wheeled_robots.animation import (CarLayer, Layer, OmnidirectionalLayer,
+                                                       RobotAnimation, headless_axes)
+from kinematic_models.wheeled_robots.car_robot import AckermannCar, ackermann_rollout
+from kinematic_models.wheeled_robots.nonholonomic_robot import NonholonomicRobot
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+
+
+def patch_corners(patch: patches.Rectangle) -> np.ndarray:
+    return patch.get_patch_transform().transform(patch.get_path().vertices)[:4]
+
+
+class TestCarLayer(TestCase):
+    def setUp(self):
+        self.car = NonholonomicRobot(arm_offset=np.array([0.5, 0.2]), arm_length=1.5, arm_angle=30)
+        rng = np.random.default_rng(0)
+        self.steering = rng.uniform(-20, 20, (50, 3))
+        self.states = ackermann_rollout(np.zeros(6), np.full((3, 50), 2.0), self.steering.T, 0.1).swapaxes(0, 1)
+        self.layer = CarLayer.from_car(self.car, self.states, steering_angles=self.steering)
+        self.animation = RobotAnimation([self.layer])
+
+    def test_matches_draw(self):
+        self.layer.update(20)
+        for robot in range(3):
+            self.car.state = self.states[20, robot].copy()
+            ax = headless_axes()
+            self.car.draw(ax)
+            np.testing.assert_allclose(self.layer.bodies.get_paths()[robot].vertices[:4],
+                                       patch_corners(ax.patches[0]), atol=1e-9)
+            np.testing.assert_allclose(self.layer.axles.get_segments()[robot], ax.lines[0].get_xydata(), atol=1e-12)
+            np.testing.assert_allclose(self.layer.arms.get_segments()[robot], ax.lines[-1].get_xydata(), atol=1e-12)
+
+    def test_steering_in_car_units(self):
+        self.layer.update(7)
+        front, tip = self.layer.steering.get_segments()[1]
+        expected = self.states[7, 1, 2] + np.deg2rad(self.steering[7, 1])
+        self.assertAlmostEqual(np.arctan2(*(tip - front)[::-1]), np.arctan2(np.sin(expected), np.cos(expected)))
+
+    def test_artists_are_reused(self):
+        artists = list(self.animation.artists)
+        children = len(self.animation.ax.get_children())
+        for _ in self.animation.render_frames():
+            pass
+        self.assertEqual([id(artist) for artist in self.animation.artists], [id(artist) for artist in artists])
+        self.assertEqual(len(self.animation.ax.get_children()), children)
+        self.assertTrue(all(artist.get_animated() for artist in artists))
+
+    def test_invalid_states(self):
+        with self.assertRaises(ValueError):
+            CarLayer(np.zeros((10, 5)))
+        with self.assertRaises(ValueError):
+            CarLayer(self.states, steering_angles=np.zeros(7))
+
+
+class TestOmnidirectionalLayer(TestCase):
+    def setUp(self):
+        self.robot = RadialOmnidirectionalRobot(3, 1.0)
+        self.result = self.robot.simulate(np.tile([1.0, -2.0, 0.5], (40, 1)), 0.1)
+        self.layer = OmnidirectionalLayer.from_simulation(self.robot, self.result)
+        RobotAnimation([self.layer])
+
+    def test_matches_plot_velocity(self):
+        self.layer.update(25)
+        position, orientation = self.result.positions[25], self.result.orientations[25]
+        wheel_paths = self.layer.wheels.get_paths()
+        arrows = np.column_stack([self.layer.wheel_arrows.U, self.layer.wheel_arrows.V])
+        for wheel, path, offset, arrow in zip(self.robot.wheels, wheel_paths, self.layer.wheel_arrows.get_offsets(),
+                                              arrows):
+            np.testing.assert_allclose(path.vertices[:4],
+                                       patch_corners(rendering.wheel_patch(wheel, position, orientation)), atol=1e-9)
+            np.testing.assert_allclose(offset, rendering._wheel_position(wheel, position, orientation), atol=1e-9)
+            velocity = rendering.rotational_affine('z', orientation)[:2, :2] @ \
+                wheel.get_velocity_components(self.result.motor_velocities[24][self.robot.wheels.index(wheel)])
+            np.testing.assert_allclose(arrow, velocity, atol=1e-9)
+        np.testing.assert_allclose(self.layer.bodies.get_offsets()[0], position)
+        np.testing.assert_allclose(self.layer.body_arrows.U[0], self.result.velocities[25, 0])
+
+    def test_many_robots(self):
+        positions = np.stack([self.result.positions, self.result.positions + [5, 0]], axis=1)
+        orientations = np.stack([self.result.orientations, -self.result.orientations], axis=1)
+        layer = OmnidirectionalLayer(self.robot, positions, orientations)
+        RobotAnimation([layer]).draw_frame(3)
+        self.assertEqual(len(layer.wheels.get_paths()), 2 * 3)
+        np.testing.assert_allclose(layer.bodies.get_offsets(), positions[3])
+
+
+class TestRobotAnimation(TestCase):
+    def setUp(self):
+        car = AckermannCar()
+        self.states = car.rollout(np.full(103, 2.0), np.full(103, 10.0), 0.05)
+        self.robot = RadialOmnidirectionalRobot(4, 0.8)
+        self.result = self.robot.simulate(np.tile([1.0, 1.0, -1.0, 0.5], (102, 1)), 0.05)
+        self.layers = [CarLayer.from_car(car, self.states), OmnidirectionalLayer.from_simulation(self.robot,
+                                                                                                 self.result)]
+
+    def test_decimation_keeps_last_state(self):
+        animation = RobotAnimation(self.layers, decimation=25)
+        np.testing.assert_array_equal(animation.frame_indices, [0, 25, 50, 75, 100, 102])
+        np.testing.assert_array_equal(RobotAnimation([CarLayer(self.states[:101])], decimation=25).frame_indices,
+                                      [0, 25, 50, 75, 100])
+
+    def test_render_frames(self):
+        animation = RobotAnimation(self.layers, decimation=50)
+        frames = [frame.copy() for frame in animation.render_frames()]
+        self.assertEqual(len(frames), 4)  # states 0, 50, 100 and 102
+        self.assertEqual(frames[0].shape, (800, 800, 4))
+        self.assertFalse(np.array_equal(frames[0], frames[-1]))
+        # Every frame starts from the restored background, so rendering a state again gives the same image
+        self.assertTrue(np.array_equal(next(animation.render_frames()), frames[0]))
+
+    def test_save_frames(self):
+        animation = RobotAnimation(self.layers, decimation=40)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = animation.save_frames(directory)
+            self.assertEqual([os.path.basename(path) for path in paths],
+                             ['frame_0.png', 'frame_1.png', 'frame_2.png', 'frame_3.png'])
+            self.assertTrue(all(os.path.getsize(path) > 0 for path in paths))
+
+    def test_funcanimation(self):
+        animation = RobotAnimation(self.layers, decimation=10).animate()
+        self.assertTrue(animation._blit)
+        self.assertEqual(len(list(animation.new_frame_seq())), 12)
+
+    def test_invalid_layers(self):
+        with self.assertRaises(ValueError):
+            RobotAnimation([])
+        with self.assertRaises(ValueError):
+            RobotAnimation([CarLayer(self.states), CarLayer(self.states[:10])])
+
+    def test_incomplete_layer(self):
+        class StaticLayer(Layer):
+            def add_to(self, ax):
+                self.artists = []
+
+        self.assertRaises(TypeError, Layer)
+        self.assertRaises(TypeError, StaticLayer)
@@ -0,0 +1,74 @@
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar, ackermann_rollout
+
+
+def stepped_trajectory(car: AckermannCar, velocities, steering_angles, dts):
+    states = []
+    for velocity, steering_angle, dt in zip(velocities, steering_angles, dts):
+        car.update(velocity, steering_angle, dt)
+        states.append(car.state.copy())
+    return np.array(states)
+
+
+class TestAckermannRollout(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.velocities = rng.uniform(-2, 5, 500)
+        self.steering_angles = rng.uniform(-30, 30, 500)
+        self.dts = rng.uniform(0.01, 0.05, 500)
+
+    def test_rollout_matches_update(self):
+        car = AckermannCar(np.array([1.0, -2.0, 0.3, 0, 0, 0]), wheelbase=2.0)
+        trajectory = car.rollout(self.velocities, self.steering_angles, self.dts)
+        expected = stepped_trajectory(car, self.velocities, self.steering_angles, self.dts)
+        self.assertEqual(trajectory.shape, (500, 6))
+        np.testing.assert_allclose(trajectory, expected, rtol=1e-9, atol=1e-9)
+
+    def test_rollout_does_not_modify_car(self):
+        car = AckermannCar()
+        car.rollout(self.velocities, self.steering_angles, 0.1)
+        np.testing.assert_array_equal(car.state, np.zeros(6))
+
+    def test_rollout_in_radians(self):
+        car = AckermannCar(degrees=False)
+        steering_angles = np.deg2rad(self.steering_angles)
+        trajectory = car.rollout(self.velocities, steering_angles, self.dts)
+        expected = stepped_trajectory(car, self.velocities, steering_angles, self.dts)
+        np.testing.assert_allclose(trajectory, expected, rtol=1e-9, atol=1e-9)
+
+    def test_batched_rollout(self):
+        velocities = np.stack([self.velocities, self.velocities[::-1], -self.velocities])
+        steering_angles = np.stack([self.steering_angles, -self.steering_angles, self.steering_angles[::-1]])
+        states = np.array([[0, 0, 0, 0, 0, 0], [1, 1, 1, 0, 0, 0], [-3, 2, 6, 0, 0, 0]], dtype=float)
+
+        trajectories = ackermann_rollout(states, velocities, steering_angles, self.dts, wheelbase=3.0)
+
+        self.assertEqual(trajectories.shape, (3, 500, 6))
+        for state, velocity, steering, trajectory in zip(states, velocities, steering_angles, trajectories):
+            car = AckermannCar(wheelbase=3.0)
+            car.state = state.copy()
+            expected = stepped_trajectory(car, velocity, steering, self.dts)
+            np.testing.assert_allclose(trajectory, expected, rtol=1e-9, atol=1e-9)
+
+    def test_rollout_into_buffer(self):
+        out = np.empty((500, 6))
+        result = ackermann_rollout(np.zeros(6), self.velocities, self.steering_angles, 0.1, out=out)
+        self.assertIs(result, out)
+
+    def test_rollout_invalid_buffer(self):
+        with self.assertRaises(ValueError):
+            ackermann_rollout(np.zeros(6), self.velocities, self.steering_angles, 0.1, out=np.empty((10, 6)))
+
+    def test_body_velocity_from_state_inverts_rotation(self):
+        car = AckermannCar(np.array([0, 0, 0.7, 0, 0, 0]))
+        velocities = np.array([1.0, 2.0, 0.5])
+        np.testing.assert_allclose(car.kinematic_matrix() @ car.body_velocity_from_state(velocities), velocities)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.control_loop import (ControlService, LatencyHistogram, generate_commands,
+                                                          sinusoidal_commands, default_stepper, step_ackermann,
+                                                          step_omnidirectional)
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+
+class TestLatencyHistogram(TestCase):
+    def test_percentiles(self):
+        histogram = LatencyHistogram(bucket_width=1e-3, max_latency=0.05)
+        for milliseconds in range(1, 101):
+            histogram.record(milliseconds * 1e-4)  # 0.1 ms to 10 ms
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(50), 6e-3)
+        self.assertAlmostEqual(histogram.percentile(99), 1e-2)
+        self.assertAlmostEqual(histogram.max, 1e-2)
+        self.assertAlmostEqual(histogram.mean, 5.05e-3)
+
+    def test_overflow(self):
+        histogram = LatencyHistogram(bucket_width=1e-3, max_latency=0.01)
+        histogram.record(1.0)
+        self.assertEqual(histogram.counts[-1], 1)
+        self.assertEqual(histogram.percentile(99), 1.0)
+
+
+class TestControlService(TestCase):
+    def test_default_steppers(self):
+        self.assertIs(default_stepper(AckermannCar()), step_ackermann)
+        self.assertIs(default_stepper(RadialOmnidirectionalRobot(3, 1.0)), step_omnidirectional)
+        self.assertEqual(default_stepper(UnicycleRobot(0.5, 0.2)).__name__, 'step_unicycle')
+        with self.assertRaises(ValueError):
+            default_stepper(object())
+
+    def test_fixed_rate_with_generated_commands(self):
+        service = ControlService()
+        car = service.add(AckermannCar(), rate=200)
+        robot = service.add(RadialOmnidirectionalRobot(3, 1.0), rate=100, initial_command=np.zeros(3))
+        producers = [generate_commands(car.queue, sinusoidal_commands([2.0, 0.0], [0.0, 20.0], 1.0), rate=50),
+                     generate_commands(robot.queue, iter([np.array([1.0, -1.0, 0.0])] * 5), rate=50)]
+        asyncio.run(service.run(duration=0.3, producers=producers))
+
+        car_statistics, robot_statistics = (summary for summary in service.summary())
+        self.assertAlmostEqual(car_statistics['ticks'] + car_statistics['skipped_ticks'], 60, delta=2)
+        self.assertAlmostEqual(robot_statistics['ticks'] + robot_statistics['skipped_ticks'], 30, delta=2)
+        self.assertGreater(car_statistics['commands'], 5)
+        self.assertEqual(robot_statistics['commands'], 5)
+        self.assertGreater(car.model.state[0], 0.3)  # about 2 m/s for 0.3 s
+        self.assertGreater(np.linalg.norm(robot.model.position), 0)
+        self.assertLessEqual(car_statistics['step_time_p99'], car_statistics['step_time_max'])
+
+    def test_ticks_limit_and_deadline_misses(self):
+        def slow_step(model, command, dt):
+            time.sleep(0.012)
+
+        service = ControlService()
+        channel = service.add(None, rate=100, step=slow_step, initial_command=0, name='slow')
+        asyncio.run(service.run(ticks=10))
+        statistics = channel.statistics
+        self.assertEqual(statistics.ticks, 10)
+        self.assertGreaterEqual(statistics.deadline_misses, 9)
+        self.assertGreater(statistics.skipped_ticks, 0)
+        self.assertGreaterEqual(statistics.step_time.percentile(99), 0.012)
+
+    def test_requires_a_stop_condition(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(ControlService().run())
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CORE_MODULES = [
+    'common.affine',
+    'kinematic_models.wheeled_robots.car_robot',
+    'kinematic_models.wheeled_robots.nonholonomic_robot',
+    'kinematic_models.wheeled_robots.unicycle_fleet',
+    'kinematic_models.wheeled_robots.monte_carlo',
+    'kinematic_models.wheeled_robots.trajectory_recorder',
+    'kinematic_models.wheeled_robots.parameter_sweep',
+    'kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot',
+    'robotic_models.affine_based.inverse_kinematics',
+]
+RENDERING_MODULE = 'kinematic_models.wheeled_robots.rendering'
+
+
+def import_in_fresh_interpreter(modules: list[str]) -> set[str]:
+    """Top-level packages loaded by importing the modules in a new interpreter."""
+    script = f"import sys\nimport {', '.join(modules)}\nprint(' '.join({{name.split('.')[0] for name in sys.modules}}))"
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(output.stdout.split())
+
+
+def import_seconds(modules: list[str], runs: int = 5) -> float:
+    """Shortest time, over fresh interpreters, to import the modules; interpreter startup is not included."""
+    script = (f"import time\nstart = time.perf_counter()\nimport {', '.join(modules)}\n"
+              f"print(time.perf_counter() - start)")
+    return min(float(subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True,
+                                    check=True).stdout) for _ in range(runs))
+
+
+class TestImportTime(TestCase):
+    def test_core_modules_only_need_numpy(self):
+        packages = import_in_fresh_interpreter(CORE_MODULES)
+        self.assertIn('numpy', packages)
+        self.assertNotIn('matplotlib', packages)
+        self.assertNotIn('scipy', packages)
+
+    def test_rendering_pulls_in_matplotlib(self):
+        # Which modules get loaded, unlike wall times, does not depend on the machine running the tests
+        packages = import_in_fresh_interpreter(CORE_MODULES + [RENDERING_MODULE])
+        self.assertIn('matplotlib', packages)
+
+    def test_core_imports_skip_the_rendering_cost(self):
+        core = import_seconds(CORE_MODULES)
+        with_rendering = import_seconds(CORE_MODULES + [RENDERING_MODULE])
+        # matplotlib roughly triples the import time here; the bound only catches the saving disappearing, so that
+        # slow or busy machines do not fail it
+        self.assertLess(core, 0.8 * with_rendering,
+                        f"core imports {core * 1e3:.0f} ms, with rendering {with_rendering * 1e3:.0f} ms")
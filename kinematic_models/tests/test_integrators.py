@@ -0,0 +1,78 @@
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.integrators import INTEGRATORS, get_integrator, exact
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+
+def integrate(integrator, steps, vx=1.0, vy=0.3, omega=0.8, duration=2.0, theta=0.4):
+    x = y = 0.0
+    dt = duration / steps
+    for _ in range(steps):
+        dx, dy = integrator(theta, vx, vy, omega, dt)
+        x, y, theta = x + dx, y + dy, theta + omega * dt
+    return np.array([x, y])
+
+
+class TestIntegrators(TestCase):
+    def test_exact_follows_circular_arc(self):
+        robot = UnicycleRobot(1, 1, integrator='exact')
+        robot.update_position([1, 3], 2.0)
+        v, w = robot.linear_velocity([1, 3]), robot.angular_velocity([1, 3])
+        self.assertAlmostEqual(robot.x, v / w * np.sin(w * 2.0))
+        self.assertAlmostEqual(robot.y, v / w * (1 - np.cos(w * 2.0)))
+        self.assertAlmostEqual(robot.theta, w * 2.0)
+
+    def test_exact_is_independent_of_step_size(self):
+        np.testing.assert_allclose(integrate(exact, 1), integrate(exact, 1000), atol=1e-12)
+
+    def test_exact_small_rotation_branch(self):
+        for omega in (0.0, 1e-9, 1e-7):
+            dx, dy = exact(0.2, 1.0, 0.5, omega, 1.0)
+            reference = integrate(INTEGRATORS['rk4'], 100, 1.0, 0.5, omega, 1.0, 0.2)
+            np.testing.assert_allclose([dx, dy], reference, atol=1e-12)
+
+    def test_convergence_orders(self):
+        reference = integrate(exact, 1)
+        for name, order in [('euler', 1), ('midpoint', 2), ('rk4', 4)]:
+            errors = [np.linalg.norm(integrate(INTEGRATORS[name], steps) - reference) for steps in (10, 20)]
+            self.assertAlmostEqual(np.log2(errors[0] / errors[1]), order, delta=0.3, msg=name)
+
+    def test_integrators_broadcast(self):
+        thetas = np.linspace(0, 3, 5)
+        for integrator in INTEGRATORS.values():
+            dx, dy = integrator(thetas, 1.0, 0.0, np.ones(5), 0.1)
+            self.assertEqual(np.shape(dx), (5,))
+
+    def test_get_integrator(self):
+        self.assertIs(get_integrator('rk4'), INTEGRATORS['rk4'])
+        self.assertIs(get_integrator(exact), exact)
+        self.assertRaises(ValueError, get_integrator, 'leapfrog')
+
+    def test_ackermann_update_matches_rollout(self):
+        rng = np.random.default_rng(8)
+        velocities, steering_angles = rng.uniform(0, 5, 100), rng.uniform(-30, 30, 100)
+        for name in INTEGRATORS:
+            car = AckermannCar(integrator=name)
+            trajectory = car.rollout(velocities, steering_angles, 0.2)
+            for velocity, steering_angle, state in zip(velocities, steering_angles, trajectory):
+                car.update(velocity, steering_angle, 0.2)
+                np.testing.assert_allclose(car.state, state, atol=1e-9)
+
+    def test_omnidirectional_move_matches_simulate(self):
+        motor_velocities = np.random.default_rng(9).uniform(-5, 5, (100, 3))
+        for name in INTEGRATORS:
+            robot = RadialOmnidirectionalRobot(3, 1.0, integrator=name)
+            result = RadialOmnidirectionalRobot(3, 1.0, integrator=name).simulate(motor_velocities, 0.05)
+            for motors, position in zip(motor_velocities, result.positions[1:]):
+                robot.move(0.05, motors)
+                np.testing.assert_allclose(robot.position, position, atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
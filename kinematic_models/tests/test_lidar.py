@@ -0,0 +1,157 @@
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.lidar import Lidar, OccupancyGrid, beam_table, cast_rays, robot_poses
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+from kinematic_models.wheeled_robots.unicycle_fleet import UnicycleFleet
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+
+def marched_range(grid: OccupancyGrid, x: float, y: float, angle: float, max_range: float) -> float:
+    """First occupied cell along a beam, by sampling it every 1/200 of a cell."""
+    step = grid.resolution / 200
+    distances = np.arange(0, max_range, step)
+    cell_x = np.floor((x + distances * np.cos(angle) - grid.origin[0]) / grid.resolution).astype(int)
+    cell_y = np.floor((y + distances * np.sin(angle) - grid.origin[1]) / grid.resolution).astype(int)
+    inside = (cell_x >= 0) & (cell_x < grid.shape[0]) & (cell_y >= 0) & (cell_y < grid.shape[1])
+    occupied = np.zeros(len(distances), dtype=bool)
+    occupied[inside] = grid.occupied[cell_x[inside], cell_y[inside]]
+    return distances[np.argmax(occupied)] if occupied.any() else max_range
+
+
+def cluttered_grid(seed: int = 0) -> OccupancyGrid:
+    rng = np.random.default_rng(seed)
+    grid = OccupancyGrid.empty((20, 15), 0.1, origin=(-2, -1))
+    grid.add_border()
+    for _ in range(12):
+        grid.add_circle(rng.uniform([-1, 0], [17, 13]), rng.uniform(0.2, 1.0))
+    for _ in range(5):
+        low = rng.uniform([-1, 0], [15, 11])
+        grid.add_rectangle(low, low + rng.uniform(0.2, 2.0, 2))
+    return grid
+
+
+class TestOccupancyGrid(TestCase):
+    def test_clearance_is_chebyshev_distance(self):
+        grid = OccupancyGrid.empty((3, 2), 0.1)
+        grid.occupied[[3, 20], [4, 12]] = True
+        cells = np.indices(grid.shape).reshape(2, -1).T
+        occupied = np.argwhere(grid.occupied)
+        expected = np.abs(cells[:, None] - occupied[None]).max(axis=2).min(axis=1).reshape(grid.shape)
+        np.testing.assert_array_equal(grid.clearance, expected)
+
+    def test_edits_invalidate_clearance(self):
+        grid = OccupancyGrid.empty((2, 2), 0.1)
+        self.assertTrue(np.all(grid.clearance > 0))
+        grid.add_circle((1, 1), 0.3)
+        self.assertEqual(grid.clearance[10, 10], 0)
+
+    def test_mirrored_clearance(self):
+        grid = cluttered_grid()
+        blocks = np.split(grid.mirrored_clearance, 4)
+        for block, mirrored in zip(blocks, [grid.clearance, grid.clearance[::-1], grid.clearance[:, ::-1],
+                                            grid.clearance[::-1, ::-1]]):
+            np.testing.assert_array_equal(block, mirrored)
+        grid.add_circle((5, 5), 0.5)
+        self.assertEqual(grid.mirrored_clearance[70, 60], 0)
+
+    def test_invalid_grid(self):
+        with self.assertRaises(ValueError):
+            OccupancyGrid(np.zeros(5), 0.1)
+        with self.assertRaises(ValueError):
+            OccupancyGrid(np.zeros((5, 5)), 0)
+
+
+class TestLidar(TestCase):
+    def setUp(self):
+        self.grid = cluttered_grid()
+        self.lidar = Lidar(90, max_range=8.0)
+
+    def test_matches_marching(self):
+        rng = np.random.default_rng(1)
+        poses = np.column_stack([rng.uniform([-1.5, -0.5], [17.5, 13.5], (6, 2)), rng.uniform(-np.pi, np.pi, 6)])
+        ranges = self.lidar.scan(self.grid, poses)
+        self.assertEqual(ranges.shape, (6, 90))
+        for pose, scan in zip(poses, ranges):
+            expected = [marched_range(self.grid, pose[0], pose[1], pose[2] + angle, 8.0)
+                        for angle in self.lidar.angles]
+            np.testing.assert_allclose(scan, expected, atol=self.grid.resolution / 200)
+
+    def test_wall_distances(self):
+        grid = OccupancyGrid.empty((10, 10), 0.5)
+        grid.add_rectangle((7, 0), (10, 10))  # cells from x = 7 onwards
+        lidar = Lidar(3, field_of_view=np.pi / 2, max_range=20)
+        ranges = lidar.scan(grid, [[1.2, 4.0, 0.0]])[0]
+        # The right beam leaves the grid through its bottom edge before reaching the wall
+        np.testing.assert_allclose(ranges, [20.0, 5.8, 5.8 * np.sqrt(2)])
+        self.assertEqual(lidar.scan(grid, [[1.2, 4.0, np.pi]])[0, 1], 20.0)
+
+    def test_axis_aligned_and_outside_rays(self):
+        grid = OccupancyGrid.empty((4, 4), 1.0)
+        grid.occupied[2, :] = True
+        directions = np.array([[1, 0], [0, 1], [-1, 0], [1, 0], [1, 0]], dtype=float)
+        origins = np.array([[0.5, 0.5], [2.5, -3.0], [3.5, 1.0], [-5.0, 1.5], [-5.0, 7.0]])
+        ranges = cast_rays(grid, origins[:, 0], origins[:, 1], directions[:, 0], directions[:, 1], 10.0)
+        # Inside the grid, entering it from below right into a wall, behind the wall, from the left, missing it
+        np.testing.assert_allclose(ranges, [1.5, 3.0, 0.5, 7.0, 10.0])
+
+    def test_start_inside_obstacle(self):
+        grid = OccupancyGrid.empty((2, 2), 0.1)
+        grid.add_circle((1, 1), 0.5)
+        np.testing.assert_array_equal(self.lidar.scan(grid, [[1.0, 1.0, 0.3]]), 0.0)
+
+    def test_max_range(self):
+        lidar = Lidar(36, max_range=0.5)
+        ranges = lidar.scan(self.grid, [[8.0, 6.5, 0.0]])
+        self.assertTrue(np.all(ranges <= 0.5))
+
+    def test_chunks_match(self):
+        rng = np.random.default_rng(2)
+        poses = np.column_stack([rng.uniform([0, 1], [16, 12], (20, 2)), rng.uniform(-np.pi, np.pi, 20)])
+        sensor = self.lidar.sensor_poses(poses)
+        directions = self.lidar.ray_directions(sensor[:, 2])
+        origins = np.repeat(sensor[:, :2], 90, axis=0)
+        ranges = [cast_rays(self.grid, origins[:, 0], origins[:, 1], directions[0].ravel(), directions[1].ravel(),
+                            8.0, chunk_size) for chunk_size in (100, 1000, 100000)]
+        np.testing.assert_array_equal(ranges[0], ranges[1])
+        np.testing.assert_array_equal(ranges[0], ranges[2])
+
+    def test_beam_table_is_cached(self):
+        angles, cos, sin = beam_table(8, 2 * np.pi, 0.0)
+        self.assertIs(Lidar(8).angles, angles)
+        np.testing.assert_allclose(np.diff(angles), np.pi / 4)
+        self.assertFalse(cos.flags.writeable)
+        np.testing.assert_allclose(beam_table(3, np.pi)[0], [-np.pi / 2, 0, np.pi / 2])
+
+    def test_mount_and_points(self):
+        lidar = Lidar(4, max_range=8.0, mount=(0.5, 0.0, np.pi / 2))
+        pose = np.array([[8.0, 6.5, np.pi / 2]])
+        sensor = lidar.sensor_poses(pose)
+        np.testing.assert_allclose(sensor[0], [8.0, 7.0, np.pi / 2])
+        ranges = lidar.scan(self.grid, pose)
+        points = lidar.points(pose, ranges)
+        np.testing.assert_allclose(np.linalg.norm(points[0] - sensor[0, :2], axis=1), ranges[0])
+        # The beam centred on the mount yaw points along the robot's -x axis here: heading pi / 2 + pi / 2
+        np.testing.assert_allclose(lidar.angles[2], np.pi / 2)
+
+    def test_model_poses(self):
+        car = AckermannCar(np.array([1.0, 2.0, 0.3, 0, 0, 0]), degrees=False)
+        omni = RadialOmnidirectionalRobot(3, 0.5)
+        omni.position, omni.orientation = np.array([3.0, 4.0]), 90
+        unicycle = UnicycleRobot(0.5, 0.2)
+        unicycle.x, unicycle.y, unicycle.theta = 5.0, 6.0, -0.2
+        fleet = UnicycleFleet(2, 0.5, 0.2)
+        fleet.pose[:] = [[7.0, 8.0], [9.0, 10.0], [0.1, 0.2]]
+        poses = robot_poses([car, omni, unicycle, fleet])
+        np.testing.assert_allclose(poses, [[1, 2, 0.3], [3, 4, np.pi / 2], [5, 6, -0.2], [7, 9, 0.1], [8, 10, 0.2]])
+        np.testing.assert_array_equal(self.lidar.scan_models(self.grid, [car, omni]), self.lidar.scan(self.grid,
+                                                                                                       poses[:2]))
+        with self.assertRaises(ValueError):
+            robot_poses([object()])
+
+    def test_car_states(self):
+        states = AckermannCar().rollout(np.full(10, 2.0), np.full(10, 5.0), 0.1)
+        np.testing.assert_array_equal(self.lidar.scan(self.grid, states), self.lidar.scan(self.grid, states[:, :3]))
@@ -0,0 +1,78 @@
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.monte_carlo import UnicycleParticles, AckermannParticles, ParticlePropagator, \
+    merge_moments
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+
+class TestMonteCarlo(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(10)
+        self.motor_commands = rng.uniform(-5, 5, (50, 2))
+        self.car_commands = np.column_stack([rng.uniform(1, 3, 50), rng.uniform(-20, 20, 50)])
+
+    def test_noiseless_particles_follow_robot(self):
+        robot = UnicycleRobot(0.5, 0.2, integrator='rk4')
+        particles = UnicycleParticles.from_robot(robot, 100)
+        for command, summary in zip(self.motor_commands, particles.propagate(self.motor_commands, 0.1)):
+            robot.update_position(command, 0.1)
+            np.testing.assert_allclose(summary.mean, [robot.x, robot.y, robot.theta], atol=1e-12)
+            np.testing.assert_allclose(summary.covariance, 0, atol=1e-20)
+        self.assertEqual(summary.step, 50)
+
+    def test_noiseless_particles_follow_car(self):
+        car = AckermannCar()
+        particles = AckermannParticles.from_car(car, 10)
+        means, covariances = particles.run(self.car_commands, 0.1)
+        trajectory = car.rollout(self.car_commands[:, 0], self.car_commands[:, 1], 0.1)
+        np.testing.assert_allclose(means[:, :2], trajectory[:, :2], atol=1e-9)
+        np.testing.assert_allclose(np.mod(means[:, 2], 2 * np.pi), trajectory[:, 2], atol=1e-9)
+
+    def test_summary_matches_particles(self):
+        particles = AckermannParticles(5000, velocity_noise_std=0.2, steering_noise_std=2.0, seed=1, chunk_size=777)
+        means, covariances = particles.run(self.car_commands, 0.1)
+        np.testing.assert_allclose(means[-1], particles.poses.mean(axis=1))
+        np.testing.assert_allclose(covariances[-1], np.cov(particles.poses))
+        summary = particles.summary()
+        np.testing.assert_allclose(summary.covariance, covariances[-1])
+
+    def test_seeded_and_chunk_independent(self):
+        results = [UnicycleParticles(3000, 0.5, 0.2, motor_noise_std=[0.5, 0.3], seed=2, chunk_size=chunk_size)
+                   .run(self.motor_commands, 0.05) for chunk_size in (3000, 1000)]
+        np.testing.assert_allclose(results[0][0], results[1][0])
+        np.testing.assert_allclose(results[0][1], results[1][1])
+
+    def test_uncertainty_grows(self):
+        particles = UnicycleParticles(2000, 0.5, 0.2, motor_noise_std=0.5, seed=3)
+        variances = [np.trace(summary.covariance[:2, :2])
+                     for summary in particles.propagate(np.tile([4.0, 4.0], (30, 1)), 0.1)]
+        self.assertLess(variances[0], variances[-1])
+
+    def test_merge_moments(self):
+        samples = np.random.default_rng(11).normal(size=(3, 100))
+        moments = [(part.shape[1], part.mean(axis=1), (part - part.mean(axis=1)[:, None]) @
+                    (part - part.mean(axis=1)[:, None]).T) for part in (samples[:, :30], samples[:, 30:])]
+        count, mean, scatter = merge_moments(*moments[0], *moments[1])
+        self.assertEqual(count, 100)
+        np.testing.assert_allclose(mean, samples.mean(axis=1))
+        np.testing.assert_allclose(scatter / 99, np.cov(samples))
+
+    def test_invalid_geometry(self):
+        self.assertRaises(ValueError, UnicycleParticles, 10, 0, 1)
+        self.assertRaises(ValueError, UnicycleParticles, 0, 1, 1)
+
+    def test_incomplete_propagator(self):
+        class NoiselessPropagator(ParticlePropagator):
+            def _twist(self, command, noise):
+                return command[0], 0.0, command[1]
+
+        self.assertRaises(TypeError, ParticlePropagator, 10)
+        self.assertRaises(TypeError, NoiselessPropagator, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
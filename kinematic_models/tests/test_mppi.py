@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.mppi import MPPIController, STAGES
+from kinematic_models.wheeled_robots.nonholonomic_robot import NonholonomicRobot
+
+
+def arc_path(radius=10.0, points=300):
+    angles = np.linspace(0, 1.5 * np.pi, points)
+    return np.column_stack([radius * np.sin(angles), radius - radius * np.cos(angles)])
+
+
+def distance_to_path(path, point):
+    starts, segments = path[:-1], np.diff(path, axis=0)
+    along = np.clip(np.einsum('si,si->s', point - starts, segments) / np.einsum('si,si->s', segments, segments),
+                    0, 1)
+    return np.min(np.hypot(*(starts + along[:, None] * segments - point).T))
+
+
+def track(car, controller, cycles, dt):
+    errors = []
+    for _ in range(cycles):
+        velocity, steering_angle = controller.command(car.state)
+        car.update(velocity, steering_angle, dt)
+        errors.append(distance_to_path(controller.path, car.state[:2]))
+    return np.array(errors)
+
+
+class TestMPPIController(TestCase):
+    def test_tracks_curved_path(self):
+        car = AckermannCar()
+        car.state = np.array([0.0, -1.0, 0, 0, 0, 0])
+        controller = MPPIController.for_car(car, arc_path(), num_samples=512, horizon=25, dt=0.05, seed=0)
+        errors = track(car, controller, 120, 0.05)
+        self.assertLess(errors[-40:].max(), 0.2)
+        self.assertGreater(car.state[1], 5)  # went around the arc instead of stopping
+        self.assertEqual(controller.cycles, 120)
+
+    def test_nonholonomic_robot_in_radians(self):
+        robot = NonholonomicRobot(degrees=False, arm_length=0.5)
+        path = np.column_stack([np.linspace(0, 30, 50), np.full(50, 1.0)])
+        controller = MPPIController.for_car(robot, path, num_samples=256, horizon=20, dt=0.05, seed=1,
+                                            noise_std=(0.5, 0.1), steering_limits=(-0.5, 0.5))
+        errors = track(robot, controller, 100, 0.05)
+        self.assertLess(errors[-20:].max(), 0.05)
+
+    def test_distance_field(self):
+        path = np.array([[0.0, 0.0], [4.0, 0.0]])
+        controller = MPPIController(path, num_samples=8, horizon=4, resolution=0.5, margin=2.0)
+        self.assertEqual(controller.distance_field.shape, (17, 9))
+        # Cell (6, 5) sits at x = 1, 0.5 above the segment
+        self.assertAlmostEqual(controller.distance_field[6, 5], 0.25)
+        self.assertAlmostEqual(controller.distance_field[16, 4], 4.0)  # 2 m past the end of the path
+        np.testing.assert_array_equal(controller.heading_field, 0)
+
+    def test_buffers_are_reused_and_stages_timed(self):
+        controller = MPPIController(arc_path(), num_samples=64, horizon=10, seed=2)
+        buffers = [controller._noise, controller._controls, controller._states, controller._costs]
+        controller.command(np.zeros(6))
+        controller.command(np.zeros(6))
+        for before, after in zip(buffers, [controller._noise, controller._controls, controller._states,
+                                           controller._costs]):
+            self.assertIs(before, after)
+        self.assertEqual(set(controller.last_timings), set(STAGES))
+        self.assertTrue(all(seconds > 0 for seconds in controller.total_timings.values()))
+        self.assertEqual(controller.predicted_trajectory(np.zeros(6)).shape, (10, 6))
+
+    def test_commands_respect_limits(self):
+        controller = MPPIController(arc_path(), num_samples=64, horizon=10, seed=3, velocity_limits=(0, 1),
+                                    steering_limits=(-5, 5), noise_std=(10, 100))
+        for _ in range(5):
+            velocity, steering_angle = controller.command(np.zeros(6))
+            self.assertTrue(0 <= velocity <= 1 and -5 <= steering_angle <= 5)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            MPPIController(np.zeros((1, 2)))
+        with self.assertRaises(ValueError):
+            MPPIController(arc_path(), temperature=0)
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.nonholonomic_robot import NonholonomicRobot, arm_kinematics
+
+
+def make_robot(state=(1.0, -2.0, 0.0, 0, 0, 0), **kwargs):
+    robot = NonholonomicRobot(arm_offset=np.array([0.5, 0.2]), arm_length=1.3, arm_angle=40, **kwargs)
+    robot.state = np.array(state, dtype=float)
+    return robot
+
+
+def drawn_end_effector(robot: NonholonomicRobot):
+    """End of the arm as drawn by rendering.draw_arm."""
+    base = robot.state[:2] + robot.transformed_arm_offset
+    return base + robot.arm_length * np.array([np.cos(robot.state[2] + robot.arm_angle),
+                                               np.sin(robot.state[2] + robot.arm_angle)])
+
+
+class TestArmKinematics(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.states = np.column_stack([rng.uniform(-5, 5, (50, 2)), rng.uniform(-np.pi, np.pi, 50),
+                                       np.zeros((50, 3))])
+        self.arm_angles = rng.uniform(-90, 90, 50)
+
+    def test_matches_single_pose_methods(self):
+        robot = make_robot()
+        kinematics = robot.arm_kinematics(self.states, self.arm_angles)
+        for state, arm_angle, matrix, end_effector in zip(self.states, self.arm_angles, kinematics.matrices,
+                                                          kinematics.end_effectors):
+            robot.state, robot.arm_angle = state.copy(), np.deg2rad(arm_angle)
+            np.testing.assert_allclose(matrix, robot.arm_kinematic_matrix(), atol=1e-12)
+            np.testing.assert_allclose(end_effector, drawn_end_effector(robot), atol=1e-12)
+            np.testing.assert_allclose(end_effector, robot.end_effector_position, atol=1e-12)
+
+    def test_arm_matrix_of_current_pose(self):
+        robot = make_robot((0, 0, np.pi / 2, 0, 0, 0))
+        np.testing.assert_allclose(robot.arm_kinematic_matrix()[:2, 3], [-0.2, 0.5], atol=1e-12)
+        np.testing.assert_allclose(robot.arm_kinematics().matrices, robot.arm_kinematic_matrix(), atol=1e-12)
+
+    def test_radians_and_buffer(self):
+        out = np.empty((50, 4, 4))
+        kinematics = arm_kinematics(self.states, np.deg2rad(self.arm_angles), (0.5, 0.2), 1.3, degrees=False,
+                                    out=out)
+        self.assertIs(kinematics.matrices, out)
+        expected = arm_kinematics(self.states, self.arm_angles, (0.5, 0.2), 1.3)
+        np.testing.assert_allclose(out, expected.matrices, atol=1e-12)
+        with self.assertRaises(ValueError):
+            arm_kinematics(self.states, self.arm_angles, out=np.empty((49, 4, 4)))
+
+    def test_rollout_with_arm(self):
+        robot = make_robot(state=(1.0, -2.0, 0.3, 0, 0, 0))
+        rng = np.random.default_rng(4)
+        velocities, steering_angles = rng.uniform(0, 3, (4, 100)), rng.uniform(-30, 30, (4, 100))
+        arm_angles = np.linspace(-45, 45, 100)
+        states, kinematics = robot.rollout_with_arm(velocities, steering_angles, arm_angles, 0.05)
+        self.assertEqual(states.shape, (4, 100, 6))
+        self.assertEqual(kinematics.matrices.shape, (4, 100, 4, 4))
+        np.testing.assert_allclose(states, robot.rollout(velocities, steering_angles, 0.05))
+
+        robot.state, robot.arm_angle = states[2, 60].copy(), np.deg2rad(arm_angles[60])
+        np.testing.assert_allclose(kinematics.end_effectors[2, 60], drawn_end_effector(robot), atol=1e-12)
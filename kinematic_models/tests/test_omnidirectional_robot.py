@@ -0,0 +1,186 @@
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from common.angular_velocity import omega_from_v_r
+from kinematic_models.wheeled_robots.omnidirectional_robots.omni_wheel import OmniWheel
+from kinematic_models.wheeled_robots.omnidirectional_robots.omnidirectional_robot import OmnidirectionalRobot
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+
+
+def per_wheel_body_velocity(robot: OmnidirectionalRobot):
+    """Body twist summed wheel by wheel, as the robot computed it before the wheel matrix existed."""
+    components = [wheel.get_velocity_components(motor) for wheel, motor in zip(robot.wheels, robot.motor_velocities)]
+    angular = sum(omega_from_v_r(component, wheel.distance_from_robot_frame)
+                  for component, wheel in zip(components, robot.wheels))
+    return np.array([*np.sum(components, axis=0), angular])
+
+
+class TestOmnidirectionalRobot(TestCase):
+    def setUp(self):
+        self.robot = RadialOmnidirectionalRobot(4, 2, wheel_diameter=0.6, axis_rotation=15,
+                                                motor_velocities=np.array([1.0, -2.0, 0.5, 3.0]))
+        self.custom = OmnidirectionalRobot(3, motor_velocities=np.array([2.0, 1.0, -1.0]))
+        for position, orientation, diameter in [((1, 0), 10, 0.5), ((-0.5, 1), 100, 0.7), ((-0.5, -1), 250, 0.6)]:
+            self.custom.add_wheel(OmniWheel(position, orientation, diameter))
+
+    def test_wheel_matrix_matches_per_wheel_velocities(self):
+        for robot in (self.robot, self.custom):
+            np.testing.assert_allclose(robot.body_velocity(), per_wheel_body_velocity(robot), atol=1e-12)
+            self.assertEqual(robot.wheel_matrix.shape, (robot.num_wheels, 3))
+
+    def test_linear_and_angular_velocity(self):
+        expected = per_wheel_body_velocity(self.robot)
+        np.testing.assert_allclose(self.robot.get_linear_velocity(), expected[:2], atol=1e-12)
+        self.assertAlmostEqual(self.robot.get_angular_velocity(), expected[2])
+
+    def test_global_velocity(self):
+        self.robot.orientation = 30
+        expected = per_wheel_body_velocity(self.robot)
+        rotation = np.array([[np.cos(np.pi / 6), -np.sin(np.pi / 6)], [np.sin(np.pi / 6), np.cos(np.pi / 6)]])
+        np.testing.assert_allclose(self.robot.global_velocity(), [*rotation @ expected[:2], expected[2]], atol=1e-12)
+
+    def test_batched_body_velocity(self):
+        motor_velocities = np.random.default_rng(5).uniform(-3, 3, (10, 4))
+        expected = []
+        for motors in motor_velocities:
+            self.robot.motor_velocities = motors
+            expected.append(per_wheel_body_velocity(self.robot))
+        np.testing.assert_allclose(self.robot.body_velocity(motor_velocities), expected, atol=1e-12)
+
+    def test_pseudo_inverse(self):
+        np.testing.assert_allclose(self.robot.wheel_matrix_pinv @ self.robot.wheel_matrix, np.eye(3), atol=1e-12)
+
+    def test_cache_rebuilds_when_geometry_changes(self):
+        matrix = self.custom.wheel_matrix
+        self.assertIs(self.custom.wheel_matrix, matrix)
+        self.custom.wheels[1].orientation = 45
+        self.custom.wheels[2].diameter = 1.0
+        self.assertIsNot(self.custom.wheel_matrix, matrix)
+        np.testing.assert_allclose(self.custom.body_velocity(), per_wheel_body_velocity(self.custom), atol=1e-12)
+
+    def test_cache_rebuilds_when_wheel_added(self):
+        robot = OmnidirectionalRobot(3, motor_velocities=np.ones(3))
+        robot.add_wheel(OmniWheel((1, 0), 0))
+        self.assertEqual(robot.wheel_matrix.shape, (1, 3))
+        robot.add_wheel(OmniWheel((0, 1), 90))
+        self.assertEqual(robot.wheel_matrix.shape, (2, 3))
+
+    def test_cache_rebuilds_when_wheels_swapped_or_replaced(self):
+        matrix = self.custom.wheel_matrix
+        wheels = self.custom.wheels
+        wheels[0], wheels[1] = wheels[1], wheels[0]
+        np.testing.assert_allclose(self.custom.wheel_matrix, matrix[[1, 0, 2]])
+        wheels[2] = OmniWheel((0.5, 0.5), 45, 0.4)
+        np.testing.assert_allclose(self.custom.body_velocity(), per_wheel_body_velocity(self.custom), atol=1e-12)
+
+    def test_wheel_at_robot_frame(self):
+        robot = OmnidirectionalRobot(3)
+        robot.add_wheel(OmniWheel((0, 0), 0))
+        with self.assertRaises(ValueError):
+            robot.wheel_matrix
+
+    def test_move(self):
+        body = per_wheel_body_velocity(self.robot)
+        self.robot.move(0.5)
+        np.testing.assert_allclose(self.robot.position, body[:2] * 0.5, atol=1e-12)
+        self.assertAlmostEqual(self.robot.orientation, body[2] * 0.5)
+
+
+class TestOmnidirectionalInverseKinematics(TestCase):
+    def setUp(self):
+        self.robot = RadialOmnidirectionalRobot(3, 1.5, wheel_diameter=0.5)
+        self.custom = OmnidirectionalRobot(4)
+        for position, orientation in [((1, 0.2), 10), ((-0.5, 1), 100), ((-0.5, -1), 250), ((0.3, -0.8), 300)]:
+            self.custom.add_wheel(OmniWheel(position, orientation, 0.4))
+        self.twists = np.random.default_rng(6).uniform(-2, 2, (50, 3))
+
+    def test_round_trip(self):
+        for robot in (self.robot, self.custom):
+            robot.orientation = 40
+            motor_velocities = robot.motor_velocities_from_twist(self.twists)
+            self.assertEqual(motor_velocities.shape, (50, robot.num_wheels))
+            for motors, twist in zip(motor_velocities, self.twists):
+                robot.motor_velocities = motors
+                np.testing.assert_allclose(robot.global_velocity(), twist, atol=1e-9)
+
+    def test_single_twist(self):
+        motors = self.robot.motor_velocities_from_twist(self.twists[0])
+        self.robot.motor_velocities = motors
+        np.testing.assert_allclose(self.robot.global_velocity(), self.twists[0], atol=1e-9)
+
+    def test_per_step_orientations(self):
+        orientations = np.linspace(0, 300, 50)
+        motor_velocities = self.robot.motor_velocities_from_twist(self.twists, orientations)
+        for motors, orientation, twist in zip(motor_velocities, orientations, self.twists):
+            self.robot.motor_velocities, self.robot.orientation = motors, orientation
+            np.testing.assert_allclose(self.robot.global_velocity(), twist, atol=1e-9)
+
+    def test_orientation_integrated_with_dt(self):
+        motor_velocities = self.custom.motor_velocities_from_twist(self.twists, dt=0.1)
+        for motors, twist in zip(motor_velocities, self.twists):
+            self.custom.motor_velocities = motors
+            np.testing.assert_allclose(self.custom.global_velocity(), twist, atol=1e-9)
+            self.custom.move(0.1)
+
+    def test_max_wheel_speed(self):
+        uncapped = self.robot.motor_velocities_from_twist(self.twists)
+        capped = self.robot.motor_velocities_from_twist(self.twists, max_wheel_speed=2.0)
+        self.assertTrue((np.abs(capped) <= 2.0 + 1e-12).all())
+        slow = np.abs(uncapped).max(axis=1) <= 2.0
+        np.testing.assert_allclose(capped[slow], uncapped[slow])
+        ratios = capped[~slow] / uncapped[~slow]
+        np.testing.assert_allclose(ratios, ratios[:, :1].repeat(3, axis=1))
+        for max_wheel_speed in (0.0, -1.0):
+            self.assertRaises(ValueError, self.robot.motor_velocities_from_twist, self.twists,
+                              max_wheel_speed=max_wheel_speed)
+
+    def test_invalid_twists(self):
+        self.assertRaises(ValueError, self.robot.motor_velocities_from_twist, np.zeros((5, 2)))
+
+
+class TestOmnidirectionalSimulation(TestCase):
+    def setUp(self):
+        self.robot = RadialOmnidirectionalRobot(3, 1.0, wheel_diameter=0.5)
+        self.reference = RadialOmnidirectionalRobot(3, 1.0, wheel_diameter=0.5)
+        rng = np.random.default_rng(7)
+        self.motor_velocities = rng.uniform(-5, 5, (300, 3))
+        self.time_steps = rng.uniform(0.01, 0.1, 300)
+
+    def test_simulate_matches_move(self):
+        result = self.robot.simulate(self.motor_velocities, self.time_steps)
+        positions, orientations, velocities = [self.reference.position], [self.reference.orientation], \
+            [self.reference.global_velocity()]
+        for motors, dt in zip(self.motor_velocities, self.time_steps):
+            self.reference.move(dt, motors)
+            positions.append(self.reference.position)
+            orientations.append(self.reference.orientation)
+            velocities.append(self.reference.global_velocity())
+
+        np.testing.assert_allclose(result.positions, positions, atol=1e-9)
+        np.testing.assert_allclose(result.orientations, orientations, atol=1e-9)
+        np.testing.assert_allclose(result.velocities, velocities, atol=1e-9)
+        np.testing.assert_allclose(self.robot.position, self.reference.position, atol=1e-9)
+        self.assertAlmostEqual(self.robot.orientation, self.reference.orientation)
+
+    def test_simulate_with_constant_inputs(self):
+        result = self.robot.simulate(self.motor_velocities[0], np.full(20, 0.1))
+        self.assertEqual(result.positions.shape, (21, 2))
+        self.assertEqual(result.motor_velocities.shape, (20, 3))
+        result = self.reference.simulate(self.motor_velocities[:20], 0.1)
+        self.assertEqual(result.velocities.shape, (21, 3))
+
+    def test_plot_simulation(self):
+        import matplotlib
+        matplotlib.use("Agg")
+        result = self.robot.simulate(self.motor_velocities, self.time_steps)
+        ax = self.robot.plot_simulation(result, decimation=50)
+        # 7 drawn states (every 50th plus the last one), each a body circle and three wheels
+        self.assertEqual(len(ax.collections[0].get_paths()), 7 * 4)
+        self.assertEqual(len(ax.collections[1].get_offsets()), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.parameter_sweep import (ParameterSweep, parameter_grid, ackermann_metrics,
+                                                             radial_omnidirectional_metrics, configuration_rng)
+
+
+def noisy_product(parameters, rng):
+    return {'product': parameters['a'] * parameters['b'], 'noise': rng.standard_normal()}
+
+
+def failing_after_three(parameters, rng):
+    if parameters['a'] * 10 + parameters['b'] > 3:
+        raise RuntimeError("interrupted")
+    return noisy_product(parameters, rng)
+
+
+class TestParameterSweep(TestCase):
+    def setUp(self):
+        self.grid = parameter_grid(a=[0, 1, 2], b=[1, 2])
+        self.temporary = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.temporary.name, 'sweep.jsonl')
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def test_parameter_grid(self):
+        self.assertEqual(self.grid.dtype.names, ('a', 'b'))
+        np.testing.assert_array_equal(self.grid['a'], [0, 0, 1, 1, 2, 2])
+        np.testing.assert_array_equal(self.grid['b'], [1, 2, 1, 2, 1, 2])
+
+    def test_process_pool_matches_serial(self):
+        parallel = ParameterSweep(noisy_product, self.grid, seed=3, max_workers=2).run()
+        serial = ParameterSweep(noisy_product, self.grid, seed=3, max_workers=0).run()
+        np.testing.assert_array_equal(parallel.table, serial.table)
+        np.testing.assert_array_equal(parallel.table['product'], self.grid['a'] * self.grid['b'])
+        self.assertEqual(parallel.table['noise'][4], configuration_rng(3, 4).standard_normal())
+        self.assertTrue(all(throughput > 0 for throughput in parallel.worker_throughput.values()))
+
+    def test_results_stream_as_they_finish(self):
+        records = list(ParameterSweep(noisy_product, self.grid, max_workers=2).iter_results())
+        self.assertEqual(sorted(record.index for record in records), list(range(6)))
+
+    def test_checkpoint_resume(self):
+        with self.assertRaises(RuntimeError):
+            ParameterSweep(failing_after_three, self.grid, seed=5, max_workers=0, checkpoint=self.checkpoint).run()
+        with open(self.checkpoint) as file:
+            self.assertEqual(len(file.readlines()), 2)
+
+        resumed = ParameterSweep(noisy_product, self.grid, seed=5, max_workers=0, checkpoint=self.checkpoint)
+        self.assertEqual(len(list(resumed.iter_results())), 4)
+        result = ParameterSweep(noisy_product, self.grid, seed=5, max_workers=0, checkpoint=self.checkpoint).run()
+        expected = ParameterSweep(noisy_product, self.grid, seed=5, max_workers=0).run()
+        np.testing.assert_array_equal(result.table, expected.table)
+        # Every configuration came from the checkpoint, so no worker of this run evaluated any
+        self.assertEqual(result.worker_throughput, {})
+
+    def test_resume_after_partial_save(self):
+        with self.assertRaises(RuntimeError):
+            ParameterSweep(failing_after_three, self.grid, seed=5, max_workers=0, checkpoint=self.checkpoint).run()
+        with open(self.checkpoint, 'a') as file:
+            file.write('{"index": 2, "parame')
+        sweep = ParameterSweep(noisy_product, self.grid, seed=5, max_workers=0, checkpoint=self.checkpoint)
+        self.assertEqual(sorted(sweep._load_checkpoint()), [0, 1])
+        with open(self.checkpoint) as file:
+            self.assertEqual(len(file.readlines()), 2)
+        result = sweep.run()
+        np.testing.assert_array_equal(result.table,
+                                      ParameterSweep(noisy_product, self.grid, seed=5, max_workers=0).run().table)
+        with open(self.checkpoint) as file:
+            self.assertEqual(len(file.readlines()), 6)
+
+    def test_mismatched_checkpoint(self):
+        ParameterSweep(noisy_product, self.grid, max_workers=0, checkpoint=self.checkpoint).run()
+        other = parameter_grid(a=[5, 6], b=[1])
+        self.assertRaises(ValueError, ParameterSweep(noisy_product, other, checkpoint=self.checkpoint).run)
+        # Records beyond a smaller grid are a mismatch too, not an index error
+        smaller = self.grid[:3]
+        self.assertRaises(ValueError, ParameterSweep(noisy_product, smaller, checkpoint=self.checkpoint).run)
+
+    def test_robot_metrics(self):
+        omni = ParameterSweep(radial_omnidirectional_metrics,
+                              parameter_grid(num_wheels=[3, 4], radius=[0.5, 1.0]), max_workers=0).run().table
+        self.assertTrue((omni['condition_number'] >= 1).all())
+        # Wheels further from the center turn the robot more slowly
+        self.assertGreater(omni['top_rotation_rate'][0], omni['top_rotation_rate'][1])
+
+        cars = ParameterSweep(ackermann_metrics, parameter_grid(wheelbase=[2.0, 3.0]), max_workers=0).run().table
+        self.assertLess(cars['turning_radius'][0], cars['turning_radius'][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+from itertools import combinations
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+from kinematic_models.wheeled_robots.spatial_index import (SpatialIndex, rectangles_overlap,
+                                                           circle_rectangle_overlap, CIRCLE)
+
+
+def corners(center, half_extents, yaw):
+    local = np.array([[1, 1], [-1, 1], [-1, -1], [1, -1]]) * half_extents
+    rotation = np.array([[np.cos(yaw), -np.sin(yaw)], [np.sin(yaw), np.cos(yaw)]])
+    return local @ rotation.T + center
+
+
+def sampled_overlap(index: SpatialIndex, i: int, j: int, samples: int = 4000) -> bool:
+    """Reference test: whether points sampled in footprint i fall inside footprint j, or the other way round."""
+    rng = np.random.default_rng(i * 7919 + j)
+
+    def inside(k, points):
+        local = points - index.centers[k]
+        if index.kinds[k] == CIRCLE:
+            return np.einsum('ij,ij->i', local, local) <= index.half_extents[k, 0] ** 2
+        u = np.array([np.cos(index.yaws[k]), np.sin(index.yaws[k])])
+        v = np.array([-u[1], u[0]])
+        return (np.abs(local @ u) <= index.half_extents[k, 0]) & (np.abs(local @ v) <= index.half_extents[k, 1])
+
+    def sample(k):
+        if index.kinds[k] == CIRCLE:
+            angles, radii = rng.uniform(0, 2 * np.pi, samples), np.sqrt(rng.uniform(0, 1, samples))
+            boundary = np.column_stack([np.cos(angles), np.sin(angles)])
+            return index.centers[k] + index.half_extents[k, 0] * np.concatenate([boundary, boundary * radii[:, None]])
+        local = rng.uniform(-1, 1, (samples, 2)) * index.half_extents[k]
+        edges = np.linspace(0, 1, samples)[:, None]
+        box = corners(index.centers[k], index.half_extents[k], index.yaws[k])
+        outline = np.concatenate([box[m] + edges * (box[(m + 1) % 4] - box[m]) for m in range(4)])
+        u = np.array([np.cos(index.yaws[k]), np.sin(index.yaws[k])])
+        return np.concatenate([outline, index.centers[k] + local @ np.array([u, [-u[1], u[0]]])])
+    return bool(inside(j, sample(i)).any() or inside(i, sample(j)).any())
+
+
+def random_index(rng, count, side):
+    index = SpatialIndex()
+    index.add_circles(rng.uniform(0, side, (count // 2, 2)), rng.uniform(0.2, 0.8, count // 2))
+    index.add_rectangles(rng.uniform(0, side, (count - count // 2, 2)), rng.uniform(1, 3, count - count // 2),
+                         rng.uniform(0.5, 1.5, count - count // 2), rng.uniform(-np.pi, np.pi, count - count // 2))
+    return index
+
+
+class TestOverlapTests(TestCase):
+    def test_rotated_rectangles(self):
+        half_extents = np.array([1.0, 0.5])
+        # A square rotated by 45 degrees reaches sqrt(2) along the x axis
+        self.assertTrue(rectangles_overlap([0, 0], half_extents, 0, [2.3, 0], [1.0, 1.0], np.pi / 4))
+        self.assertFalse(rectangles_overlap([0, 0], half_extents, 0, [2.5, 0], [1.0, 1.0], np.pi / 4))
+        # Corner-to-corner near miss that only the rectangle axes separate
+        self.assertFalse(rectangles_overlap([0, 0], [1.0, 1.0], 0, [2.1, 2.1], [1.0, 1.0], np.pi / 4))
+
+    def test_circle_rectangle(self):
+        self.assertTrue(circle_rectangle_overlap([1.4, 0], 0.5, [0, 0], [1.0, 0.5], 0))
+        self.assertFalse(circle_rectangle_overlap([1.4, 0.9], 0.5, [0, 0], [1.0, 0.5], 0))
+        self.assertTrue(circle_rectangle_overlap([0, 1.4], 0.5, [0, 0], [1.0, 0.5], np.pi / 2))
+
+
+class TestSpatialIndex(TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(5)
+        self.index = random_index(self.rng, 200, 25)
+
+    def brute_force_overlaps(self, index):
+        pairs = [(i, j) for i, j in combinations(range(len(index)), 2)
+                 if np.hypot(*(index.centers[i] - index.centers[j])) <= index.bounding_radii[i] +
+                 index.bounding_radii[j] and sampled_overlap(index, i, j)]
+        return np.array(pairs).reshape(-1, 2)
+
+    def test_overlapping_pairs_match_brute_force(self):
+        pairs = self.index.overlapping_pairs()
+        self.assertGreater(len(pairs), 10)
+        np.testing.assert_array_equal(pairs, self.brute_force_overlaps(self.index))
+
+    def test_pairs_within(self):
+        index = SpatialIndex(cell_size=4.0)
+        index.add_circles(self.rng.uniform(-20, 20, (300, 2)), 0.1)
+        expected = [(i, j) for i, j in combinations(range(300), 2)
+                    if np.hypot(*(index.centers[i] - index.centers[j])) <= 3.0]
+        np.testing.assert_array_equal(index.pairs_within(3.0), np.array(expected).reshape(-1, 2))
+        with self.assertRaises(ValueError):
+            index.pairs_within(5.0)
+
+    def test_neighbors(self):
+        point = np.array([12.0, 9.0])
+        expected = np.flatnonzero(np.hypot(*(self.index.centers - point).T) <= 7.5)
+        np.testing.assert_array_equal(self.index.neighbors(point, 7.5), expected)
+
+    def test_incremental_updates(self):
+        for _ in range(5):
+            moved = self.rng.choice(len(self.index), 60, replace=False)
+            self.index.update(self.index.centers[moved] + self.rng.normal(0, 0.5, (60, 2)),
+                              self.index.yaws[moved] + 0.1, ids=moved)
+            fresh = SpatialIndex()
+            for kind, add in ((CIRCLE, fresh.add_circles), (1, fresh.add_rectangles)):
+                ids = np.flatnonzero(self.index.kinds == kind)
+                if kind == CIRCLE:
+                    add(self.index.centers[ids], self.index.half_extents[ids, 0])
+                else:
+                    add(self.index.centers[ids], 2 * self.index.half_extents[ids, 0],
+                        2 * self.index.half_extents[ids, 1], self.index.yaws[ids])
+            np.testing.assert_array_equal(self.index.overlapping_pairs(), fresh.overlapping_pairs())
+        self.assertGreater(self.index.rebinned, 0)
+        resorts = self.index.resorts
+        self.index.update(self.index.centers)
+        self.index.overlapping_pairs()
+        self.assertEqual(self.index.resorts, resorts)  # nothing changed cell, so the order is reused
+
+    def test_from_models(self):
+        car = AckermannCar(length=4.0, width=2.0, degrees=False)
+        other = AckermannCar(np.array([3.5, 3.0, np.pi / 2, 0, 0, 0]), length=4.0, width=2.0, degrees=False)
+        robot = RadialOmnidirectionalRobot(3, 1.0)
+        robot.position = np.array([-2.8, 0.0])
+        index = SpatialIndex.from_models([car, other, robot])
+        np.testing.assert_array_equal(index.overlapping_pairs(), [[0, 2]])
+
+        other.state[:2] = [1.5, 2.0]
+        robot.position = np.array([-10.0, 0.0])
+        index.update_models([car, other, robot])
+        np.testing.assert_array_equal(index.overlapping_pairs(), [[0, 1]])
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+    RadialOmnidirectionalRobot
+from kinematic_models.wheeled_robots.trajectory_recorder import TrajectoryRecorder, TrajectoryReader
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+
+class TestTrajectoryRecorder(TestCase):
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = self.temporary.name
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def test_records_ackermann_states(self):
+        car = AckermannCar()
+        expected = []
+        with TrajectoryRecorder.for_model(self.directory, car, chunk_size=16) as recorder:
+            for step in range(50):
+                car.update(2.0, 10.0, 0.1)
+                recorder.record_model(car)
+                expected.append(car.state.copy())
+
+        reader = TrajectoryReader(self.directory)
+        self.assertEqual(len(reader), 50)
+        self.assertEqual(reader.fields, ('x', 'y', 'yaw', 'vx', 'vy', 'yaw_rate'))
+        records = np.concatenate(list(reader.chunks()))
+        np.testing.assert_array_equal(records.view(np.float64).reshape(50, 6), expected)
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['chunk_000000.npy', 'chunk_000001.npy', 'chunk_000002.npy', 'chunk_000003.npy',
+                          'manifest.json'])
+        self.assertEqual(len(np.load(os.path.join(self.directory, 'chunk_000003.npy'))), 2)
+
+    def test_records_omnidirectional_and_unicycle_models(self):
+        robot = RadialOmnidirectionalRobot(3, 1.0, motor_velocities=np.array([1.0, 2.0, 3.0]))
+        unicycle = UnicycleRobot(1, 1)
+        omni_directory, unicycle_directory = os.path.join(self.directory, 'omni'), os.path.join(self.directory, 'u')
+        with TrajectoryRecorder.for_model(omni_directory, robot, chunk_size=8) as omni_recorder, \
+                TrajectoryRecorder.for_model(unicycle_directory, unicycle, chunk_size=8) as unicycle_recorder:
+            for _ in range(10):
+                robot.move(0.1)
+                unicycle.update_position([1, 2], 0.1)
+                omni_recorder.record_model(robot)
+                unicycle_recorder.record_model(unicycle)
+
+        omni = TrajectoryReader(omni_directory)
+        np.testing.assert_allclose(omni[-1].tolist(), robot.global_state())
+        self.assertEqual(omni[9]['orientation'], robot.orientation)
+        unicycle_reader = TrajectoryReader(unicycle_directory)
+        self.assertEqual(unicycle_reader[-1].tolist(), (unicycle.x, unicycle.y, unicycle.theta))
+
+    def test_record_many_and_slices(self):
+        values = np.arange(300, dtype=float).reshape(100, 3)
+        with TrajectoryRecorder(self.directory, ('a', 'b', 'c'), chunk_size=32) as recorder:
+            recorder.record_many(values[:10])
+            recorder.record_many(values[10:])
+
+        reader = TrajectoryReader(self.directory)
+        view = reader[33:40]
+        self.assertIsInstance(view, np.memmap)  # within one chunk: zero-copy
+        np.testing.assert_array_equal(view['b'], values[33:40, 1])
+        np.testing.assert_array_equal(reader[20:90:3]['c'], values[20:90:3, 2])
+        np.testing.assert_array_equal(np.concatenate(list(reader.field('a'))), values[:, 0])
+        self.assertEqual(len(reader[50:50]), 0)
+        self.assertRaises(IndexError, reader.__getitem__, 100)
+
+    def test_reader_sees_flushed_records(self):
+        recorder = TrajectoryRecorder(self.directory, ('x',), chunk_size=4)
+        for value in range(6):
+            recorder.record([value])
+        recorder.flush()
+        reader = TrajectoryReader(self.directory)
+        self.assertEqual(len(reader), 6)
+        self.assertEqual(reader[5]['x'], 5)
+        recorder.close()
+
+    def test_closed_recorder(self):
+        recorder = TrajectoryRecorder(self.directory, ('x',), chunk_size=4)
+        for value in range(3):
+            recorder.record([value])
+        recorder.close()
+        self.assertRaises(ValueError, recorder.record, [9])
+        self.assertRaises(ValueError, recorder.record_many, [[9]])
+        self.assertRaises(ValueError, recorder.flush)
+        recorder.close()
+        reader = TrajectoryReader(self.directory)
+        self.assertEqual(len(reader), 3)
+        np.testing.assert_array_equal(reader[:]['x'], [0, 1, 2])
+
+    def test_replaces_previous_recording(self):
+        with TrajectoryRecorder(self.directory, ('x',), chunk_size=2) as recorder:
+            recorder.record_many(np.arange(5)[:, None])
+        with TrajectoryRecorder(self.directory, ('x',), chunk_size=2) as recorder:
+            recorder.record([7])
+        self.assertEqual(sorted(name for name in os.listdir(self.directory) if name.startswith('chunk_')),
+                         ['chunk_000000.npy'])
+        np.testing.assert_array_equal(TrajectoryReader(self.directory)[:]['x'], [7])
+
+    def test_unsupported_model(self):
+        self.assertRaises(ValueError, TrajectoryRecorder.for_model, self.directory, object())
+
+
+if __name__ == '__main__':
+    unittest.main()
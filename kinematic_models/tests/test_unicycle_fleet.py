@@ -0,0 +1,64 @@
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from kinematic_models.wheeled_robots.unicycle_fleet import UnicycleFleet
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+
+class TestUnicycleFleet(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.robots = [UnicycleRobot(distance, diameter)
+                       for distance, diameter in zip(rng.uniform(0.5, 2, 50), rng.uniform(0.1, 1, 50))]
+        self.fleet = UnicycleFleet.from_robots(self.robots)
+        self.motor_velocities = rng.uniform(-10, 10, (100, 50, 2))
+
+    def test_matches_individual_robots(self):
+        for motor_velocities in self.motor_velocities:
+            self.fleet.update_position(motor_velocities, 0.01)
+            for robot, motors in zip(self.robots, motor_velocities):
+                robot.update_position(motors, 0.01)
+
+        np.testing.assert_array_equal(self.fleet.x, [robot.x for robot in self.robots])
+        np.testing.assert_array_equal(self.fleet.y, [robot.y for robot in self.robots])
+        np.testing.assert_array_equal(self.fleet.theta, [robot.theta for robot in self.robots])
+
+    def test_velocities_match_individual_robots(self):
+        motor_velocities = self.motor_velocities[0]
+        np.testing.assert_array_equal(self.fleet.linear_velocity(motor_velocities),
+                                      [robot.linear_velocity(motors)
+                                       for robot, motors in zip(self.robots, motor_velocities)])
+        np.testing.assert_array_equal(self.fleet.angular_velocity(motor_velocities),
+                                      [robot.angular_velocity(motors)
+                                       for robot, motors in zip(self.robots, motor_velocities)])
+
+    def test_shared_geometry(self):
+        fleet = UnicycleFleet(3, 1, 1)
+        np.testing.assert_array_equal(fleet.angular_velocity([[0, 5], [5, 5], [-5, 5]]), [2.5, 0, 5])
+
+    def test_pose_rows_are_contiguous(self):
+        self.assertTrue(self.fleet.x.flags.c_contiguous)
+        self.assertTrue(self.fleet.theta.flags.c_contiguous)
+
+    def test_invalid_wheel_distance(self):
+        with self.assertRaises(ValueError):
+            UnicycleFleet(2, [1, -1], 1)
+
+    def test_invalid_wheel_diameter(self):
+        with self.assertRaises(ValueError):
+            UnicycleFleet(2, 1, 0)
+
+    def test_from_no_robots(self):
+        with self.assertRaises(ValueError):
+            UnicycleFleet.from_robots([])
+
+    def test_invalid_motor_velocities_shape(self):
+        with self.assertRaises(ValueError):
+            self.fleet.update_position(np.zeros((50, 3)), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
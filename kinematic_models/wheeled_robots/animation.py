@@ -0,0 +1,354 @@
+"""
+Blitted matplotlib animation of wheeled robot trajectories.
+
+The draw and plot methods of the models add new patches and quivers on every call, which is fine for a still image
+but makes an animation slower and heavier at every frame. Here every layer creates its artists once, as collections
+holding all of its robots, and each frame only replaces their vertices, segments or offsets from a state history.
+The static part of the figure (axes, grid, trails) is rendered once and restored before the animated artists are
+drawn over it.
+
+Like rendering, this module imports matplotlib and is never imported by the kinematic modules.
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+import numpy as np
+from matplotlib.animation import FuncAnimation
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.quiver import Quiver
+from numpy import ndarray
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.nonholonomic_robot import arm_kinematics
+from kinematic_models.wheeled_robots.omnidirectional_robots.omnidirectional_robot import (OmnidirectionalRobot,
+                                                                                          SimulationResult)
+
+# Corners of a centred rectangle, in the order of matplotlib's Rectangle path
+UNIT_CORNERS = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]])
+
+
+def rectangle_corners(centers: ndarray, yaws: ndarray, lengths, widths) -> ndarray:
+    """Corners (..., 4, 2) of rectangles with centres (..., 2), yaws (...) in radians and sizes along and across."""
+    cos, sin = np.cos(yaws)[..., None], np.sin(yaws)[..., None]
+    along = UNIT_CORNERS[:, 0] * np.asarray(lengths)[..., None]
+    across = UNIT_CORNERS[:, 1] * np.asarray(widths)[..., None]
+    corners = np.empty(np.broadcast_shapes(along.shape, cos.shape) + (2,))
+    corners[..., 0] = centers[..., 0, None] + cos * along - sin * across
+    corners[..., 1] = centers[..., 1, None] + sin * along + cos * across
+    return corners
+
+
+def _per_frame(values, num_frames: int, num_robots: int, name: str) -> ndarray:
+    """Broadcasts a scalar, per robot (R,) or per frame (T,) / (T, R) value to (T, R)."""
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1 and len(values) == num_frames and num_frames != num_robots:
+        values = values[:, None]
+    try:
+        return np.broadcast_to(values, (num_frames, num_robots))
+    except ValueError:
+        raise ValueError(f"{name} must be a scalar, or have shape (T,), (R,) or (T, R)") from None
+
+
+class Layer(ABC):
+    """Robots of one kind animated from a state history; subclasses create and update their artists."""
+    num_frames: int
+    artists: list
+
+    @abstractmethod
+    def add_to(self, ax: Axes):
+        """Creates the artists on the axes; called once."""
+
+    @abstractmethod
+    def update(self, index: int):
+        """Moves the artists to state index of the history."""
+
+    @abstractmethod
+    def bounds(self) -> tuple[ndarray, ndarray]:
+        """Lower and upper corners of the area the robots cover over the whole history."""
+
+
+class CarLayer(Layer):
+    def __init__(self, states: ndarray, wheelbase: float = 2.5, length: float = 4.5, width: float = 1.5,
+                 steering_angles=0.0, degrees: bool = True, arm_angles=None, arm_offset=(0, 0),
+                 arm_length: float = 1.0, body_color='lightblue', trail_color='gray'):
+        """
+        AckermannCars, and optionally the arms of NonholonomicRobots, drawn as draw does.
+
+        Args:
+            states (ndarray): Car states (T, 6) of one car or (T, R, 6) of R cars, e.g. from ackermann_rollout
+                (whose (R, T, 6) output needs swapaxes(0, 1)).
+            wheelbase, length, width: Car geometry.
+            steering_angles: Steering angle drawn at every state, scalar, (T,), (R,) or (T, R).
+            degrees (bool): Whether steering and arm angles are in degrees.
+            arm_angles: Arm angle relative to the car, with the same shapes as steering_angles; None draws no arm.
+            arm_offset, arm_length: Arm geometry, see NonholonomicRobot.
+            trail_color: Color of the static trajectory line of every car; None draws no trail.
+        """
+        states = np.asarray(states, dtype=float)
+        if states.ndim == 2:
+            states = states[:, None]
+        if states.ndim != 3 or states.shape[2] != 6:
+            raise ValueError("States must have shape (T, 6) or (T, R, 6)")
+        self.states = states
+        self.num_frames, num_robots = states.shape[:2]
+        self.wheelbase, self.length, self.width = wheelbase, length, width
+        scale = np.pi / 180 if degrees else 1.0
+        self.steering_angles = _per_frame(steering_angles, self.num_frames, num_robots, 'Steering angles') * scale
+        self.arm_angles = None if arm_angles is None else \
+            _per_frame(arm_angles, self.num_frames, num_robots, 'Arm angles') * scale
+        self.arm_offset, self.arm_length = arm_offset, arm_length
+        self.body_color, self.trail_color = body_color, trail_color
+        self.artists = []
+
+    @classmethod
+    def from_car(cls, car: AckermannCar, states: ndarray, steering_angles=None, arm_angles=None, **kwargs):
+        """Layer using the geometry and angle units of a car; a NonholonomicRobot also gets its arm drawn."""
+        if steering_angles is None:
+            steering_angles = car.steering_angle
+        if hasattr(car, 'arm_length'):
+            if arm_angles is None:  # stored in radians whatever the car's units
+                arm_angles = np.rad2deg(car.arm_angle) if car.degrees else car.arm_angle
+            kwargs.setdefault('arm_offset', car.arm_offset)
+            kwargs.setdefault('arm_length', car.arm_length)
+        return cls(states, car.wheelbase, car.length, car.width, steering_angles, car.degrees, arm_angles, **kwargs)
+
+    def add_to(self, ax: Axes):
+        if self.trail_color is not None:
+            ax.add_collection(LineCollection(self.states[..., :2].swapaxes(0, 1), colors=self.trail_color,
+                                             linewidths=0.5))
+        self.bodies = PolyCollection([], facecolors=self.body_color, animated=True)
+        self.axles = LineCollection([], colors='black', animated=True)
+        self.steering = LineCollection([], colors='red', linestyles='dashed', animated=True)
+        self.artists = [self.bodies, self.axles, self.steering]
+        if self.arm_angles is not None:
+            self.arms = LineCollection([], colors='green', linewidths=2, animated=True)
+            self.artists.append(self.arms)
+        for artist in self.artists:
+            ax.add_collection(artist, autolim=False)
+
+    def update(self, index: int):
+        state = self.states[index]
+        positions, yaws = state[:, :2], state[:, 2]
+        self.bodies.set_verts(rectangle_corners(positions, yaws, self.length, self.width))
+
+        front = positions + self.wheelbase * np.column_stack([np.cos(yaws), np.sin(yaws)])
+        self.axles.set_segments(np.stack([positions, front], axis=1))
+        steering = yaws + self.steering_angles[index]
+        tips = front + 0.5 * np.column_stack([np.cos(steering), np.sin(steering)])
+        self.steering.set_segments(np.stack([front, tips], axis=1))
+
+        if self.arm_angles is not None:
+            arms = arm_kinematics(state, self.arm_angles[index], self.arm_offset, self.arm_length, degrees=False)
+            self.arms.set_segments(np.stack([arms.arm_bases, arms.end_effectors], axis=1))
+
+    def bounds(self) -> tuple[ndarray, ndarray]:
+        reach = np.hypot(self.length, self.width) / 2 + self.wheelbase + 0.5
+        if self.arm_angles is not None:
+            reach = max(reach, np.hypot(*self.arm_offset) + self.arm_length)
+        positions = self.states[..., :2].reshape(-1, 2)
+        return positions.min(axis=0) - reach, positions.max(axis=0) + reach
+
+
+class OmnidirectionalLayer(Layer):
+    def __init__(self, robot: OmnidirectionalRobot, positions: ndarray, orientations: ndarray,
+                 motor_velocities: ndarray = None, velocities: ndarray = None, velocity_scale: float = 1.0,
+                 wheel_color=None, velocity_color=None, global_velocity='green', edge_color='black',
+                 trail_color='gray'):
+        """
+        Robots sharing the wheel layout of an OmnidirectionalRobot, drawn as plot_velocity does.
+
+        Args:
+            robot: Robot whose wheels (and radius, for a RadialOmnidirectionalRobot) are drawn.
+            positions (ndarray): Positions (T, 2) of one robot or (T, R, 2) of R robots.
+            orientations (ndarray): Orientations in degrees, (T,) or (T, R).
+            motor_velocities (ndarray): Motor velocities (T, N) or (T, R, N) drawn as wheel arrows; None skips them.
+            velocities (ndarray): Global twists (T, 3) or (T, R, 3) drawn as body arrows; None skips them.
+            velocity_scale (float): Arrow length per unit of velocity.
+        """
+        positions = np.asarray(positions, dtype=float)
+        if positions.ndim == 2:
+            positions = positions[:, None]
+        if positions.ndim != 3 or positions.shape[2] != 2:
+            raise ValueError("Positions must have shape (T, 2) or (T, R, 2)")
+        self.positions = positions
+        self.num_frames, num_robots = positions.shape[:2]
+        self.orientations = np.deg2rad(_per_frame(orientations, self.num_frames, num_robots, 'Orientations'))
+
+        wheels = robot.wheels
+        self.wheel_offsets = np.array([wheel.distance_from_robot_frame for wheel in wheels], dtype=float)
+        self.wheel_yaws = np.deg2rad([wheel.orientation for wheel in wheels])
+        self.wheel_radii = np.array([wheel.diameter for wheel in wheels]) / 2
+        self.wheel_widths = np.array([wheel.width for wheel in wheels])
+        self.radius = getattr(robot, 'radius', None)
+
+        def batched(values, name):
+            if values is None:
+                return None
+            values = np.asarray(values, dtype=float)
+            values = values[:, None] if values.ndim == 2 else values
+            if values.shape[:2] != (self.num_frames, num_robots):
+                raise ValueError(f"{name} must have one row per state and robot")
+            return values
+
+        self.motor_velocities = batched(motor_velocities, 'Motor velocities')
+        self.velocities = batched(velocities, 'Velocities')
+        self.velocity_scale = velocity_scale
+        self.wheel_color = wheel_color or robot.wheel_color
+        self.velocity_color = velocity_color or robot.velocity_color
+        self.global_velocity, self.edge_color, self.trail_color = global_velocity, edge_color, trail_color
+        self.artists = []
+
+    @classmethod
+    def from_simulation(cls, robot: OmnidirectionalRobot, result: SimulationResult, **kwargs):
+        """Layer replaying OmnidirectionalRobot.simulate, with the motor velocities that led to every state."""
+        motor_velocities = result.motor_velocities
+        if len(motor_velocities):
+            motor_velocities = np.concatenate([motor_velocities[:1], motor_velocities])
+        else:
+            motor_velocities = np.zeros((1, len(robot.wheels)))
+        return cls(robot, result.positions, result.orientations, motor_velocities, result.velocities, **kwargs)
+
+    def _quiver(self, ax: Axes, count: int, color) -> Quiver:
+        zeros = np.zeros(count)
+        return ax.quiver(zeros, zeros, zeros, zeros, color=color, angles='xy', scale_units='xy',
+                         scale=1 / self.velocity_scale, animated=True)
+
+    def add_to(self, ax: Axes):
+        num_robots, num_wheels = self.positions.shape[1], len(self.wheel_offsets)
+        if self.trail_color is not None:
+            ax.add_collection(LineCollection(self.positions.swapaxes(0, 1), colors=self.trail_color, linewidths=0.5))
+        self.wheels = PolyCollection([], facecolors=self.wheel_color, animated=True)
+        ax.add_collection(self.wheels, autolim=False)
+        self.artists = [self.wheels]
+        if self.radius is not None:
+            self.bodies = EllipseCollection(2 * self.radius, 2 * self.radius, 0, units='xy',
+                                            offsets=self.positions[0], offset_transform=ax.transData,
+                                            facecolors='none', edgecolors=self.edge_color, animated=True)
+            ax.add_collection(self.bodies, autolim=False)
+            self.artists.append(self.bodies)
+        if self.motor_velocities is not None:
+            self.wheel_arrows = self._quiver(ax, num_robots * num_wheels, self.velocity_color)
+            self.artists.append(self.wheel_arrows)
+        if self.velocities is not None:
+            self.body_arrows = self._quiver(ax, num_robots, self.global_velocity)
+            self.artists.append(self.body_arrows)
+
+    def update(self, index: int):
+        positions, orientations = self.positions[index], self.orientations[index]
+        cos, sin = np.cos(orientations)[:, None], np.sin(orientations)[:, None]
+        offset_x, offset_y = self.wheel_offsets[:, 0], self.wheel_offsets[:, 1]
+        centers = np.stack([positions[:, 0, None] + cos * offset_x - sin * offset_y,
+                            positions[:, 1, None] + sin * offset_x + cos * offset_y], axis=-1)  # (R, N, 2)
+        yaws = orientations[:, None] + self.wheel_yaws
+        self.wheels.set_verts(rectangle_corners(centers, yaws, 2 * self.wheel_radii, self.wheel_widths)
+                              .reshape(-1, 4, 2))
+        if self.radius is not None:
+            self.bodies.set_offsets(positions)
+
+        if self.motor_velocities is not None:
+            # Each wheel pushes perpendicular to its axis, see OmniWheel.get_velocity_components
+            speeds = self.motor_velocities[index] * self.wheel_radii
+            self.wheel_arrows.set_offsets(centers.reshape(-1, 2))
+            self.wheel_arrows.set_UVC((-np.sin(yaws) * speeds).ravel(), (np.cos(yaws) * speeds).ravel())
+        if self.velocities is not None:
+            self.body_arrows.set_offsets(positions)
+            self.body_arrows.set_UVC(self.velocities[index, :, 0], self.velocities[index, :, 1])
+
+    def bounds(self) -> tuple[ndarray, ndarray]:
+        reach = np.max(np.hypot(*self.wheel_offsets.T) + np.hypot(2 * self.wheel_radii, self.wheel_widths) / 2)
+        if self.radius is not None:
+            reach = max(reach, self.radius)
+        positions = self.positions.reshape(-1, 2)
+        return positions.min(axis=0) - reach, positions.max(axis=0) + reach
+
+
+def headless_axes(figsize=(8, 8), dpi: int = 100) -> Axes:
+    """Axes of a figure rendered by Agg, independent of pyplot and of the configured backend."""
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure.add_subplot()
+
+
+class RobotAnimation:
+    def __init__(self, layers: list[Layer], ax: Axes = None, decimation: int = 1, padding: float = 0.5):
+        """
+        Animation of layers sharing one state history length.
+
+        Args:
+            layers: The robots to draw, e.g. CarLayer and OmnidirectionalLayer instances.
+            ax: Axes to draw on; a headless Agg one is created when omitted.
+            decimation (int): Draw every decimation states (the last one is always drawn).
+            padding (float): Margin added around the area covered by the robots.
+        """
+        if not layers:
+            raise ValueError("At least one layer is required")
+        num_frames = {layer.num_frames for layer in layers}
+        if len(num_frames) != 1:
+            raise ValueError("Every layer must have the same number of states")
+        num_frames = num_frames.pop()
+        self.frame_indices = np.arange(0, num_frames, max(1, decimation))
+        if self.frame_indices[-1] != num_frames - 1:
+            self.frame_indices = np.append(self.frame_indices, num_frames - 1)
+
+        self.ax = headless_axes() if ax is None else ax
+        self.figure = self.ax.figure
+        self.layers = layers
+        for layer in layers:
+            layer.add_to(self.ax)
+        self.artists = [artist for layer in layers for artist in layer.artists]
+
+        bounds = [layer.bounds() for layer in layers]
+        low = np.min([low for low, _ in bounds], axis=0) - padding
+        high = np.max([high for _, high in bounds], axis=0) + padding
+        self.ax.set_xlim(low[0], high[0])
+        self.ax.set_ylim(low[1], high[1])
+        self.ax.set_aspect('equal')
+
+    def draw_frame(self, index: int) -> list:
+        """Moves every artist to state index and returns the artists, as FuncAnimation expects."""
+        for layer in self.layers:
+            layer.update(index)
+        return self.artists
+
+    def animate(self, interval: float = 40, **kwargs) -> FuncAnimation:
+        """
+        Blitted FuncAnimation over the decimated states, e.g. for plt.show or save with a movie writer.
+
+        Keep a reference to the returned object for as long as the animation runs.
+        """
+        return FuncAnimation(self.figure, self.draw_frame, frames=self.frame_indices,
+                             init_func=lambda: self.draw_frame(self.frame_indices[0]), blit=True,
+                             interval=interval, **kwargs)
+
+    def render_frames(self) -> Iterator[ndarray]:
+        """
+        Renders the decimated states with Agg and yields every frame as an RGBA image (H, W, 4).
+
+        The static background is rendered once; each frame restores it and draws the animated artists over it.
+        Every image is a view of the canvas buffer, valid until the next frame is rendered: copy it to keep it.
+        """
+        canvas = self.figure.canvas
+        if not isinstance(canvas, FigureCanvasAgg):
+            raise ValueError("Rendering frames needs an Agg canvas, see headless_axes")
+        canvas.draw()  # animated artists are left out of the background
+        background = canvas.copy_from_bbox(self.figure.bbox)
+        for index in self.frame_indices:
+            canvas.restore_region(background)
+            for artist in self.draw_frame(index):
+                self.ax.draw_artist(artist)
+            yield np.asarray(canvas.buffer_rgba())
+
+    def save_frames(self, directory: str, prefix: str = 'frame') -> list[str]:
+        """Writes every rendered frame as a numbered PNG file, e.g. for ffmpeg, and returns their paths."""
+        from matplotlib.image import imsave
+        os.makedirs(directory, exist_ok=True)
+        digits = len(str(len(self.frame_indices)))
+        paths = []
+        for number, frame in enumerate(self.render_frames()):
+            paths.append(os.path.join(directory, f'{prefix}_{number:0{digits}d}.png'))
+            imsave(paths[-1], frame)
+        return paths
@@ -1,12 +1,18 @@
+from typing import TYPE_CHECKING
+
 import numpy as np
 from numpy import array, ndarray, cos, sin, tan, zeros, deg2rad, rad2deg
-from matplotlib.axes import Axes
-import matplotlib.patches as patches
-from numpy.linalg import inv
+
+from common.profiling import hot_path
+from kinematic_models.wheeled_robots.integrators import Integrator, get_integrator
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
 
 class AckermannCar:
-    def __init__(self, state: ndarray = None, wheelbase=2.5, width=1.5, length=4.5, degrees=True):
+    def __init__(self, state: ndarray = None, wheelbase=2.5, width=1.5, length=4.5, degrees=True,
+                 integrator: str | Integrator = 'euler'):
         if state is None:
             state = zeros(6)
         self.state: ndarray = state
@@ -16,8 +22,10 @@ class AckermannCar:
         self.steering_angle = 0  # current steering angle (radians)
         self.velocity = 0  # current velocity (m/s)
         self.degrees = degrees
+        self.integrator = get_integrator(integrator)
         self.state[2] = self.yaw
 
+    @hot_path
     def kinematic_matrix(self, front: bool = False):
         yaw = self.state[2]
         angle = yaw + front * (deg2rad(self.steering_angle) if self.degrees else self.steering_angle)
@@ -25,6 +33,7 @@ class AckermannCar:
                       [sin(angle), cos(angle), 0],
                       [0, 0, 1]])
 
+    @hot_path
     def get_robot_velocity(self, velocity: float = None, steering_angle: float = None):
         if velocity is None:
             velocity = self.velocity
@@ -34,10 +43,12 @@ class AckermannCar:
             steering_angle = deg2rad(steering_angle) if self.degrees else steering_angle
         return array([velocity, 0, velocity * tan(steering_angle) / self.wheelbase])
 
+    @hot_path
     def body_velocity_from_state(self, velocities: ndarray = None, front: bool = False):
         if velocities is None:
             velocities = self.state[3:6]
-        return inv(self.kinematic_matrix(front)) @ velocities
+        # The kinematic matrix is a pure rotation, so its inverse is its transpose
+        return self.kinematic_matrix(front).T @ velocities
 
     def front_velocity(self, velocity: float = None, steering_angle: float = None):
         return self.kinematic_matrix(front=True) @ self.get_robot_velocity(velocity, steering_angle)
@@ -48,38 +59,97 @@ class AckermannCar:
     def center_velocity(self, velocity, steering_angle):
         return (self.front_velocity(velocity, steering_angle) + self.back_velocity(velocity, steering_angle)) / 2
 
+    @hot_path
     def update(self, velocity: float, steering_angle: float, dt: float):
         self.steering_angle = steering_angle
         self.velocity = velocity
         v_robot = self.get_robot_velocity(velocity, steering_angle)
         # Update car's position and orientation
         v_body = self.body_velocity_from_state(v_robot)
-        self.state[0:3] += dt * self.kinematic_matrix() @ v_robot
+        dx, dy = self.integrator(self.state[2], v_robot[0], v_robot[1], v_robot[2], dt)
+        self.state[0:3] += [dx, dy, dt * v_robot[2]]
         self.state[3:6] = v_body
         self.state[2] = np.mod(self.state[2], 2 * np.pi)
 
-    def draw(self, ax: Axes):
-        # Car body
-        body_x = float(self.state[0]) - self.length / 2
-        body_y = float(self.state[1]) - self.width / 2
-        body_rect = patches.Rectangle((body_x, body_y), self.length, self.width, angle=np.rad2deg(self.state[2]),
-                                      rotation_point="center",
-                                      color="lightblue")
-        ax.add_patch(body_rect)
-
-        # Front and rear axle lines
-        ax.plot([self.state[0], self.state[0] + self.wheelbase * np.cos(self.state[2])],
-                [self.state[1], self.state[1] + self.wheelbase * np.sin(self.state[2])],
-                color="black")
-
-        # Steering angle visualization (optional)
-        steering_line_x = self.state[0] + self.wheelbase * np.cos(self.state[2])
-        steering_line_y = self.state[1] + self.wheelbase * np.sin(self.state[2])
-        ax.plot([steering_line_x, steering_line_x + 0.5 * np.cos(self.state[2] + self.steering_angle)],
-                [steering_line_y, steering_line_y + 0.5 * np.sin(self.state[2] + self.steering_angle)],
-                color="red", linestyle="dashed")
+    @hot_path
+    def rollout(self, velocities: ndarray, steering_angles: ndarray, dt: float | ndarray) -> ndarray:
+        """
+        Rolls out a sequence of commands from the current state without modifying the car.
+
+        Args:
+            velocities (ndarray): Velocity commands (T,) or batched (B, T).
+            steering_angles (ndarray): Steering commands with the same shape as velocities.
+            dt (float or ndarray): Time step, shared or per step (T,) / (B, T).
+
+        Returns:
+            ndarray: The states after every step, (T, 6) or (B, T, 6).
+        """
+        return ackermann_rollout(self.state, velocities, steering_angles, dt, self.wheelbase, self.degrees,
+                                 integrator=self.integrator)
+
+    def draw(self, ax: 'Axes'):
+        from kinematic_models.wheeled_robots import rendering
+        rendering.draw_car(self, ax)
 
     @property
     def yaw(self):
         """Yaw angle in radians or degrees, depending on configuration."""
         return rad2deg(self.state[2]) if self.degrees else self.state[2]
+
+
+@hot_path
+def ackermann_rollout(state: ndarray, velocities: ndarray, steering_angles: ndarray, dt: float | ndarray,
+                      wheelbase: float = 2.5, degrees: bool = True, out: ndarray = None,
+                      integrator: str | Integrator = 'euler') -> ndarray:
+    """
+    Vectorized equivalent of calling AckermannCar.update once per command.
+
+    The yaw sequence only depends on the commands, so it is accumulated with a cumulative sum and every
+    position increment is then evaluated at once by the integrator, using closed-form rotations instead of
+    matrix inverses.
+
+    Args:
+        state (ndarray): Initial state (6,) or one per batch entry (..., 6).
+        velocities (ndarray): Velocity commands (..., T).
+        steering_angles (ndarray): Steering commands (..., T), in degrees when degrees is True.
+        dt (float or ndarray): Time step, broadcastable to (..., T).
+        wheelbase (float): Distance between front and rear axles.
+        degrees (bool): Whether steering angles are given in degrees.
+        out (ndarray): Optional (..., T, 6) buffer receiving the trajectory.
+        integrator (str or callable): Pose integrator, see kinematic_models.wheeled_robots.integrators.
+
+    Returns:
+        ndarray: The states after every step, (..., T, 6).
+    """
+    velocities, steering_angles, dt = np.broadcast_arrays(np.asarray(velocities, dtype=float),
+                                                          np.asarray(steering_angles, dtype=float),
+                                                          np.asarray(dt, dtype=float))
+    if velocities.ndim == 0:
+        raise ValueError("Commands must have at least one time step")
+    state = np.asarray(state, dtype=float)
+    if state.shape[-1] != 6:
+        raise ValueError("State must have 6 elements: x, y, yaw, vx, vy, yaw rate")
+    shape = np.broadcast_shapes(velocities.shape, state.shape[:-1] + (1,)) + (6,)
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"Output buffer must have shape {shape}")
+
+    steering = deg2rad(steering_angles) if degrees else steering_angles
+    yaw_rate = velocities * tan(steering) / wheelbase
+
+    # Yaw before each step, then the wrapped yaw after it
+    yaw_after = state[..., 2:3] + np.cumsum(dt * yaw_rate, axis=-1)
+    yaw_before = np.concatenate([np.broadcast_to(state[..., 2:3], yaw_after.shape[:-1] + (1,)),
+                                 yaw_after[..., :-1]], axis=-1)
+    cos_yaw, sin_yaw = cos(yaw_before), sin(yaw_before)
+
+    dx, dy = get_integrator(integrator)(yaw_before, velocities, 0, yaw_rate, dt)
+    out[..., 0] = state[..., 0:1] + np.cumsum(dx, axis=-1)
+    out[..., 1] = state[..., 1:2] + np.cumsum(dy, axis=-1)
+    out[..., 2] = np.mod(yaw_after, 2 * np.pi)
+    # Body velocities use the transpose of the rotation at the start of each step
+    out[..., 3] = cos_yaw * velocities
+    out[..., 4] = -sin_yaw * velocities
+    out[..., 5] = yaw_rate
+    return out
@@ -0,0 +1,230 @@
+"""
+Asyncio fixed-rate stepping of wheeled robot models.
+
+Every model runs in its own task on absolute deadlines (start + k * period), so timing errors never accumulate.
+At each tick the task drains its command queue, keeping the latest command (commands are held between updates),
+steps the model with the nominal period and records how late it woke up, how long the step took and whether the
+step finished after the next deadline. Ticks that are already overdue when a step ends are skipped rather than
+run back to back.
+"""
+import asyncio
+import time
+from typing import Any, Callable, Iterator
+
+import numpy as np
+from numpy import ndarray
+
+# A stepper advances one model by one command held during dt
+Stepper = Callable[[Any, Any, float], None]
+
+
+def step_ackermann(car, command, dt: float):
+    """Steps an AckermannCar (or NonholonomicRobot) with a (velocity, steering angle) command."""
+    car.update(command[0], command[1], dt)
+
+
+def step_omnidirectional(robot, command, dt: float):
+    """Steps an OmnidirectionalRobot with one motor velocity per wheel."""
+    robot.move(dt, np.asarray(command))
+
+
+def step_unicycle(robot, command, dt: float):
+    """Steps a UnicycleRobot with its (left, right) motor angular velocities."""
+    robot.update_position(command, dt)
+
+
+def default_stepper(model) -> Stepper:
+    """Stepper matching the model, based on the interface it exposes."""
+    if hasattr(model, 'move'):
+        return step_omnidirectional
+    if hasattr(model, 'update') and hasattr(model, 'steering_angle'):
+        return step_ackermann
+    if hasattr(model, 'update_position'):
+        return step_unicycle
+    raise ValueError(f"Unsupported model: {type(model).__name__}")
+
+
+class LatencyHistogram:
+    def __init__(self, bucket_width: float = 1e-5, max_latency: float = 0.1):
+        """
+        Fixed-width histogram of durations in seconds, cheap enough to update on every tick.
+
+        Durations above max_latency fall in a final overflow bucket; the exact maximum is kept aside.
+        """
+        if bucket_width <= 0 or max_latency <= bucket_width:
+            raise ValueError("Bucket width must be positive and smaller than the maximum latency")
+        self.bucket_width = bucket_width
+        self.counts = np.zeros(int(np.ceil(max_latency / bucket_width)) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        seconds = max(seconds, 0.0)
+        self.counts[min(int(seconds / self.bucket_width), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th percentile (0-100), capped at the maximum seen."""
+        if not self.count:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), np.ceil(q / 100 * self.count)))
+        if bucket == len(self.counts) - 1:  # overflow bucket
+            return self.max
+        return min((bucket + 1) * self.bucket_width, self.max)
+
+
+class ChannelStatistics:
+    def __init__(self, name: str, rate: float, bucket_width: float = 1e-5, max_latency: float = 0.1):
+        self.name = name
+        self.rate = rate
+        self.wake_latency = LatencyHistogram(bucket_width, max_latency)  # lateness of each tick's wake-up
+        self.step_time = LatencyHistogram(bucket_width, max_latency)  # duration of each model step
+        self.ticks = 0
+        self.deadline_misses = 0  # steps that finished after the next tick's deadline
+        self.skipped_ticks = 0  # overdue ticks that were dropped
+        self.commands = 0  # commands consumed from the queue
+
+    def summary(self) -> dict:
+        return {'name': self.name, 'rate': self.rate, 'ticks': self.ticks,
+                'deadline_misses': self.deadline_misses, 'skipped_ticks': self.skipped_ticks,
+                'commands': self.commands,
+                'wake_latency_p50': self.wake_latency.percentile(50),
+                'wake_latency_p99': self.wake_latency.percentile(99), 'wake_latency_max': self.wake_latency.max,
+                'step_time_mean': self.step_time.mean, 'step_time_p99': self.step_time.percentile(99),
+                'step_time_max': self.step_time.max}
+
+
+class ControlChannel:
+    def __init__(self, model, rate: float, queue: asyncio.Queue = None, step: Stepper = None, name: str = None,
+                 initial_command=None):
+        """
+        One model stepped at a fixed rate from the commands of a queue.
+
+        Args:
+            model: The model to step, e.g. an AckermannCar or an OmnidirectionalRobot.
+            rate (float): Ticks per second.
+            queue: Queue delivering commands; a new one is created when omitted.
+            step: Function (model, command, dt) stepping the model, see default_stepper.
+            name (str): Name used in the statistics.
+            initial_command: Command held until the first one arrives; the model is not stepped while it is None.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be a positive number")
+        self.model = model
+        self.rate = rate
+        self.period = 1 / rate
+        self.queue = asyncio.Queue() if queue is None else queue
+        self.step = default_stepper(model) if step is None else step
+        self.command = initial_command
+        self.statistics = ChannelStatistics(name or type(model).__name__, rate)
+
+    def _latest_command(self):
+        while True:
+            try:
+                self.command = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return self.command
+            self.statistics.commands += 1
+
+    async def run(self, duration: float = None, ticks: int = None):
+        """Steps the model until duration seconds have elapsed or ticks ticks have run, whichever comes first."""
+        loop = asyncio.get_running_loop()
+        statistics = self.statistics
+        start = loop.time()
+        end = float('inf') if duration is None else start + duration
+        tick, deadline = 0, start
+        while (ticks is None or statistics.ticks < ticks) and deadline < end:
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)  # still let the other channels and producers run
+            statistics.wake_latency.record(loop.time() - deadline)
+
+            command = self._latest_command()
+            step_start = time.perf_counter()
+            if command is not None:
+                self.step(self.model, command, self.period)
+            statistics.step_time.record(time.perf_counter() - step_start)
+            statistics.ticks += 1
+
+            tick += 1
+            next_deadline = start + tick * self.period
+            now = loop.time()
+            if now > next_deadline:
+                statistics.deadline_misses += 1
+                overdue = int((now - next_deadline) / self.period)
+                statistics.skipped_ticks += overdue
+                tick += overdue
+            deadline = start + tick * self.period
+
+
+class ControlService:
+    def __init__(self):
+        """Runs many ControlChannels concurrently on one event loop."""
+        self.channels: list[ControlChannel] = []
+
+    def add(self, model, rate: float, queue: asyncio.Queue = None, step: Stepper = None, name: str = None,
+            initial_command=None) -> ControlChannel:
+        channel = ControlChannel(model, rate, queue, step, name, initial_command)
+        self.channels.append(channel)
+        return channel
+
+    async def run(self, duration: float = None, ticks: int = None, producers=()):
+        """
+        Runs every channel, plus optional producer coroutines (e.g. generate_commands), until the channels stop.
+
+        Producers still running when the channels stop are cancelled.
+        """
+        if duration is None and ticks is None:
+            raise ValueError("A duration or a number of ticks is required")
+        producer_tasks = [asyncio.ensure_future(producer) for producer in producers]
+        try:
+            await asyncio.gather(*(channel.run(duration, ticks) for channel in self.channels))
+        finally:
+            for task in producer_tasks:
+                task.cancel()
+            await asyncio.gather(*producer_tasks, return_exceptions=True)
+
+    def summary(self) -> list[dict]:
+        return [channel.statistics.summary() for channel in self.channels]
+
+
+async def generate_commands(queue: asyncio.Queue, commands: Callable[[float], Any] | Iterator, rate: float,
+                            duration: float = None):
+    """
+    In-process command source replacing hardware: puts commands on a queue at a fixed rate.
+
+    Args:
+        queue: Destination queue, e.g. ControlChannel.queue.
+        commands: Function of the elapsed time returning the next command, or an iterator of commands.
+        rate (float): Commands per second.
+        duration (float): Stops after this many seconds, or when the iterator is exhausted.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    index = 0
+    while duration is None or loop.time() - start < duration:
+        if callable(commands):
+            command = commands(loop.time() - start)
+        else:
+            try:
+                command = next(commands)
+            except StopIteration:
+                return
+        await queue.put(command)
+        index += 1
+        await asyncio.sleep(max(0.0, start + index / rate - loop.time()))
+
+
+def sinusoidal_commands(mean: ndarray, amplitude: ndarray, frequency: float) -> Callable[[float], ndarray]:
+    """Command function mean + amplitude * sin(2 pi frequency t), for use with generate_commands."""
+    mean, amplitude = np.asarray(mean, dtype=float), np.asarray(amplitude, dtype=float)
+    return lambda elapsed: mean + amplitude * np.sin(2 * np.pi * frequency * elapsed)
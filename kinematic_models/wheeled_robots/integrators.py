@@ -0,0 +1,74 @@
+"""
+Pose integrators shared by the wheeled kinematic models.
+
+Every model moves with a body twist (vx, vy, omega) that is held constant during a step, so the heading always
+advances exactly by omega * dt. An integrator only decides how the position moves during the step: it receives
+the heading at the start of the step (radians) and the body twist, and returns the global displacement (dx, dy).
+All integrators broadcast, so they work for a single robot as well as for struct-of-arrays fleets and rollouts.
+"""
+from typing import Callable
+
+import numpy as np
+from numpy import cos, sin
+
+Integrator = Callable[..., tuple]
+
+
+def _rotate(theta, vx, vy):
+    return vx * cos(theta) - vy * sin(theta), vx * sin(theta) + vy * cos(theta)
+
+
+def euler(theta, vx, vy, omega, dt):
+    """Explicit forward Euler: moves with the global velocity at the start of the step."""
+    return (vx * cos(theta) - vy * sin(theta)) * dt, (vx * sin(theta) + vy * cos(theta)) * dt
+
+
+def midpoint(theta, vx, vy, omega, dt):
+    """Explicit midpoint: moves with the global velocity at half of the step."""
+    dx, dy = _rotate(theta + omega * dt / 2, vx, vy)
+    return dx * dt, dy * dt
+
+
+def rk4(theta, vx, vy, omega, dt):
+    """Classic fourth-order Runge-Kutta on the pose."""
+    k1 = _rotate(theta, vx, vy)
+    k23 = _rotate(theta + omega * dt / 2, vx, vy)  # k2 and k3 coincide since the heading rate is constant
+    k4 = _rotate(theta + omega * dt, vx, vy)
+    return (k1[0] + 4 * k23[0] + k4[0]) * dt / 6, (k1[1] + 4 * k23[1] + k4[1]) * dt / 6
+
+
+def exact(theta, vx, vy, omega, dt):
+    """Exact constant-twist integration through the SE(2) exponential map."""
+    angle = omega * dt
+    if np.ndim(angle) == 0:
+        # Scalar fast path for single robots
+        if abs(angle) < 1e-6:
+            sin_term, cos_term = 1 - angle ** 2 / 6, angle / 2 - angle ** 3 / 24
+        else:
+            sin_term, cos_term = sin(angle) / angle, (1 - cos(angle)) / angle
+    else:
+        small = np.abs(angle) < 1e-6
+        safe_angle = np.where(small, 1.0, angle)
+        # sin(a) / a and (1 - cos(a)) / a, using their Taylor expansions near zero
+        sin_term = np.where(small, 1 - angle ** 2 / 6, sin(safe_angle) / safe_angle)
+        cos_term = np.where(small, angle / 2 - angle ** 3 / 24, (1 - cos(safe_angle)) / safe_angle)
+    body_dx = (sin_term * vx - cos_term * vy) * dt
+    body_dy = (cos_term * vx + sin_term * vy) * dt
+    return _rotate(theta, body_dx, body_dy)
+
+
+INTEGRATORS: dict[str, Integrator] = {
+    'euler': euler,
+    'midpoint': midpoint,
+    'rk4': rk4,
+    'exact': exact,
+}
+
+
+def get_integrator(integrator: str | Integrator) -> Integrator:
+    """Resolves an integrator name (see INTEGRATORS) or passes a custom integrator function through."""
+    if callable(integrator):
+        return integrator
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Invalid integrator: {integrator}. Use one of {', '.join(INTEGRATORS)}")
+    return INTEGRATORS[integrator]
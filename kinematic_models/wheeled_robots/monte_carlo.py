@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, NamedTuple
+
+import numpy as np
+from numpy import ndarray, tan, deg2rad
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.integrators import Integrator, get_integrator
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+
+class PoseSummary(NamedTuple):
+    step: int
+    mean: ndarray  # (3,) x, y and the unwrapped heading
+    covariance: ndarray  # (3, 3)
+
+
+def merge_moments(count_a, mean_a, scatter_a, count_b, mean_b, scatter_b):
+    """Combines the count, mean and scatter matrix of two particle sets (Chan et al. parallel update)."""
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    scatter = scatter_a + scatter_b + np.outer(delta, delta) * count_a * count_b / count
+    return count, mean, scatter
+
+
+class ParticlePropagator(ABC):
+    def __init__(self, num_particles: int, initial_pose=(0.0, 0.0, 0.0), seed: int | None = None,
+                 chunk_size: int = 65536, integrator: str | Integrator = 'euler'):
+        """
+        Base class for vectorized Monte Carlo propagation of noisy wheeled robots.
+
+        Particles are stored as a (3, K) struct-of-arrays pose. Each step is processed in chunks of particles:
+        the command noise is sampled for one chunk, the chunk is advanced and its moments are merged into the
+        running summary, so only the current poses are ever held in memory, never trajectories or full noise
+        arrays.
+
+        Args:
+            num_particles (int): Number of particles K.
+            initial_pose: Pose (x, y, heading in radians) shared by every particle, or a (3, K) array.
+            seed (int): Seed of the numpy.random.Generator used for every sample.
+            chunk_size (int): Particles advanced together.
+            integrator (str or callable): Pose integrator, see kinematic_models.wheeled_robots.integrators.
+        """
+        if num_particles < 1:
+            raise ValueError("At least one particle is required")
+        self.num_particles = num_particles
+        self.poses = np.empty((3, num_particles))
+        self.poses[:] = np.asarray(initial_pose, dtype=float).reshape(3, -1)
+        self.rng = np.random.default_rng(seed)
+        self.chunk_size = chunk_size
+        self.integrator = get_integrator(integrator)
+        self.steps = 0
+
+    @abstractmethod
+    def _twist(self, command: ndarray, noise: ndarray) -> tuple:
+        """Body twist (vx, vy, omega) of a chunk of particles, with noise (k, 2) sampled for the command."""
+
+    @abstractmethod
+    def _sample_noise(self, size: int) -> ndarray:
+        """Command noise (size, 2) of a chunk of particles."""
+
+    def summary(self) -> PoseSummary:
+        """Mean and covariance of the current particles, accumulated chunk by chunk."""
+        count, mean, scatter = 0, np.zeros(3), np.zeros((3, 3))
+        for start in range(0, self.num_particles, self.chunk_size):
+            count, mean, scatter = merge_moments(count, mean, scatter, *self._chunk_moments(
+                self.poses[:, start:start + self.chunk_size]))
+        return self._summary(count, mean, scatter)
+
+    def _summary(self, count, mean, scatter) -> PoseSummary:
+        covariance = scatter / (count - 1) if count > 1 else np.zeros((3, 3))
+        return PoseSummary(self.steps, mean, covariance)
+
+    @staticmethod
+    def _chunk_moments(poses: ndarray):
+        mean = poses.mean(axis=1)
+        centered = poses - mean[:, None]
+        return poses.shape[1], mean, centered @ centered.T
+
+    def step(self, command, dt: float) -> PoseSummary:
+        """Advances every particle by one noisy command and returns the resulting summary."""
+        command = np.asarray(command, dtype=float)
+        count, mean, scatter = 0, np.zeros(3), np.zeros((3, 3))
+        for start in range(0, self.num_particles, self.chunk_size):
+            poses = self.poses[:, start:start + self.chunk_size]
+            vx, vy, omega = self._twist(command, self._sample_noise(poses.shape[1]))
+            dx, dy = self.integrator(poses[2], vx, vy, omega, dt)
+            poses[0] += dx
+            poses[1] += dy
+            poses[2] += omega * dt
+            count, mean, scatter = merge_moments(count, mean, scatter, *self._chunk_moments(poses))
+        self.steps += 1
+        return self._summary(count, mean, scatter)
+
+    def propagate(self, commands, dt: float | ndarray) -> Iterator[PoseSummary]:
+        """Yields the summary after every command of a (T, 2) sequence, one step at a time."""
+        commands = np.asarray(commands, dtype=float)
+        for command, step_dt in zip(commands, np.broadcast_to(dt, (len(commands),))):
+            yield self.step(command, step_dt)
+
+    def run(self, commands, dt: float | ndarray) -> tuple[ndarray, ndarray]:
+        """Propagates a whole command sequence, returning the means (T, 3) and covariances (T, 3, 3)."""
+        summaries = list(self.propagate(commands, dt))
+        return np.array([s.mean for s in summaries]), np.array([s.covariance for s in summaries])
+
+
+class UnicycleParticles(ParticlePropagator):
+    def __init__(self, num_particles: int, wheel_distance: float, wheel_diameter: float,
+                 motor_noise_std: float | ndarray = 0.0, **kwargs):
+        """
+        Noisy differential-drive robots; commands are motor angular velocities (2,).
+
+        Args:
+            motor_noise_std: Standard deviation of the noise added to each motor velocity, scalar or (2,).
+        """
+        super().__init__(num_particles, **kwargs)
+        if wheel_distance <= 0:
+            raise ValueError("Wheel distance must be a positive number")
+        if wheel_diameter <= 0:
+            raise ValueError("Wheel diameter must be a positive number")
+        self.wheel_distance = wheel_distance
+        self.wheel_diameter = wheel_diameter
+        self.motor_noise_std = np.broadcast_to(np.asarray(motor_noise_std, dtype=float), (2,))
+
+    @classmethod
+    def from_robot(cls, robot: UnicycleRobot, num_particles: int, motor_noise_std=0.0, **kwargs):
+        """Particles starting at the robot's pose with its geometry and integrator."""
+        kwargs.setdefault('integrator', robot.integrator)
+        return cls(num_particles, robot.wheel_distance, robot.wheel_diameter, motor_noise_std,
+                   initial_pose=(robot.x, robot.y, robot.theta), **kwargs)
+
+    def _sample_noise(self, size: int) -> ndarray:
+        return self.rng.standard_normal((size, 2)) * self.motor_noise_std
+
+    def _twist(self, command, noise):
+        left, right = command[0] + noise[:, 0], command[1] + noise[:, 1]
+        v = (left + right) / 2 * (self.wheel_diameter / 2)
+        w = (right - left) * (self.wheel_diameter / 2) / self.wheel_distance
+        return v, 0, w
+
+
+class AckermannParticles(ParticlePropagator):
+    def __init__(self, num_particles: int, wheelbase: float = 2.5, velocity_noise_std: float = 0.0,
+                 steering_noise_std: float = 0.0, degrees=True, **kwargs):
+        """
+        Noisy Ackermann cars; commands are (velocity, steering angle).
+
+        Args:
+            velocity_noise_std: Standard deviation of the velocity noise.
+            steering_noise_std: Standard deviation of the steering noise, in the steering angle units.
+            degrees: Whether steering angles are given in degrees.
+        """
+        super().__init__(num_particles, **kwargs)
+        self.wheelbase = wheelbase
+        self.noise_std = np.array([velocity_noise_std, steering_noise_std], dtype=float)
+        self.degrees = degrees
+
+    @classmethod
+    def from_car(cls, car: AckermannCar, num_particles: int, velocity_noise_std=0.0, steering_noise_std=0.0,
+                 **kwargs):
+        """Particles starting at the car's pose with its geometry, units and integrator."""
+        kwargs.setdefault('integrator', car.integrator)
+        return cls(num_particles, car.wheelbase, velocity_noise_std, steering_noise_std, car.degrees,
+                   initial_pose=car.state[:3], **kwargs)
+
+    def _sample_noise(self, size: int) -> ndarray:
+        return self.rng.standard_normal((size, 2)) * self.noise_std
+
+    def _twist(self, command, noise):
+        velocity = command[0] + noise[:, 0]
+        steering = command[1] + noise[:, 1]
+        steering = deg2rad(steering) if self.degrees else steering
+        return velocity, 0, velocity * tan(steering) / self.wheelbase
@@ -0,0 +1,201 @@
+"""
+Model predictive path integral (MPPI) path tracking for AckermannCar and NonholonomicRobot.
+
+Every control cycle perturbs the nominal (velocity, steering) sequence with K Gaussian samples over a horizon of H
+steps, rolls all K sequences out at once with ackermann_rollout, scores the (K, H) states against the reference
+path and moves the nominal sequence towards the exponentially cost-weighted average of the perturbations. Every
+(K, H) array is allocated once and reused by the following cycles.
+
+The path is rasterised once, when it is set, into grids holding the distance to the path and the path heading at
+the nearest segment, so scoring a cycle costs one grid lookup per rolled-out state whatever the path length.
+"""
+import time
+
+import numpy as np
+from numpy import ndarray
+
+from kinematic_models.wheeled_robots.car_robot import AckermannCar, ackermann_rollout
+from kinematic_models.wheeled_robots.integrators import Integrator, get_integrator
+
+STAGES = ('sample', 'rollout', 'cost', 'update')
+
+
+class MPPIController:
+    def __init__(self, path: ndarray, wheelbase: float = 2.5, degrees: bool = True, horizon: int = 30,
+                 num_samples: int = 1024, dt: float = 0.02, noise_std=(0.5, 5.0), temperature: float = 1.0,
+                 velocity_limits=(0.0, 5.0), steering_limits=(-30.0, 30.0), target_velocity: float = 3.0,
+                 path_weight: float = 10.0, heading_weight: float = 1.0, velocity_weight: float = 0.5,
+                 control_weight: float = 0.01, resolution: float = 0.1, margin: float = 5.0, seed: int = None,
+                 integrator: str | Integrator = 'euler'):
+        """
+        Args:
+            path (ndarray): Reference path (P, 2), in driving order.
+            wheelbase (float): Car wheelbase.
+            degrees (bool): Whether steering angles (noise and limits included) are in degrees.
+            horizon (int): Steps H of every rollout.
+            num_samples (int): Perturbed sequences K per cycle.
+            dt (float): Rollout time step, usually the control period.
+            noise_std: Standard deviation of the velocity and steering perturbations.
+            temperature (float): MPPI temperature; lower values follow the best samples more closely.
+            velocity_limits, steering_limits: Bounds applied to every sampled command.
+            target_velocity (float): Speed the controller tries to hold along the path.
+            path_weight, heading_weight, velocity_weight: Weights of the squared distance to the path, of the
+                heading error and of the squared speed error, summed over the horizon.
+            control_weight (float): Weight of the MPPI control cost of the perturbations.
+            resolution (float): Cell width of the path distance grid.
+            margin (float): Extent of the grid around the path; distances saturate at the margin.
+            seed (int): Seed of the noise generator.
+            integrator (str or callable): Pose integrator of the rollouts.
+        """
+        if horizon < 1 or num_samples < 1:
+            raise ValueError("Horizon and number of samples must be positive")
+        if temperature <= 0:
+            raise ValueError("Temperature must be a positive number")
+        self.wheelbase = wheelbase
+        self.degrees = degrees
+        self.horizon = horizon
+        self.num_samples = num_samples
+        self.dt = dt
+        self.noise_std = np.asarray(noise_std, dtype=float)
+        self.temperature = temperature
+        self.lower = np.array([velocity_limits[0], steering_limits[0]], dtype=float)
+        self.upper = np.array([velocity_limits[1], steering_limits[1]], dtype=float)
+        self.target_velocity = target_velocity
+        self.path_weight = path_weight
+        self.heading_weight = heading_weight
+        self.velocity_weight = velocity_weight
+        self.control_weight = control_weight
+        self.integrator = get_integrator(integrator)
+        self.rng = np.random.default_rng(seed)
+        if resolution <= 0:
+            raise ValueError("Resolution must be a positive number")
+        self.resolution = resolution
+        self.margin = margin
+        self.set_path(path)
+
+        self.nominal = np.zeros((horizon, 2))
+        self.nominal[:, 0] = np.clip(target_velocity, *velocity_limits)
+        # Buffers reused by every cycle
+        self._noise = np.empty((num_samples, horizon, 2))
+        self._controls = np.empty((num_samples, horizon, 2))
+        self._states = np.empty((num_samples, horizon, 6))
+        self._costs = np.empty(num_samples)
+        self._weights = np.empty(num_samples)
+        self.last_timings = dict.fromkeys(STAGES, 0.0)
+        self.total_timings = dict.fromkeys(STAGES, 0.0)
+        self.cycles = 0
+
+    @classmethod
+    def for_car(cls, car: AckermannCar, path: ndarray, **kwargs):
+        """Controller using the geometry, angle units and integrator of a car or NonholonomicRobot."""
+        kwargs.setdefault('integrator', car.integrator)
+        return cls(path, car.wheelbase, car.degrees, **kwargs)
+
+    def set_path(self, path: ndarray, tile: int = 64):
+        """Replaces the reference path (P, 2), rasterising its distance and heading grids tile by tile."""
+        path = np.asarray(path, dtype=float)
+        if path.ndim != 2 or path.shape[1] != 2 or len(path) < 2:
+            raise ValueError("Path must be an array of at least two points (P, 2)")
+        self.path = path
+        (start_x, start_y), (segment_x, segment_y) = path[:-1].T, np.diff(path, axis=0).T
+        lengths = np.maximum(segment_x ** 2 + segment_y ** 2, 1e-12)
+        headings = np.arctan2(segment_y, segment_x)
+        segment_low, segment_high = np.minimum(path[:-1], path[1:]), np.maximum(path[:-1], path[1:])
+
+        def squared_distances(x, y, segments):
+            offset_x, offset_y = x[:, None] - start_x[segments], y[:, None] - start_y[segments]
+            along = np.clip((offset_x * segment_x[segments] + offset_y * segment_y[segments]) / lengths[segments],
+                            0, 1)
+            return (offset_x - along * segment_x[segments]) ** 2 + (offset_y - along * segment_y[segments]) ** 2
+
+        self.origin = path.min(axis=0) - self.margin
+        shape = tuple(np.ceil((path.max(axis=0) + self.margin - self.origin) / self.resolution).astype(int) + 1)
+        self.distance_field = np.empty(shape)  # squared distance to the path, at most margin ** 2
+        self.heading_field = np.empty(shape)
+        all_segments = np.arange(len(lengths))
+        for tile_x in range(0, shape[0], tile):
+            for tile_y in range(0, shape[1], tile):
+                cells = np.indices((min(tile, shape[0] - tile_x), min(tile, shape[1] - tile_y)))
+                x = self.origin[0] + self.resolution * (tile_x + cells[0].ravel())
+                y = self.origin[1] + self.resolution * (tile_y + cells[1].ravel())
+                low, high = np.array([x[0], y[0]]), np.array([x[-1], y[-1]])
+                # Segments that can be the nearest one of a cell closer than the margin (farther distances
+                # saturate), given the distance from the tile centre to the path
+                center = (low + high) / 2
+                center_distances = squared_distances(center[:1], center[1:], all_segments)[0]
+                bound = min(np.sqrt(center_distances.min()) + np.hypot(*(high - low)) / 2, self.margin)
+                gap = np.maximum(np.maximum(segment_low - high, low - segment_high), 0)
+                segments = np.flatnonzero(np.hypot(gap[:, 0], gap[:, 1]) <= bound)
+
+                block = (slice(tile_x, tile_x + cells.shape[1]), slice(tile_y, tile_y + cells.shape[2]))
+                if len(segments) == 0:
+                    self.distance_field[block] = self.margin ** 2
+                    self.heading_field[block] = headings[np.argmin(center_distances)]
+                    continue
+                squared = squared_distances(x, y, segments)
+                nearest = np.argmin(squared, axis=1)
+                self.distance_field[block] = np.minimum(squared[np.arange(len(nearest)), nearest],
+                                                        self.margin ** 2).reshape(cells.shape[1:])
+                self.heading_field[block] = headings[segments[nearest]].reshape(cells.shape[1:])
+
+    def _time(self, stage: str, start: float) -> float:
+        now = time.perf_counter()
+        self.last_timings[stage] = now - start
+        self.total_timings[stage] += now - start
+        return now
+
+    def command(self, state: ndarray) -> ndarray:
+        """Runs one MPPI cycle from a car state (6,) and returns the (velocity, steering angle) to apply."""
+        state = np.asarray(state, dtype=float)
+        start = time.perf_counter()
+
+        noise, controls = self._noise, self._controls
+        self.rng.standard_normal(out=noise)
+        noise *= self.noise_std
+        np.add(self.nominal, noise, out=controls)
+        np.clip(controls, self.lower, self.upper, out=controls)
+        np.subtract(controls, self.nominal, out=noise)  # perturbations actually applied after clipping
+        start = self._time('sample', start)
+
+        states = ackermann_rollout(state, controls[..., 0], controls[..., 1], self.dt, self.wheelbase,
+                                   self.degrees, out=self._states, integrator=self.integrator)
+        start = self._time('rollout', start)
+
+        costs = self._cost(states)
+        costs += self.control_weight * np.einsum('hc,khc->k', self.nominal / self.noise_std ** 2, noise)
+        start = self._time('cost', start)
+
+        weights = self._weights
+        np.subtract(costs, costs.min(), out=weights)
+        weights *= -1 / self.temperature
+        np.exp(weights, out=weights)
+        weights /= weights.sum()
+        self.nominal += np.tensordot(weights, noise, axes=1)
+        np.clip(self.nominal, self.lower, self.upper, out=self.nominal)
+
+        command = self.nominal[0].copy()
+        # Warm start: shift the plan by one step and repeat its last command
+        self.nominal[:-1] = self.nominal[1:]
+        self._time('update', start)
+        self.cycles += 1
+        return command
+
+    def _cost(self, states: ndarray) -> ndarray:
+        """Tracking cost (K,) of the rolled-out states (K, H, 6)."""
+        shape = self.distance_field.shape
+        cell_x = np.clip(((states[..., 0] - self.origin[0]) / self.resolution + 0.5).astype(np.intp), 0, shape[0] - 1)
+        cell_y = np.clip(((states[..., 1] - self.origin[1]) / self.resolution + 0.5).astype(np.intp), 0, shape[1] - 1)
+        heading_error = 1 - np.cos(states[..., 2] - self.heading_field[cell_x, cell_y])
+        speed_error = np.hypot(states[..., 3], states[..., 4]) - self.target_velocity
+
+        costs = self._costs
+        np.sum(self.distance_field[cell_x, cell_y], axis=1, out=costs)
+        costs *= self.path_weight
+        costs += self.heading_weight * heading_error.sum(axis=1)
+        costs += self.velocity_weight * np.einsum('kh,kh->k', speed_error, speed_error)
+        return costs
+
+    def predicted_trajectory(self, state: ndarray) -> ndarray:
+        """Rollout (H, 6) of the current nominal plan, e.g. for plotting."""
+        return ackermann_rollout(state, self.nominal[:, 0], self.nominal[:, 1], self.dt, self.wheelbase,
+                                 self.degrees, integrator=self.integrator)
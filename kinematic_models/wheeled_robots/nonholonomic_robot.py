@@ -1,13 +1,75 @@
-from matplotlib.axes import Axes
-from numpy import ndarray, zeros, deg2rad, cos, sin, eye
+from typing import NamedTuple, TYPE_CHECKING
+
+import numpy as np
+from numpy import ndarray, zeros, deg2rad, cos, sin
 
 from kinematic_models.wheeled_robots.car_robot import AckermannCar
+from kinematic_models.wheeled_robots.integrators import Integrator
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+
+class ArmKinematics(NamedTuple):
+    matrices: ndarray  # (..., 4, 4) arm kinematic matrices, see NonholonomicRobot.arm_kinematic_matrix
+    arm_bases: ndarray  # (..., 2) global position of the arm joint
+    end_effectors: ndarray  # (..., 2) global position of the arm end
+
+
+def arm_kinematics(states: ndarray, arm_angles: float | ndarray, arm_offset=(0, 0), arm_length: float = 1.0,
+                   degrees: bool = True, out: ndarray = None) -> ArmKinematics:
+    """
+    Vectorized arm kinematic matrices and positions of a NonholonomicRobot over many base states.
+
+    The sines and cosines of the yaw and of the absolute arm angle are evaluated once and shared by the
+    matrices, the rotated offsets and the end-effector positions.
+
+    Args:
+        states (ndarray): Base states (..., 6) or poses (..., 3), with the yaw in radians.
+        arm_angles (float or ndarray): Arm angles relative to the base, broadcastable to states.shape[:-1].
+        arm_offset: Position of the arm joint in the base frame (2,).
+        arm_length (float): Arm length.
+        degrees (bool): Whether the arm angles are given in degrees.
+        out (ndarray): Optional (..., 4, 4) buffer receiving the matrices.
+    """
+    states = np.asarray(states, dtype=float)
+    arm_angles = np.asarray(arm_angles, dtype=float)
+    if degrees:
+        arm_angles = deg2rad(arm_angles)
+    shape = np.broadcast_shapes(states.shape[:-1], arm_angles.shape)
+    if out is None:
+        out = np.zeros(shape + (4, 4))
+    elif out.shape != shape + (4, 4):
+        raise ValueError(f"Output buffer must have shape {shape + (4, 4)}")
+    else:
+        out[...] = 0
+    offset_x, offset_y = np.asarray(arm_offset, dtype=float)
+
+    yaw = states[..., 2]
+    cos_yaw, sin_yaw = cos(yaw), sin(yaw)
+    cos_arm, sin_arm = cos(yaw + arm_angles), sin(yaw + arm_angles)
+
+    out[..., 0, 0] = cos_yaw
+    out[..., 0, 1] = -sin_yaw
+    out[..., 1, 0] = sin_yaw
+    out[..., 1, 1] = cos_yaw
+    out[..., 0, 2] = -arm_length * sin_arm
+    out[..., 1, 2] = arm_length * cos_arm
+    out[..., 0, 3] = cos_yaw * offset_x - sin_yaw * offset_y
+    out[..., 1, 3] = sin_yaw * offset_x + cos_yaw * offset_y
+    out[..., 2, 2] = 1
+    out[..., 3, 3] = 1
+
+    arm_bases = states[..., :2] + out[..., :2, 3]
+    end_effectors = arm_bases + arm_length * np.stack([cos_arm, sin_arm], axis=-1)
+    return ArmKinematics(out, arm_bases, end_effectors)
 
 
 class NonholonomicRobot(AckermannCar):
     def __init__(self, state: ndarray = None, wheelbase=2.5, width=1.5, length=4.5, degrees=True,
-                 arm_offset: ndarray = None, arm_length: float = 1.0, arm_angle: float = 0):
-        super().__init__(state, wheelbase, width, length, degrees)
+                 arm_offset: ndarray = None, arm_length: float = 1.0, arm_angle: float = 0,
+                 integrator: str | Integrator = 'euler'):
+        super().__init__(state, wheelbase, width, length, degrees, integrator)
         if arm_offset is None:
             arm_offset = zeros(2)
         self.arm_offset = arm_offset
@@ -16,37 +78,50 @@ class NonholonomicRobot(AckermannCar):
 
     @property
     def transformed_arm_offset(self):
-        return self.kinematic_matrix()[:2, :2] @ self.arm_offset
+        yaw = self.state[2]
+        offset_x, offset_y = self.arm_offset
+        return np.array([cos(yaw) * offset_x - sin(yaw) * offset_y, sin(yaw) * offset_x + cos(yaw) * offset_y])
 
     def arm_kinematic_matrix(self):
         """Calculates the arm's kinematic matrix relative to the car's base frame."""
         yaw = self.state[2]
-        arm_angle_rad = self.arm_angle
-
-        kinematic_matrix = eye(4)
-
-        kinematic_matrix[:2, :2] = self.kinematic_matrix()[:2, :2]
-
-        kinematic_matrix[0, 2] = -self.arm_length * sin(yaw + arm_angle_rad)
-        kinematic_matrix[1, 2] = self.arm_length * cos(yaw + arm_angle_rad)
-        kinematic_matrix[0:2, 3] = self.transformed_arm_offset
+        cos_yaw, sin_yaw = cos(yaw), sin(yaw)
+        cos_arm, sin_arm = cos(yaw + self.arm_angle), sin(yaw + self.arm_angle)
+        offset_x, offset_y = self.arm_offset
+        return np.array([[cos_yaw, -sin_yaw, -self.arm_length * sin_arm, cos_yaw * offset_x - sin_yaw * offset_y],
+                         [sin_yaw, cos_yaw, self.arm_length * cos_arm, sin_yaw * offset_x + cos_yaw * offset_y],
+                         [0, 0, 1, 0],
+                         [0, 0, 0, 1]])
 
-        return kinematic_matrix
-
-    def draw(self, ax: Axes):
-        super().draw(ax)
+    @property
+    def end_effector_position(self) -> ndarray:
+        return self.arm_kinematics().end_effectors
 
-        # Calculate arm end points
-        arm_angle_rad = self.arm_angle
+    def arm_kinematics(self, states: ndarray = None, arm_angles: float | ndarray = None) -> ArmKinematics:
+        """
+        Arm matrices and positions for many base states (..., 6) and arm angles at once, see arm_kinematics.
 
-        # Calculate the offset point relative to the car's reference frame
-        offset_x, offset_y = self.transformed_arm_offset
+        Both default to the robot's current state and arm angle; arm angles follow the robot's angle units.
+        """
+        if arm_angles is None:
+            arm_angles, degrees = self.arm_angle, False
+        else:
+            degrees = self.degrees
+        return arm_kinematics(self.state if states is None else states, arm_angles, self.arm_offset,
+                              self.arm_length, degrees)
 
-        arm_base_x = self.state[0] + offset_x
-        arm_base_y = self.state[1] + offset_y
+    def rollout_with_arm(self, velocities: ndarray, steering_angles: ndarray, arm_angles: float | ndarray,
+                         dt: float | ndarray) -> tuple[ndarray, ArmKinematics]:
+        """
+        Rolls out base commands (..., T) together with an arm angle per step, without modifying the robot.
 
-        arm_end_x = arm_base_x + self.arm_length * cos(self.state[2] + arm_angle_rad)
-        arm_end_y = arm_base_y + self.arm_length * sin(self.state[2] + arm_angle_rad)
+        Returns:
+            tuple: The base states after every step (..., T, 6) and the arm kinematics along them.
+        """
+        states = self.rollout(velocities, steering_angles, dt)
+        return states, self.arm_kinematics(states, arm_angles)
 
-        # Draw the arm
-        ax.plot([arm_base_x, arm_end_x], [arm_base_y, arm_end_y], color="green", linewidth=2)
+    def draw(self, ax: 'Axes'):
+        from kinematic_models.wheeled_robots import rendering
+        super().draw(ax)
+        rendering.draw_arm(self, ax)
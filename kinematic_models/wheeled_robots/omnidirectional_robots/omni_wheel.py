@@ -1,49 +1,89 @@
+from typing import TYPE_CHECKING
+
 import numpy as np
-import matplotlib.patches as patches
-from numpy import array
-from matplotlib.axes import Axes
+from numpy import array, ndarray, cos, sin, deg2rad
 from common.affine import affine_matrix_from_rotation_and_translation, rotational_affine
+from common.profiling import hot_path
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
 
 class OmniWheel:
     def __init__(self, distance_from_robot_frame=(0, 0), orientation=0, diameter=1, width=0.5, velocity=0):
+        # Incremented whenever the geometry changes so robots know when to rebuild their wheel matrix
+        self.geometry_version = 0
         self.distance_from_robot_frame = distance_from_robot_frame
         self.orientation = orientation
         self.diameter = diameter
         self.width = width
         self.velocity = velocity
 
-    def plot(self, ax: Axes, robot_position=array([0, 0]), robot_orientation=0, color='black'):
-        robot_rotation = rotational_affine('z', robot_orientation)[:2, :2]
-        wheel_position: np.ndarray[float, float] = robot_rotation @ self.distance_from_robot_frame + robot_position
-        wheel_rotation = self.orientation + robot_orientation
+    @property
+    def distance_from_robot_frame(self):
+        return self._distance_from_robot_frame
+
+    @distance_from_robot_frame.setter
+    def distance_from_robot_frame(self, distance):
+        self._distance_from_robot_frame = distance
+        self.geometry_version += 1
+
+    @property
+    def orientation(self):
+        return self._orientation
+
+    @orientation.setter
+    def orientation(self, orientation):
+        self._orientation = orientation
+        self.geometry_version += 1
 
-        wheel_patch = patches.Rectangle(
-            (wheel_position[0] - self.diameter / 2, wheel_position[1] - self.width / 2),
-            self.diameter, self.width, angle=wheel_rotation, color=color, rotation_point="center")
+    @property
+    def diameter(self):
+        return self._diameter
 
-        ax.add_patch(wheel_patch)
+    @diameter.setter
+    def diameter(self, diameter):
+        self._diameter = diameter
+        self.geometry_version += 1
 
+    def plot(self, ax: 'Axes', robot_position=array([0, 0]), robot_orientation=0, color='black'):
+        from kinematic_models.wheeled_robots import rendering
+        ax.add_patch(rendering.wheel_patch(self, robot_position, robot_orientation, color))
+
+    @hot_path
     def get_affine_matrix(self):
         return affine_matrix_from_rotation_and_translation(self.orientation, np.array(self.distance_from_robot_frame))
 
+    @hot_path
     def calculate_velocity(self, robot_angular_velocity):
         wheel_radius = self.diameter / 2
         wheel_velocity = robot_angular_velocity * wheel_radius
         return wheel_velocity
 
-    def plot_velocity(self, ax: Axes, robot_position=array([0, 0]), robot_orientation=0, color='orange'):
-        robot_rotation = rotational_affine('z', robot_orientation)[:2, :2]
-        wheel_position: np.ndarray[float, float] = robot_rotation @ self.distance_from_robot_frame + robot_position
-
-        vx, vy = rotational_affine('z', robot_orientation)[:2, :2] @ self.get_velocity_components(self.velocity)
-
-        ax.quiver(wheel_position[0], wheel_position[1],
-                  vx, vy, scale=1 if vx == vy == 0 else None, color=color)
+    def plot_velocity(self, ax: 'Axes', robot_position=array([0, 0]), robot_orientation=0, color='orange'):
+        from kinematic_models.wheeled_robots import rendering
+        rendering.plot_wheel_velocity(self, ax, robot_position, robot_orientation, color)
 
+    @hot_path
     def get_velocity_components(self, robot_angular_velocity):
         wheel_velocity = self.calculate_velocity(robot_angular_velocity)
         affine_matrix = self.get_affine_matrix()
         wheel_direction = affine_matrix[:2, 0]
         rotational = rotational_affine('z', 90)[:2, :2] @ wheel_direction * wheel_velocity
         return rotational
+
+    @hot_path
+    def body_velocity_row(self) -> ndarray:
+        """
+        Robot body twist (vx, vy, omega) produced by a unit motor velocity of this wheel.
+
+        Closed form of get_velocity_components followed by omega_from_v_r: the wheel pushes perpendicular to its
+        orientation with speed diameter / 2 per unit of motor velocity.
+        """
+        x, y = self.distance_from_robot_frame
+        radius_squared = x ** 2 + y ** 2
+        if radius_squared == 0:
+            raise ValueError("The radius vector cannot be zero")
+        orientation = deg2rad(self.orientation)
+        vx, vy = -sin(orientation) * self.diameter / 2, cos(orientation) * self.diameter / 2
+        return array([vx, vy, (x * vy - y * vx) / radius_squared])
@@ -1,14 +1,26 @@
+from typing import NamedTuple, TYPE_CHECKING
+
 import numpy as np
-from matplotlib import pyplot as plt
-from numpy import array, ndarray, sum as np_sum
-from matplotlib.axes import Axes
+from numpy import array, ndarray
 from common.affine import rotational_affine
-from common.angular_velocity import omega_from_v_r
-from omni_wheel import OmniWheel
+from common.profiling import hot_path
+from kinematic_models.wheeled_robots.integrators import Integrator, get_integrator
+from kinematic_models.wheeled_robots.omnidirectional_robots.omni_wheel import OmniWheel
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+
+class SimulationResult(NamedTuple):
+    positions: ndarray  # (T + 1, 2)
+    orientations: ndarray  # (T + 1,) degrees
+    velocities: ndarray  # (T + 1, 3) global twists
+    motor_velocities: ndarray  # (T, N) commands applied at each step
 
 
 class OmnidirectionalRobot:
-    def __init__(self, num_wheels, velocity_color='orange', wheel_color='black', motor_velocities=None):
+    def __init__(self, num_wheels, velocity_color='orange', wheel_color='black', motor_velocities=None,
+                 integrator: str | Integrator = 'euler'):
         if num_wheels < 3:
             raise ValueError("Omnidirectional robot must have at least 3 wheels")
         self.num_wheels = num_wheels
@@ -17,21 +29,28 @@ class OmnidirectionalRobot:
         self.wheel_color = wheel_color
         self.position = array([0, 0])
         self.orientation = 0
+        self.integrator = get_integrator(integrator)
+
+        self._wheel_matrix = None
+        self._wheel_matrix_pinv = None
+        self._wheel_geometry_key = None
 
         self.motor_velocities = array([0] * num_wheels) if motor_velocities is None else motor_velocities
 
         if len(self.motor_velocities) != num_wheels:
             raise ValueError("Motor velocities must be provided for each wheel")
 
+    @hot_path
     def move(self, delta_T: float, motor_velocities: ndarray = None):
         if motor_velocities is not None:
             self.motor_velocities = motor_velocities
-            # Update position
-        global_vel = self.global_velocity()  # Get global velocities (linear and angular)
-        self.position = self.position + global_vel[:2] * float(delta_T)
+        # Update position with the body twist held during the step (omega is in degrees per time unit)
+        vx, vy, omega = self.body_velocity()
+        dx, dy = self.integrator(np.deg2rad(self.orientation), vx, vy, np.deg2rad(omega), float(delta_T))
+        self.position = self.position + array([dx, dy])
 
         # Update orientation
-        self.orientation += global_vel[2] * delta_T
+        self.orientation += omega * delta_T
         self.orientation %= 2 * 360  # Ensure orientation stays within [0, 2π)
 
     def add_wheel(self, wheel: OmniWheel):
@@ -40,13 +59,13 @@ class OmnidirectionalRobot:
         else:
             raise ValueError("All wheels have been added")
 
-    def plot(self, ax: Axes, wheel_color=None):
+    def plot(self, ax: 'Axes', wheel_color=None):
         ax.set_aspect('equal')
         for wheel in self.wheels:
             wheel.plot(ax, robot_position=self.position, robot_orientation=self.orientation,
                        color=wheel_color or self.wheel_color)
 
-    def plot_velocity(self, ax: Axes, wheel_color=None, velocity_color=None, global_velocity="green"):
+    def plot_velocity(self, ax: 'Axes', wheel_color=None, velocity_color=None, global_velocity="green"):
         ax.set_aspect('equal')
         for wheel, vel in zip(self.wheels, self.motor_velocities):
             wheel.velocity = vel
@@ -57,32 +76,170 @@ class OmnidirectionalRobot:
                                 color=velocity_color or self.velocity_color)
         ax.quiver(self.position[0], self.position[1], *self.global_velocity()[:2], color=global_velocity)
 
+    @hot_path
+    def _refresh_wheel_matrix(self):
+        # Wheels compare by identity, so swapped, reordered or replaced wheels change the key; holding them in the
+        # key also keeps their ids from being reused by new wheels
+        key = tuple((wheel, wheel.geometry_version) for wheel in self.wheels)
+        if key != self._wheel_geometry_key:
+            self._wheel_matrix = array([wheel.body_velocity_row() for wheel in self.wheels]).reshape(-1, 3)
+            self._wheel_matrix_pinv = np.linalg.pinv(self._wheel_matrix)
+            self._wheel_geometry_key = key
+
+    @property
+    def wheel_matrix(self) -> ndarray:
+        """
+        Fixed (N, 3) wheel-to-body matrix: row i is the body twist (vx, vy, omega) produced by a unit motor
+        velocity of wheel i, so the body twist is motor_velocities @ wheel_matrix. It is rebuilt only when a wheel
+        is added or a wheel's geometry changes.
+        """
+        self._refresh_wheel_matrix()
+        return self._wheel_matrix
+
+    @property
+    def wheel_matrix_pinv(self) -> ndarray:
+        """(3, N) pseudo-inverse of the wheel matrix, mapping body twists back to motor velocities."""
+        self._refresh_wheel_matrix()
+        return self._wheel_matrix_pinv
+
+    @hot_path
+    def body_velocity(self, motor_velocities: ndarray = None) -> ndarray:
+        """Body twist (vx, vy, omega) for motor velocities (N,) or a batch of them (T, N)."""
+        if motor_velocities is None:
+            motor_velocities = self.motor_velocities
+        motor_velocities = np.asarray(motor_velocities, dtype=float)[..., :len(self.wheels)]
+        return motor_velocities @ self.wheel_matrix
+
+    @hot_path
+    def motor_velocities_from_twist(self, twists: ndarray, orientations: float | ndarray = None,
+                                    dt: float | ndarray = None, max_wheel_speed: float = None) -> ndarray:
+        """
+        Inverse kinematics: motor velocities producing the desired global twists.
+
+        Args:
+            twists: Global twists (vx, vy, omega) as (3,) or a trajectory (T, 3).
+            orientations: Robot orientation (degrees) at each twist, scalar or (T,). When omitted, the orientation
+                is integrated from the current one with dt as move would, or held constant if dt is also omitted.
+            dt: Time step(s) used to integrate the orientation, scalar or (T,).
+            max_wheel_speed: Optional cap on every motor velocity; rows exceeding it are scaled down uniformly,
+                which keeps the direction of the twist.
+
+        Returns:
+            Motor velocities (N,) or (T, N).
+        """
+        twists = np.asarray(twists, dtype=float)
+        if twists.shape[-1] != 3:
+            raise ValueError("Twists must have 3 components: vx, vy and omega")
+        if max_wheel_speed is not None and not max_wheel_speed > 0:
+            raise ValueError("The maximum wheel speed must be a positive number")
+        if orientations is None:
+            orientations = self.orientation
+            if dt is not None and twists.ndim == 2:
+                increments = twists[:, 2] * dt
+                orientations = (self.orientation + np.concatenate([[0], np.cumsum(increments)[:-1]])) % (2 * 360)
+        angles = np.deg2rad(orientations)
+        cos, sin = np.cos(angles), np.sin(angles)
+
+        # Rotate the global linear velocity into the body frame (transpose of the orientation rotation)
+        body_twists = np.empty(twists.shape)
+        body_twists[..., 0] = cos * twists[..., 0] + sin * twists[..., 1]
+        body_twists[..., 1] = -sin * twists[..., 0] + cos * twists[..., 1]
+        body_twists[..., 2] = twists[..., 2]
+        motor_velocities = body_twists @ self.wheel_matrix_pinv
+
+        if max_wheel_speed is not None:
+            peak = np.max(np.abs(motor_velocities), axis=-1, keepdims=True)
+            motor_velocities *= max_wheel_speed / np.maximum(peak, max_wheel_speed)
+        return motor_velocities
+
     def get_angular_velocity(self):
-        # 1. First calculate each wheel's velocity
-        # 2. Calculate the angular velocity generated by the wheel velocities. You know that each wheel linear velocity
-        # is the cross product of the wheel distance from the robot frame and the angular velocity of the robot.
-        # since we already calculated the wheel velocities, we can use them to calculate the angular velocity.
-        # 3. Calculate the robot angular velocity by summing each wheel's angular velocity.
-        angular_velocities = [omega_from_v_r(wheel.get_velocity_components(motor_velocity),
-                                             wheel.distance_from_robot_frame)
-                              for wheel, motor_velocity
-                              in zip(self.wheels, self.motor_velocities)]
-        return sum(angular_velocities)
+        # Each wheel's velocity is the cross product of the angular velocity and its distance from the robot frame,
+        # so the per-wheel contributions are precomputed in the last column of the wheel matrix.
+        return self.body_velocity()[2]
 
     def get_linear_velocity(self) -> ndarray:
-        linear_velocity = np_sum([wheel.get_velocity_components(motor_velocity) for wheel, motor_velocity in
-                                  zip(self.wheels, self.motor_velocities)], axis=0)
-        return linear_velocity
+        return self.body_velocity()[:2]
 
     def global_state(self) -> ndarray:
         return array([*self.position, self.orientation, *self.global_velocity()])
 
+    @hot_path
     def global_velocity(self) -> ndarray:
+        body_velocity = self.body_velocity()
         affine_matrix = rotational_affine('z', self.orientation)
-        global_velocity = affine_matrix[:2, :2] @ self.get_linear_velocity()
-        return array([*global_velocity, self.get_angular_velocity()])
+        global_velocity = affine_matrix[:2, :2] @ body_velocity[:2]
+        return array([*global_velocity, body_velocity[2]])
+
+    @hot_path
+    def simulate(self, motor_velocities, time_steps) -> SimulationResult:
+        """
+        Headless equivalent of calling move once per step; never touches matplotlib.
+
+        The motor velocities fully determine the body twists, so the orientation is accumulated with a cumulative
+        sum and every position increment is evaluated at once. The robot ends in the final state, as after move.
+
+        Args:
+            motor_velocities: Motor velocities per step (T, N), or a single (N,) array used for every step.
+            time_steps: Time step per step (T,), or a single float used for every step.
+
+        Returns:
+            SimulationResult: Preallocated arrays holding the initial state followed by the state after each step.
+        """
+        motor_velocities = np.asarray(motor_velocities, dtype=float)
+        time_steps = np.asarray(time_steps, dtype=float)
+        if motor_velocities.ndim == 1:
+            motor_velocities = np.tile(motor_velocities, (time_steps.size, 1))
+        num_steps = len(motor_velocities)
+        time_steps = np.broadcast_to(time_steps, (num_steps,))
+
+        positions = np.empty((num_steps + 1, 2))
+        orientations = np.empty(num_steps + 1)
+        velocities = np.empty((num_steps + 1, 3))
+        positions[0], orientations[0], velocities[0] = self.position, self.orientation, self.global_velocity()
+
+        body_velocities = self.body_velocity(motor_velocities)
+        np.cumsum(body_velocities[:, 2] * time_steps, out=orientations[1:])
+        orientations[1:] += self.orientation
+        np.mod(orientations, 2 * 360, out=orientations)
+
+        angles = np.deg2rad(orientations)
+        cos, sin = np.cos(angles), np.sin(angles)
+        velocities[1:, 0] = cos[1:] * body_velocities[:, 0] - sin[1:] * body_velocities[:, 1]
+        velocities[1:, 1] = sin[1:] * body_velocities[:, 0] + cos[1:] * body_velocities[:, 1]
+        velocities[1:, 2] = body_velocities[:, 2]
+
+        # Each step starts from the orientation reached by the previous one
+        steps = np.empty((num_steps, 2))
+        steps[:, 0], steps[:, 1] = self.integrator(angles[:-1], body_velocities[:, 0], body_velocities[:, 1],
+                                                   np.deg2rad(body_velocities[:, 2]), time_steps)
+        np.cumsum(steps, axis=0, out=positions[1:])
+        positions[1:] += positions[0]
+
+        if num_steps:
+            self.position, self.orientation = positions[-1].copy(), orientations[-1]
+            self.motor_velocities = motor_velocities[-1]
+        return SimulationResult(positions, orientations, velocities, motor_velocities)
+
+    def simulation_patches(self, position, orientation) -> list:
+        """Patches drawn for one simulated state by plot_simulation."""
+        from kinematic_models.wheeled_robots import rendering
+        return [rendering.wheel_patch(wheel, position, orientation, self.wheel_color) for wheel in self.wheels]
+
+    def plot_simulation(self, result: SimulationResult, ax: 'Axes' = None, decimation: int = 1,
+                        velocity_color="orange"):
+        """
+        Renders a simulation result: the full trajectory plus a decimated subset of the states, drawn with a
+        single PatchCollection for the robot and a single quiver call for the velocities.
+
+        Args:
+            result: The output of simulate.
+            ax: A matplotlib Axes object (optional). If not provided, a new one is created.
+            decimation: Draw the robot and its velocity every decimation states (the last one is always drawn).
+        """
+        from kinematic_models.wheeled_robots import rendering
+        return rendering.plot_simulation(self, result, ax, decimation, velocity_color)
 
-    def simulate_and_plot(self, motor_velocities, time_steps, ax=None):
+    def simulate_and_plot(self, motor_velocities, time_steps, ax=None, decimation: int = 1):
         """
         Simulates robot movement and plots the trajectory and velocities.
 
@@ -90,6 +247,7 @@ class OmnidirectionalRobot:
             motor_velocities: A list of motor velocity arrays or a single array.
             time_steps: A list of time steps or a float representing the total simulation time.
             ax: A matplotlib Axes object (optional). If not provided, a new one is created.
+            decimation: Draw the robot and its velocity every decimation states.
         """
 
         # Prepare motor velocities and time steps
@@ -100,35 +258,5 @@ class OmnidirectionalRobot:
         if not isinstance(time_steps, list):  # Single float representing total time
             time_steps = np.linspace(0, time_steps, len(motor_velocities))
 
-        if ax is None:
-            fig, ax = plt.subplots(figsize=(10, 8))
-
-        # Simulate and plot
-        positions = [self.position.copy()]
-        global_velocities = [self.global_velocity().copy()]
-        for i, (motor_vels, dt) in enumerate(zip(motor_velocities, time_steps)):
-            self.motor_velocities = motor_vels  # Set motor velocities
-            self.move(dt)  # Update robot state
-            positions.append(self.position.copy())
-            global_velocities.append(self.global_velocity().copy())
-            self.plot_velocity(ax, velocity_color="none")  # Plot wheels and velocities at this time step
-        positions = np.array(positions)
-        global_velocities = np.array(global_velocities)
-
-        # Plot trajectory, robot body and initial and final state
-        ax.plot(positions[:, 0], positions[:, 1], 'b-', label='Robot Trajectory')
-        self.plot(ax)
-
-        # Plot velocities
-        for i in range(len(global_velocities)):
-            vel = global_velocities[i]
-            ax.quiver(positions[i, 0], positions[i, 1], vel[0], vel[1], scale=1 if vel[0] == vel[1] == 0 else None,
-                      color="orange")
-
-        ax.set_xlabel('X (meters)')
-        ax.set_ylabel('Y (meters)')
-        ax.set_title('Robot Trajectory and Velocities')
-        ax.legend()
-        ax.grid(True)
-
-        return ax
+        result = self.simulate(motor_velocities, time_steps)
+        return self.plot_simulation(result, ax, decimation)
@@ -1,15 +1,19 @@
-from matplotlib import patches
-from matplotlib.axes import Axes
+from typing import TYPE_CHECKING
+
 from numpy import radians, cos, sin, ndarray
 
-from omnidirectional_robot import OmnidirectionalRobot
-from omni_wheel import OmniWheel
+from kinematic_models.wheeled_robots.omnidirectional_robots.omnidirectional_robot import OmnidirectionalRobot
+from kinematic_models.wheeled_robots.omnidirectional_robots.omni_wheel import OmniWheel
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
 
 class RadialOmnidirectionalRobot(OmnidirectionalRobot):
     def __init__(self, num_wheels, radius, wheel_width=None, wheel_diameter=0.5, axis_rotation=0,
-                 velocity_color='orange', wheel_color='black', motor_velocities: ndarray | list = None):
-        super().__init__(num_wheels, velocity_color, wheel_color, motor_velocities)
+                 velocity_color='orange', wheel_color='black', motor_velocities: ndarray | list = None,
+                 integrator='euler'):
+        super().__init__(num_wheels, velocity_color, wheel_color, motor_velocities, integrator)
         self.radius = radius
         self.axis_rotation = axis_rotation
         self.wheel_width = wheel_width or radius / 2
@@ -26,12 +30,16 @@ class RadialOmnidirectionalRobot(OmnidirectionalRobot):
                               width=self.wheel_width)
             self.add_wheel(wheel)
 
-    def plot(self, ax: Axes, wheel_color=None, edge_color='black'):
-        circle = patches.Circle(self.position, self.radius, edgecolor=edge_color, facecolor='none')
-        ax.add_patch(circle)
+    def plot(self, ax: 'Axes', wheel_color=None, edge_color='black'):
+        from kinematic_models.wheeled_robots import rendering
+        ax.add_patch(rendering.body_circle(self.position, self.radius, edge_color))
         super().plot(ax, wheel_color)
 
-    def plot_velocity(self, ax: Axes, wheel_color=None, velocity_color=None, global_velocity="green"):
-        circle = patches.Circle(self.position, self.radius, edgecolor='black', facecolor='none')
-        ax.add_patch(circle)
+    def plot_velocity(self, ax: 'Axes', wheel_color=None, velocity_color=None, global_velocity="green"):
+        from kinematic_models.wheeled_robots import rendering
+        ax.add_patch(rendering.body_circle(self.position, self.radius))
         super().plot_velocity(ax, wheel_color, velocity_color, global_velocity)
+
+    def simulation_patches(self, position, orientation) -> list:
+        from kinematic_models.wheeled_robots import rendering
+        return [rendering.body_circle(position, self.radius)] + super().simulation_patches(position, orientation)
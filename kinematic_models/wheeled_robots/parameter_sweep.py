@@ -0,0 +1,192 @@
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterator, NamedTuple
+
+import numpy as np
+from numpy import ndarray
+
+# An evaluation maps one configuration and its generator to a dict of scalar metrics; it must be a module-level
+# function so worker processes can unpickle it.
+Evaluation = Callable[[dict, np.random.Generator], dict]
+
+
+class SweepRecord(NamedTuple):
+    index: int
+    parameters: dict
+    metrics: dict
+    worker: int  # pid of the process that evaluated the configuration
+    elapsed: float
+
+
+class SweepResult(NamedTuple):
+    table: ndarray  # structured array: one row per configuration, parameter fields then metric fields
+    worker_throughput: dict  # pid -> configurations per second of busy time
+    wall_time: float
+
+
+def parameter_grid(**axes) -> ndarray:
+    """Structured array holding every combination of the given parameter values, in row-major order."""
+    if not axes:
+        raise ValueError("At least one parameter axis is required")
+    values = [np.asarray(axis) for axis in axes.values()]
+    dtype = [(name, value.dtype) for name, value in zip(axes, values)]
+    return np.array(list(itertools.product(*(value.tolist() for value in values))), dtype=dtype)
+
+
+def configuration_rng(seed: int, index: int) -> np.random.Generator:
+    """Generator of one configuration, independent of the worker and of the evaluation order."""
+    return np.random.default_rng(np.random.SeedSequence([seed, index]))
+
+
+def _evaluate(evaluate: Evaluation, index: int, parameters: dict, seed: int) -> SweepRecord:
+    start = time.perf_counter()
+    metrics = evaluate(parameters, configuration_rng(seed, index))
+    return SweepRecord(index, parameters, metrics, os.getpid(), time.perf_counter() - start)
+
+
+def radial_omnidirectional_metrics(parameters: dict, rng: np.random.Generator, directions: int = 256) -> dict:
+    """
+    Maneuverability of a RadialOmnidirectionalRobot(num_wheels, radius, wheel_diameter, axis_rotation).
+
+    The top speed in random directions is the speed reached when the fastest wheel runs at unit motor velocity.
+    """
+    from kinematic_models.wheeled_robots.omnidirectional_robots.radial_omnidirectional_robot import \
+        RadialOmnidirectionalRobot
+    robot = RadialOmnidirectionalRobot(int(parameters['num_wheels']), parameters['radius'],
+                                       wheel_diameter=parameters.get('wheel_diameter', 0.5),
+                                       axis_rotation=parameters.get('axis_rotation', 0))
+    singular_values = np.linalg.svd(robot.wheel_matrix, compute_uv=False)
+    angles = rng.uniform(0, 2 * np.pi, directions)
+    twists = np.column_stack([np.cos(angles), np.sin(angles), np.zeros(directions)])
+    peak_motor = np.abs(robot.motor_velocities_from_twist(twists, 0)).max(axis=1)
+    speeds = 1 / peak_motor
+    return {'min_singular_value': singular_values[-1], 'condition_number': singular_values[0] / singular_values[-1],
+            'mean_top_speed': speeds.mean(), 'min_top_speed': speeds.min(),
+            'top_rotation_rate': 1 / np.abs(robot.wheel_matrix_pinv[2]).max()}
+
+
+def ackermann_metrics(parameters: dict, rng: np.random.Generator, particles: int = 2000, steps: int = 50) -> dict:
+    """
+    Maneuverability of an AckermannCar(wheelbase, ...): turning radius at the maximum steering angle and the spread
+    of the final position of a noisy full-lock turn.
+    """
+    from kinematic_models.wheeled_robots.monte_carlo import AckermannParticles
+    wheelbase, max_steering = parameters['wheelbase'], parameters.get('max_steering', 30.0)
+    velocity = parameters.get('velocity', 2.0)
+    propagator = AckermannParticles(particles, wheelbase, velocity_noise_std=parameters.get('velocity_noise', 0.1),
+                                    steering_noise_std=parameters.get('steering_noise', 1.0),
+                                    seed=int(rng.integers(2 ** 63)), integrator='exact')
+    means, covariances = propagator.run(np.tile([velocity, max_steering], (steps, 1)), 0.1)
+    return {'turning_radius': wheelbase / np.tan(np.deg2rad(max_steering)),
+            'final_heading': means[-1, 2],
+            'position_spread': np.sqrt(np.trace(covariances[-1, :2, :2]))}
+
+
+class ParameterSweep:
+    def __init__(self, evaluate: Evaluation, grid: ndarray, seed: int = 0, max_workers: int | None = None,
+                 checkpoint: str | None = None):
+        """
+        Evaluates a parameter grid across a process pool.
+
+        Args:
+            evaluate: Module-level function mapping (parameters, generator) to a dict of scalar metrics.
+            grid: Structured array of configurations, see parameter_grid.
+            seed: Base seed; configuration i always receives configuration_rng(seed, i).
+            max_workers: Worker processes, 0 to evaluate in the calling process.
+            checkpoint: Optional JSON lines file; every finished configuration is appended to it and configurations
+                already present are skipped, so an interrupted sweep resumes where it stopped.
+        """
+        self.evaluate = evaluate
+        self.grid = grid
+        self.seed = seed
+        self.max_workers = os.cpu_count() if max_workers is None else max_workers
+        self.checkpoint = checkpoint
+
+    def _parameters(self, index: int) -> dict:
+        return {name: self.grid[name][index].item() for name in self.grid.dtype.names}
+
+    def _load_checkpoint(self) -> dict[int, SweepRecord]:
+        records = {}
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return records
+        with open(self.checkpoint, 'rb') as file:
+            lines = file.read().split(b'\n')
+        # A sweep killed while saving leaves a last line without its newline: it is dropped and truncated away, so
+        # the configuration is evaluated again and the next record starts on a line of its own
+        if lines[-1]:
+            with open(self.checkpoint, 'r+b') as file:
+                file.truncate(sum(len(line) + 1 for line in lines[:-1]))
+        for line in lines[:-1]:
+            if not line.strip():
+                continue
+            record = SweepRecord(**json.loads(line))
+            if not 0 <= record.index < len(self.grid) or record.parameters != self._parameters(record.index):
+                raise ValueError(f"Checkpoint {self.checkpoint} does not match the parameter grid")
+            records[record.index] = record
+        return records
+
+    def _save(self, record: SweepRecord):
+        if self.checkpoint is not None:
+            metrics = {name: float(value) for name, value in record.metrics.items()}
+            with open(self.checkpoint, 'a') as file:
+                file.write(json.dumps(record._replace(metrics=metrics)._asdict()) + '\n')
+
+    def iter_results(self, completed: dict[int, SweepRecord] = None) -> Iterator[SweepRecord]:
+        """Yields records as configurations finish, in completion order, skipping checkpointed ones."""
+        completed = self._load_checkpoint() if completed is None else completed
+        pending = (index for index in range(len(self.grid)) if index not in completed)
+        if self.max_workers == 0:
+            for index in pending:
+                record = _evaluate(self.evaluate, index, self._parameters(index), self.seed)
+                self._save(record)
+                yield record
+            return
+
+        with ProcessPoolExecutor(self.max_workers) as executor:
+            # Keep a bounded number of tasks in flight so huge grids are never submitted at once
+            limit, in_flight = 4 * self.max_workers, set()
+            for index in pending:
+                if len(in_flight) >= limit:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    yield from self._collect(done)
+                in_flight.add(executor.submit(_evaluate, self.evaluate, index, self._parameters(index), self.seed))
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from self._collect(done)
+
+    def _collect(self, futures) -> Iterator[SweepRecord]:
+        for future in futures:
+            record = future.result()
+            self._save(record)
+            yield record
+
+    def run(self) -> SweepResult:
+        """Runs the whole sweep (resuming from the checkpoint) and aggregates it into a structured table."""
+        start = time.perf_counter()
+        records = self._load_checkpoint()
+        evaluated = []  # records of this run, the checkpointed ones may come from other processes
+        for record in self.iter_results(records.copy()):
+            records[record.index] = record
+            evaluated.append(record)
+        wall_time = time.perf_counter() - start
+        if not records:
+            raise ValueError("The parameter grid is empty")
+
+        metric_names = list(next(iter(records.values())).metrics)
+        dtype = self.grid.dtype.descr + [(name, np.float64) for name in metric_names]
+        table = np.empty(len(self.grid), dtype=dtype)
+        for name in self.grid.dtype.names:
+            table[name] = self.grid[name]
+        for name in metric_names:
+            table[name] = [records[index].metrics[name] for index in range(len(self.grid))]
+
+        busy = {}
+        for record in evaluated:
+            count, elapsed = busy.get(record.worker, (0, 0.0))
+            busy[record.worker] = (count + 1, elapsed + record.elapsed)
+        throughput = {worker: count / elapsed if elapsed > 0 else float('inf')
+                      for worker, (count, elapsed) in busy.items()}
+        return SweepResult(table, throughput, wall_time)
@@ -0,0 +1,103 @@
+"""
+Matplotlib drawing of the wheeled robots.
+
+The kinematic modules never import matplotlib at module level: their draw and plot methods import this module on
+first use, so the models themselves only need NumPy.
+"""
+import numpy as np
+from matplotlib import patches
+from matplotlib.axes import Axes
+from matplotlib.collections import PatchCollection
+
+from common.affine import rotational_affine
+
+
+def draw_car(car, ax: Axes):
+    """Body, axle and steering direction of an AckermannCar."""
+    state = car.state
+    # Car body
+    body_x = float(state[0]) - car.length / 2
+    body_y = float(state[1]) - car.width / 2
+    body_rect = patches.Rectangle((body_x, body_y), car.length, car.width, angle=np.rad2deg(state[2]),
+                                  rotation_point="center",
+                                  color="lightblue")
+    ax.add_patch(body_rect)
+
+    # Front and rear axle lines
+    ax.plot([state[0], state[0] + car.wheelbase * np.cos(state[2])],
+            [state[1], state[1] + car.wheelbase * np.sin(state[2])],
+            color="black")
+
+    # Steering angle visualization (optional)
+    steering_line_x = state[0] + car.wheelbase * np.cos(state[2])
+    steering_line_y = state[1] + car.wheelbase * np.sin(state[2])
+    ax.plot([steering_line_x, steering_line_x + 0.5 * np.cos(state[2] + car.steering_angle)],
+            [steering_line_y, steering_line_y + 0.5 * np.sin(state[2] + car.steering_angle)],
+            color="red", linestyle="dashed")
+
+
+def draw_arm(robot, ax: Axes):
+    """Arm of a NonholonomicRobot, from its offset on the car to its end."""
+    # Calculate the offset point relative to the car's reference frame
+    offset_x, offset_y = robot.transformed_arm_offset
+
+    arm_base_x = robot.state[0] + offset_x
+    arm_base_y = robot.state[1] + offset_y
+
+    arm_end_x = arm_base_x + robot.arm_length * np.cos(robot.state[2] + robot.arm_angle)
+    arm_end_y = arm_base_y + robot.arm_length * np.sin(robot.state[2] + robot.arm_angle)
+
+    ax.plot([arm_base_x, arm_end_x], [arm_base_y, arm_end_y], color="green", linewidth=2)
+
+
+def _wheel_position(wheel, robot_position, robot_orientation) -> np.ndarray:
+    robot_rotation = rotational_affine('z', robot_orientation)[:2, :2]
+    return robot_rotation @ wheel.distance_from_robot_frame + robot_position
+
+
+def wheel_patch(wheel, robot_position, robot_orientation, color='black') -> patches.Rectangle:
+    """Rectangle of an OmniWheel on a robot at the given position and orientation (degrees)."""
+    wheel_position = _wheel_position(wheel, robot_position, robot_orientation)
+    return patches.Rectangle((wheel_position[0] - wheel.diameter / 2, wheel_position[1] - wheel.width / 2),
+                             wheel.diameter, wheel.width, angle=wheel.orientation + robot_orientation,
+                             color=color, rotation_point="center")
+
+
+def plot_wheel_velocity(wheel, ax: Axes, robot_position, robot_orientation, color='orange'):
+    """Arrow of the velocity an OmniWheel's motor imposes on the robot."""
+    wheel_position = _wheel_position(wheel, robot_position, robot_orientation)
+    vx, vy = rotational_affine('z', robot_orientation)[:2, :2] @ wheel.get_velocity_components(wheel.velocity)
+    ax.quiver(wheel_position[0], wheel_position[1],
+              vx, vy, scale=1 if vx == vy == 0 else None, color=color)
+
+
+def body_circle(position, radius, edge_color='black') -> patches.Circle:
+    """Outline of a round robot body."""
+    return patches.Circle(position, radius, edgecolor=edge_color, facecolor='none')
+
+
+def plot_simulation(robot, result, ax: Axes = None, decimation: int = 1, velocity_color="orange") -> Axes:
+    """Implementation of OmnidirectionalRobot.plot_simulation."""
+    if ax is None:
+        from matplotlib import pyplot as plt
+        fig, ax = plt.subplots(figsize=(10, 8))
+    ax.set_aspect('equal')
+
+    indices = np.arange(0, len(result.positions), max(1, decimation))
+    if indices[-1] != len(result.positions) - 1:
+        indices = np.append(indices, len(result.positions) - 1)
+    collection = [patch for i in indices
+                  for patch in robot.simulation_patches(result.positions[i], result.orientations[i])]
+    ax.add_collection(PatchCollection(collection, match_original=True))
+
+    positions, velocities = result.positions[indices], result.velocities[indices]
+    ax.quiver(positions[:, 0], positions[:, 1], velocities[:, 0], velocities[:, 1], color=velocity_color)
+    ax.plot(result.positions[:, 0], result.positions[:, 1], 'b-', label='Robot Trajectory')
+    robot.plot(ax)
+
+    ax.set_xlabel('X (meters)')
+    ax.set_ylabel('Y (meters)')
+    ax.set_title('Robot Trajectory and Velocities')
+    ax.legend()
+    ax.grid(True)
+    return ax
@@ -0,0 +1,259 @@
+"""
+Uniform-grid spatial index over the footprints of many wheeled robots.
+
+Footprints are circles (RadialOmnidirectionalRobot discs) or oriented rectangles (AckermannCar bodies), stored as
+struct-of-arrays. Each footprint is binned by its centre into square cells at least as wide as the largest
+bounding-circle diameter, so two footprints can only overlap when their cells are the same or adjacent. Agents
+are kept sorted by cell key, which turns every cell lookup into a searchsorted call and lets the candidate pairs of
+all agents be generated at once from half of the 3x3 neighbourhood. Moving agents only re-bins those that changed
+cell, and the sort order is repaired with a stable sort over the previous, nearly sorted, order.
+"""
+import numpy as np
+from numpy import ndarray
+
+CIRCLE, RECTANGLE = 0, 1
+
+# The key of cell (cx, cy) is cx * _STRIDE + cy, so cells of one column are contiguous in key order
+_STRIDE = 1 << 32
+# Own cell plus the 4 neighbours that follow it, so every adjacent pair of cells is visited once
+_HALF_NEIGHBOURHOOD = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def circles_overlap(centers_a: ndarray, radii_a: ndarray, centers_b: ndarray, radii_b: ndarray) -> ndarray:
+    """Whether circles a and b overlap, pairwise over broadcastable (..., 2) centres and (...,) radii."""
+    distance = np.asarray(centers_b) - np.asarray(centers_a)
+    return np.einsum('...i,...i->...', distance, distance) <= (np.asarray(radii_a) + radii_b) ** 2
+
+
+def _axes(yaws: ndarray) -> tuple[ndarray, ndarray]:
+    cos, sin = np.cos(yaws), np.sin(yaws)
+    return np.stack([cos, sin], axis=-1), np.stack([-sin, cos], axis=-1)
+
+
+def rectangles_overlap(centers_a: ndarray, half_extents_a: ndarray, yaws_a: ndarray,
+                       centers_b: ndarray, half_extents_b: ndarray, yaws_b: ndarray) -> ndarray:
+    """
+    Whether oriented rectangles a and b overlap, by the separating axis theorem.
+
+    Half extents (..., 2) are measured along the rectangle's own x (length) and y (width) axes; yaws are in radians.
+    """
+    half_extents_a, half_extents_b = np.asarray(half_extents_a), np.asarray(half_extents_b)
+    distance = np.asarray(centers_b) - np.asarray(centers_a)
+    u_a, v_a = _axes(yaws_a)
+    u_b, v_b = _axes(yaws_b)
+    separated = np.zeros(np.broadcast_shapes(distance.shape[:-1], u_a.shape[:-1], u_b.shape[:-1]), dtype=bool)
+    for axis in (u_a, v_a, u_b, v_b):
+        projection_a = (half_extents_a[..., 0] * np.abs(np.einsum('...i,...i->...', u_a, axis)) +
+                        half_extents_a[..., 1] * np.abs(np.einsum('...i,...i->...', v_a, axis)))
+        projection_b = (half_extents_b[..., 0] * np.abs(np.einsum('...i,...i->...', u_b, axis)) +
+                        half_extents_b[..., 1] * np.abs(np.einsum('...i,...i->...', v_b, axis)))
+        separated |= np.abs(np.einsum('...i,...i->...', distance, axis)) > projection_a + projection_b
+    return ~separated
+
+
+def circle_rectangle_overlap(centers: ndarray, radii: ndarray, rectangle_centers: ndarray,
+                             half_extents: ndarray, yaws: ndarray) -> ndarray:
+    """Whether circles overlap oriented rectangles, through the closest rectangle point to each circle."""
+    distance = np.asarray(centers) - np.asarray(rectangle_centers)
+    u, v = _axes(yaws)
+    local = np.stack([np.einsum('...i,...i->...', distance, u), np.einsum('...i,...i->...', distance, v)], axis=-1)
+    outside = local - np.clip(local, -np.asarray(half_extents), half_extents)
+    return np.einsum('...i,...i->...', outside, outside) <= np.asarray(radii) ** 2
+
+
+class SpatialIndex:
+    def __init__(self, cell_size: float = None):
+        """
+        Broad- and narrow-phase collision and neighbour queries over circle and rectangle footprints.
+
+        Args:
+            cell_size (float): Minimum grid cell width, e.g. the largest distance given to pairs_within. Cells are
+                always at least as wide as the largest bounding-circle diameter, which keeps overlap queries
+                exact.
+        """
+        if cell_size is not None and cell_size <= 0:
+            raise ValueError("Cell size must be a positive number")
+        self._requested_cell_size = cell_size
+        self.cell_size = cell_size
+        self.centers = np.empty((0, 2))
+        self.yaws = np.empty(0)
+        self.half_extents = np.empty((0, 2))  # rectangles: half length and half width; circles: radius twice
+        self.kinds = np.empty(0, dtype=np.int8)
+        self.bounding_radii = np.empty(0)
+        self.keys = np.empty(0, dtype=np.int64)
+        self._order = np.empty(0, dtype=np.intp)
+        self._sorted_keys = np.empty(0, dtype=np.int64)
+        self._dirty = False
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.rebinned = 0  # agents whose cell changed during updates
+        self.resorts = 0  # repairs of the sort order
+
+    def __len__(self):
+        return len(self.centers)
+
+    @classmethod
+    def from_models(cls, models, cell_size: float = None):
+        """Index holding the footprint of each AckermannCar and RadialOmnidirectionalRobot, in order."""
+        index = cls(cell_size)
+        for model in models:
+            center, yaw = _model_pose(model)
+            if hasattr(model, 'radius'):
+                index.add_circles([center], [model.radius])
+            else:
+                index.add_rectangles([center], [model.length], [model.width], [yaw])
+        return index
+
+    def _add(self, centers, half_extents, yaws, kind: int, bounding_radii) -> ndarray:
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        count = len(centers)
+        ids = np.arange(len(self), len(self) + count)
+        self.centers = np.concatenate([self.centers, centers])
+        self.half_extents = np.concatenate([self.half_extents, np.broadcast_to(half_extents, (count, 2))])
+        self.yaws = np.concatenate([self.yaws, np.broadcast_to(np.asarray(yaws, dtype=float), (count,))])
+        self.kinds = np.concatenate([self.kinds, np.full(count, kind, dtype=np.int8)])
+        self.bounding_radii = np.concatenate([self.bounding_radii, np.broadcast_to(bounding_radii, (count,))])
+
+        cell_size = max(self._requested_cell_size or 0, 2 * self.bounding_radii.max(initial=0)) or 1.0
+        if cell_size != self.cell_size:
+            # Larger footprints need larger cells for overlap queries to stay exact, which re-bins everyone
+            self.cell_size = cell_size
+            self.keys = self._cell_keys(self.centers)
+        else:
+            self.keys = np.concatenate([self.keys, self._cell_keys(centers)])
+        self._order = np.arange(len(self))
+        self._dirty = True
+        return ids
+
+    def add_circles(self, centers, radii) -> ndarray:
+        """Adds discs (n, 2) with radii (n,) and returns their ids."""
+        radii = np.asarray(radii, dtype=float).reshape(-1)
+        if np.any(radii < 0):
+            raise ValueError("Radii must not be negative")
+        return self._add(centers, np.column_stack([radii, radii]), 0.0, CIRCLE, radii)
+
+    def add_rectangles(self, centers, lengths, widths, yaws) -> ndarray:
+        """Adds rectangles centred at (n, 2), with their lengths along the heading yaws (radians), and returns ids."""
+        half_extents = np.column_stack(np.broadcast_arrays(np.asarray(lengths, dtype=float).reshape(-1) / 2,
+                                                           np.asarray(widths, dtype=float).reshape(-1) / 2))
+        if np.any(half_extents < 0):
+            raise ValueError("Lengths and widths must not be negative")
+        return self._add(centers, half_extents, yaws, RECTANGLE, np.hypot(half_extents[:, 0], half_extents[:, 1]))
+
+    def _cell_keys(self, centers: ndarray) -> ndarray:
+        cells = np.floor(centers / self.cell_size).astype(np.int64)
+        return cells[:, 0] * _STRIDE + cells[:, 1]
+
+    def update(self, centers: ndarray, yaws: ndarray = None, ids: ndarray = None):
+        """
+        Moves agents (all of them, or the given ids) to new centres and headings.
+
+        Only agents that changed cell are re-binned; the sort order is repaired lazily by the next query.
+        """
+        ids = slice(None) if ids is None else np.asarray(ids)
+        self.centers[ids] = centers
+        if yaws is not None:
+            self.yaws[ids] = yaws
+        keys = self._cell_keys(self.centers[ids])
+        moved = keys != self.keys[ids]
+        if moved.any():
+            self.keys[ids] = keys
+            self.rebinned += int(moved.sum())
+            self._dirty = True
+
+    def update_models(self, models):
+        """Moves every agent to the pose of the model it was built from, see from_models."""
+        poses = [_model_pose(model) for model in models]
+        self.update(np.array([center for center, _ in poses], dtype=float), np.array([yaw for _, yaw in poses]))
+
+    def _sorted(self) -> tuple[ndarray, ndarray]:
+        if self._dirty:
+            # The previous order is nearly sorted after small moves, which the stable sort (timsort) exploits
+            self._order = self._order[np.argsort(self.keys[self._order], kind='stable')]
+            self._sorted_keys = self.keys[self._order]
+            self._dirty = False
+            self.resorts += 1
+        return self._order, self._sorted_keys
+
+    def pairs_within(self, distance: float) -> ndarray:
+        """Pairs (P, 2) of ids, i < j, whose centres are at most distance apart, sorted lexicographically."""
+        if distance > self.cell_size:
+            raise ValueError(f"Distance must not exceed the cell size ({self.cell_size})")
+        return self._candidate_pairs(lambda first, second: distance ** 2)
+
+    def _candidate_pairs(self, max_squared_distance) -> ndarray:
+        order, sorted_keys = self._sorted()
+        count = len(order)
+        positions = np.arange(count)
+        firsts, seconds = [], []
+        for dx, dy in _HALF_NEIGHBOURHOOD:
+            if (dx, dy) == (0, 0):
+                low = positions + 1  # later agents of the same cell only
+                high = np.searchsorted(sorted_keys, sorted_keys, 'right')
+            else:
+                targets = sorted_keys + (dx * _STRIDE + dy)
+                low = np.searchsorted(sorted_keys, targets, 'left')
+                high = np.searchsorted(sorted_keys, targets, 'right')
+            counts = np.maximum(high - low, 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            first = np.repeat(positions, counts)
+            starts = np.cumsum(counts) - counts
+            second = np.repeat(low - starts, counts) + np.arange(total)
+            first, second = order[first], order[second]
+            distance = self.centers[second] - self.centers[first]
+            close = np.einsum('ij,ij->i', distance, distance) <= max_squared_distance(first, second)
+            firsts.append(first[close])
+            seconds.append(second[close])
+        if not firsts:
+            return np.empty((0, 2), dtype=np.intp)
+        first, second = np.concatenate(firsts), np.concatenate(seconds)
+        pairs = np.column_stack([np.minimum(first, second), np.maximum(first, second)])
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def overlapping_pairs(self) -> ndarray:
+        """Pairs (P, 2) of ids, i < j, whose footprints overlap (touching counts), sorted lexicographically."""
+        radii = self.bounding_radii
+        pairs = self._candidate_pairs(lambda first, second: (radii[first] + radii[second]) ** 2)
+        first, second = pairs[:, 0], pairs[:, 1]
+        kinds_first, kinds_second = self.kinds[first], self.kinds[second]
+        # Bounding circles are exact for circles; rectangles need a narrow-phase test
+        overlap = np.ones(len(pairs), dtype=bool)
+
+        boxes = (kinds_first == RECTANGLE) & (kinds_second == RECTANGLE)
+        a, b = first[boxes], second[boxes]
+        overlap[boxes] = rectangles_overlap(self.centers[a], self.half_extents[a], self.yaws[a],
+                                            self.centers[b], self.half_extents[b], self.yaws[b])
+
+        mixed = kinds_first != kinds_second
+        circles = np.where(kinds_first[mixed] == CIRCLE, first[mixed], second[mixed])
+        rectangles = np.where(kinds_first[mixed] == CIRCLE, second[mixed], first[mixed])
+        overlap[mixed] = circle_rectangle_overlap(self.centers[circles], self.half_extents[circles, 0],
+                                                  self.centers[rectangles], self.half_extents[rectangles],
+                                                  self.yaws[rectangles])
+        return pairs[overlap]
+
+    def neighbors(self, point, radius: float) -> ndarray:
+        """Sorted ids of the agents whose centres lie within radius of a point; radius may span many cells."""
+        order, sorted_keys = self._sorted()
+        point = np.asarray(point, dtype=float)
+        low_cell = np.floor((point - radius) / self.cell_size).astype(np.int64)
+        high_cell = np.floor((point + radius) / self.cell_size).astype(np.int64)
+        columns = np.arange(low_cell[0], high_cell[0] + 1) * _STRIDE
+        # Cells of one column are contiguous in key order, so every column is a single range
+        starts = np.searchsorted(sorted_keys, columns + low_cell[1], 'left')
+        stops = np.searchsorted(sorted_keys, columns + high_cell[1], 'right')
+        candidates = order[np.concatenate([np.arange(start, stop) for start, stop in zip(starts, stops)])]
+        distance = self.centers[candidates] - point
+        return np.sort(candidates[np.einsum('ij,ij->i', distance, distance) <= radius ** 2])
+
+
+def _model_pose(model) -> tuple[ndarray, float]:
+    """Footprint centre and heading (radians) of an AckermannCar or an OmnidirectionalRobot."""
+    if hasattr(model, 'state') and np.shape(model.state) == (6,):  # AckermannCar
+        return model.state[:2], model.state[2]
+    if hasattr(model, 'position'):  # OmnidirectionalRobot
+        return model.position, np.deg2rad(model.orientation)
+    raise ValueError(f"Unsupported model: {type(model).__name__}")
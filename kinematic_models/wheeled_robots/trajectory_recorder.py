@@ -0,0 +1,206 @@
+import glob
+import json
+import os
+from typing import Callable, Iterator
+
+import numpy as np
+from numpy import ndarray
+from numpy.lib.format import open_memmap
+
+ACKERMANN_FIELDS = ('x', 'y', 'yaw', 'vx', 'vy', 'yaw_rate')
+OMNIDIRECTIONAL_FIELDS = ('x', 'y', 'orientation', 'vx', 'vy', 'omega')
+UNICYCLE_FIELDS = ('x', 'y', 'theta')
+
+MANIFEST = 'manifest.json'
+
+
+def model_layout(model) -> tuple[tuple[str, ...], Callable]:
+    """Fields recorded for a model and the function reading them, based on the state the model exposes."""
+    if hasattr(model, 'global_state'):  # OmnidirectionalRobot
+        return OMNIDIRECTIONAL_FIELDS, lambda robot: robot.global_state()
+    if hasattr(model, 'state') and np.shape(model.state) == (6,):  # AckermannCar
+        return ACKERMANN_FIELDS, lambda car: car.state
+    if hasattr(model, 'theta'):  # UnicycleRobot
+        return UNICYCLE_FIELDS, lambda robot: (robot.x, robot.y, robot.theta)
+    raise ValueError(f"Unsupported model: {type(model).__name__}")
+
+
+def _chunk_name(index: int) -> str:
+    return f'chunk_{index:06d}.npy'
+
+
+class TrajectoryRecorder:
+    def __init__(self, directory: str, fields: tuple[str, ...], chunk_size: int = 1 << 20, dtype=np.float64):
+        """
+        Streams fixed-dtype records into chunked, memory-mapped .npy files.
+
+        Only the chunk being written is mapped, and full chunks are flushed and unmapped, so memory stays flat
+        however long the run is. Every chunk is a regular .npy file of a structured dtype (one named field per
+        recorded value) that TrajectoryReader reopens zero-copy.
+
+        Args:
+            directory (str): Directory receiving the chunks and a manifest; created if missing, and any recording
+                already in it is replaced.
+            fields (tuple): Names of the recorded values.
+            chunk_size (int): Records per chunk file.
+            dtype: Type shared by every field.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be a positive number")
+        os.makedirs(directory, exist_ok=True)
+        # Chunks of a previous recording would otherwise linger next to a manifest that does not list them
+        for path in glob.glob(os.path.join(glob.escape(directory), 'chunk_*.npy')):
+            os.remove(path)
+        self.directory = directory
+        self.fields = tuple(fields)
+        self.dtype = np.dtype([(field, dtype) for field in self.fields])
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.chunks: list[str] = []
+        self._chunk = None
+        self._rows = None  # plain (chunk_size, n_fields) view of the current chunk
+        self._extract = None
+        self.closed = False
+        self._write_manifest()
+
+    @classmethod
+    def for_model(cls, directory: str, model, chunk_size: int = 1 << 20):
+        """Recorder laid out for AckermannCar.state, OmnidirectionalRobot.global_state() or a UnicycleRobot pose."""
+        fields, extract = model_layout(model)
+        recorder = cls(directory, fields, chunk_size)
+        recorder._extract = extract
+        return recorder
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _open_chunk(self):
+        path = os.path.join(self.directory, _chunk_name(len(self.chunks)))
+        self._chunk = open_memmap(path, mode='w+', dtype=self.dtype, shape=(self.chunk_size,))
+        self._rows = self._chunk.view(self.dtype[0]).reshape(self.chunk_size, len(self.fields))
+        self.chunks.append(_chunk_name(len(self.chunks)))
+
+    def _close_chunk(self):
+        self._chunk.flush()
+        self._chunk = self._rows = None
+        self._write_manifest()
+
+    def _write_manifest(self):
+        manifest = {'fields': self.fields, 'dtype': self.dtype[0].str, 'chunk_size': self.chunk_size,
+                    'count': self.count, 'chunks': self.chunks}
+        with open(os.path.join(self.directory, MANIFEST), 'w') as file:
+            json.dump(manifest, file)
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("Cannot record into a closed TrajectoryRecorder")
+
+    def _position(self) -> int:
+        """Row of the next record in the current chunk, opening a new chunk when needed."""
+        position = self.count % self.chunk_size
+        if self._chunk is None:
+            self._open_chunk()
+        return position
+
+    def record(self, values):
+        """Appends one record holding a value per field."""
+        self._check_open()
+        position = self._position()
+        self._rows[position] = values
+        self.count += 1
+        if position == self.chunk_size - 1:
+            self._close_chunk()
+
+    def record_many(self, values: ndarray):
+        """Appends a block of records (n, n_fields), splitting it across chunks as needed."""
+        self._check_open()
+        values = np.asarray(values)
+        start = 0
+        while start < len(values):
+            position = self._position()
+            stop = min(len(values), start + self.chunk_size - position)
+            self._rows[position:position + stop - start] = values[start:stop]
+            self.count += stop - start
+            start = stop
+            if self.count % self.chunk_size == 0:
+                self._close_chunk()
+
+    def record_model(self, model):
+        """Appends the current state of the model the recorder was created for."""
+        if self._extract is None:
+            self._extract = model_layout(model)[1]
+        self.record(self._extract(model))
+
+    def flush(self):
+        self._check_open()
+        if self._chunk is not None:
+            self._chunk.flush()
+        self._write_manifest()
+
+    def close(self):
+        """Flushes everything and trims the last chunk to the records it actually holds."""
+        if self._chunk is not None:
+            used = self.count % self.chunk_size
+            partial = np.array(self._chunk[:used])
+            self._chunk = self._rows = None
+            np.save(os.path.join(self.directory, self.chunks[-1]), partial)
+        self._write_manifest()
+        self.closed = True
+
+
+class TrajectoryReader:
+    def __init__(self, directory: str):
+        """Zero-copy access to a recorded trajectory; chunks are memory-mapped read-only on first use."""
+        with open(os.path.join(directory, MANIFEST)) as file:
+            manifest = json.load(file)
+        self.directory = directory
+        self.fields = tuple(manifest['fields'])
+        self.chunk_size = manifest['chunk_size']
+        self.count = manifest['count']
+        self.chunk_names = manifest['chunks']
+        self._chunks: dict[int, ndarray] = {}
+
+    def __len__(self):
+        return self.count
+
+    def chunk(self, index: int) -> ndarray:
+        """Structured memory map of one chunk, limited to the recorded rows."""
+        if index not in self._chunks:
+            chunk = np.load(os.path.join(self.directory, self.chunk_names[index]), mmap_mode='r')
+            self._chunks[index] = chunk[:min(len(chunk), self.count - index * self.chunk_size)]
+        return self._chunks[index]
+
+    def chunks(self) -> Iterator[ndarray]:
+        for index in range(len(self.chunk_names)):
+            yield self.chunk(index)
+
+    def __getitem__(self, item):
+        """A single record, or a slice; slices within one chunk are zero-copy views."""
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self.count)
+            if step < 0:
+                raise ValueError("Negative slice steps are not supported")
+            if stop <= start:
+                return self.chunk(0)[:0]
+            first, last = start // self.chunk_size, (stop - 1) // self.chunk_size
+            if first == last:
+                offset = first * self.chunk_size
+                return self.chunk(first)[start - offset:stop - offset:step]
+            return np.concatenate([self.chunk(i) for i in range(first, last + 1)])[
+                   start - first * self.chunk_size:stop - first * self.chunk_size:step]
+        if item < 0:
+            item += self.count
+        if not 0 <= item < self.count:
+            raise IndexError("Record index out of range")
+        return self.chunk(item // self.chunk_size)[item % self.chunk_size]
+
+    def field(self, name: str) -> Iterator[ndarray]:
+        """Yields one field chunk by chunk, as strided views of the memory maps."""
+        for chunk in self.chunks():
+            yield chunk[name]
@@ -0,0 +1,82 @@
+import numpy as np
+from numpy import ndarray
+
+from kinematic_models.wheeled_robots.integrators import Integrator, get_integrator
+from kinematic_models.wheeled_robots.unicycle_robot import UnicycleRobot
+
+
+class UnicycleFleet:
+    def __init__(self, num_robots: int, wheel_distance: float | ndarray, wheel_diameter: float | ndarray,
+                 integrator: str | Integrator = 'euler'):
+        """
+        N differential-drive robots stored as contiguous arrays (struct-of-arrays).
+
+        Args:
+            num_robots (int): Number of robots in the fleet.
+            wheel_distance (float or ndarray): Wheel distance shared by every robot or one per robot (N,).
+            wheel_diameter (float or ndarray): Wheel diameter shared by every robot or one per robot (N,).
+            integrator (str or callable): Pose integrator, see kinematic_models.wheeled_robots.integrators.
+        """
+        if num_robots < 1:
+            raise ValueError("A fleet must have at least one robot")
+        self.num_robots = num_robots
+        self.wheel_distance = self._per_robot(wheel_distance, "Wheel distance")
+        self.wheel_diameter = self._per_robot(wheel_diameter, "Wheel diameter")
+        # Rows are x, y and theta so every coordinate is a contiguous (N,) view
+        self.pose = np.zeros((3, num_robots))
+        self.integrator = get_integrator(integrator)
+
+    def _per_robot(self, value, name) -> ndarray:
+        value = np.ascontiguousarray(np.broadcast_to(np.asarray(value, dtype=float), (self.num_robots,)))
+        if np.any(value <= 0):
+            raise ValueError(f"{name} must be a positive number")
+        return value
+
+    @classmethod
+    def from_robots(cls, robots: list[UnicycleRobot]):
+        """Builds a fleet holding the geometry and pose of existing robots, using the first robot's integrator."""
+        if len(robots) == 0:
+            raise ValueError("A fleet must have at least one robot")
+        fleet = cls(len(robots), [robot.wheel_distance for robot in robots],
+                    [robot.wheel_diameter for robot in robots], robots[0].integrator)
+        fleet.pose[:] = [[robot.x for robot in robots], [robot.y for robot in robots],
+                         [robot.theta for robot in robots]]
+        return fleet
+
+    @property
+    def x(self) -> ndarray:
+        return self.pose[0]
+
+    @property
+    def y(self) -> ndarray:
+        return self.pose[1]
+
+    @property
+    def theta(self) -> ndarray:
+        return self.pose[2]
+
+    def _motor_velocities(self, motor_angular_velocities) -> ndarray:
+        motor_angular_velocities = np.asarray(motor_angular_velocities, dtype=float)
+        if motor_angular_velocities.shape != (self.num_robots, 2):
+            raise ValueError(f"Motor angular velocities must have shape ({self.num_robots}, 2)")
+        return motor_angular_velocities
+
+    def angular_velocity(self, motor_angular_velocities) -> ndarray:
+        motor_angular_velocities = self._motor_velocities(motor_angular_velocities)
+        return (motor_angular_velocities[:, 1] - motor_angular_velocities[:, 0]) * (
+                self.wheel_diameter / 2) / self.wheel_distance
+
+    def linear_velocity(self, motor_angular_velocities) -> ndarray:
+        motor_angular_velocities = self._motor_velocities(motor_angular_velocities)
+        return (motor_angular_velocities[:, 0] + motor_angular_velocities[:, 1]) / 2 * (self.wheel_diameter / 2)
+
+    def update_position(self, motor_angular_velocities, time_step: float | ndarray):
+        """Steps every robot at once; time_step may be shared or one per robot (N,)."""
+        motor_angular_velocities = self._motor_velocities(motor_angular_velocities)
+        v = self.linear_velocity(motor_angular_velocities)
+        w = self.angular_velocity(motor_angular_velocities)
+        # Same integrator call as UnicycleRobot.update_position so both paths agree bit for bit
+        dx, dy = self.integrator(self.pose[2], v, 0, w, time_step)
+        self.pose[0] += dx
+        self.pose[1] += dy
+        self.pose[2] += w * time_step
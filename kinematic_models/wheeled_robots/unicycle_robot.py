@@ -1,8 +1,8 @@
-from numpy import cos, sin
+from kinematic_models.wheeled_robots.integrators import Integrator, get_integrator
 
 
 class UnicycleRobot:
-    def __init__(self, wheel_distance, wheel_diameter):
+    def __init__(self, wheel_distance, wheel_diameter, integrator: str | Integrator = 'euler'):
         if wheel_distance <= 0:
             raise ValueError("Wheel distance must be a positive number")
         if wheel_diameter <= 0:
@@ -12,6 +12,7 @@ class UnicycleRobot:
         self.x = 0
         self.y = 0
         self.theta = 0
+        self.integrator = get_integrator(integrator)
 
     def angular_velocity(self, motor_angular_velocities):
         if len(motor_angular_velocities) != 2:
@@ -29,6 +30,7 @@ class UnicycleRobot:
             raise ValueError("Exactly two motor angular velocities are required")
         v = self.linear_velocity(motor_angular_velocities)
         w = self.angular_velocity(motor_angular_velocities)
-        self.x += v * cos(self.theta) * time_step
-        self.y += v * sin(self.theta) * time_step
+        dx, dy = self.integrator(self.theta, v, 0, w, time_step)
+        self.x += dx
+        self.y += dy
         self.theta += w * time_step
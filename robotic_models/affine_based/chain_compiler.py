@@ -0,0 +1,228 @@
+"""
+Straight-line forward kinematics generated for a fixed link structure.
+
+The axes, offsets and frame rotations of a chain rarely change once it is built, yet KinematicChain.forward_batch
+rebuilds every joint matrix and runs full 4x4 products for each evaluation. compile_chain turns the structure into
+the source of a NumPy function instead: the fixed transforms become literals, the base transform is folded into the
+first of them, and every frame entry is expanded symbolically over the joint cosines, sines and displacements so
+that products with known zeros and ones never reach the generated code. Entries that are constant for every joint
+state are copied from a template, the others are computed once per batch on (M,) arrays.
+
+Generated functions are cached by chain signature, so chains sharing a structure share their compiled code.
+"""
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from common.batched_affine import ROTATION_INDICES, TRANSLATION_ROWS
+from common.profiling import hot_path
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+from robotic_models.affine_based.robot_link import Link, RotationalLink, TranslationalLink
+
+# Fixed-transform entries this close to 0, 1 or -1 are folded as exact values, e.g. cos(90 deg) = 6e-17
+SNAP_TOLERANCE = 1e-15
+
+
+def _link_signature(link: Link) -> tuple:
+    if isinstance(link, RotationalLink):
+        kind, degrees = 'rotational', bool(link.degrees)
+    elif isinstance(link, TranslationalLink):
+        kind, degrees = 'translational', False  # displacements have no angle unit
+    else:
+        raise ValueError(f"Cannot compile links of type {type(link).__name__}")
+    return kind, link.axis, degrees, tuple(link.fixed_transform[:3].ravel().tolist())
+
+
+def chain_signature(links: list[Link], base_transform: np.ndarray = None) -> tuple:
+    """Hashable description of everything the forward kinematics of a link list depend on, besides joint states."""
+    if len(links) == 0:
+        raise ValueError("A kinematic chain needs at least one link")
+    base = np.eye(4) if base_transform is None else np.asarray(base_transform, dtype=float)
+    return tuple(_link_signature(link) for link in links), tuple(base[:3].ravel().tolist())
+
+
+def _snap(value: float) -> float:
+    for exact in (0.0, 1.0, -1.0):
+        if abs(value - exact) <= SNAP_TOLERANCE:
+            return exact
+    return value
+
+
+# A symbolic entry maps products of symbol names, sorted tuples with () for the constant term, to their coefficient
+def _constant_matrix(matrix: np.ndarray) -> list[list[dict]]:
+    return [[{(): _snap(value)} if _snap(value) else {} for value in row] for row in matrix[:3]]
+
+
+def _matmul(left: list[list[dict]], right: list[list[dict]]) -> list[list[dict]]:
+    """Product of two symbolic affine matrices, given by their top 3x4 blocks."""
+    result = []
+    for row in left:
+        result.append([])
+        for column in range(4):
+            terms = defaultdict(float)
+            for k in range(4):
+                # The implicit bottom row of right is (0, 0, 0, 1)
+                factor = right[k][column] if k < 3 else ({(): 1.0} if column == 3 else {})
+                for left_key, left_coefficient in row[k].items():
+                    for right_key, right_coefficient in factor.items():
+                        terms[tuple(sorted(left_key + right_key))] += left_coefficient * right_coefficient
+            result[-1].append({key: coefficient for key, coefficient in terms.items() if coefficient != 0})
+    return result
+
+
+def _expression(entry: dict) -> str:
+    parts = []
+    for key, coefficient in sorted(entry.items(), key=lambda item: (len(item[0]) == 0, item[0])):
+        if not key:
+            parts.append(repr(float(coefficient)))
+        elif coefficient == 1:
+            parts.append('*'.join(key))
+        elif coefficient == -1:
+            parts.append('-' + '*'.join(key))
+        else:
+            parts.append(f"{float(coefficient)!r}*{'*'.join(key)}")
+    return ' + '.join(parts).replace('+ -', '- ')
+
+
+def _is_atom(entry: dict) -> bool:
+    """Constants and scaled single symbols, which are cheaper to fold into later products than to store."""
+    return len(entry) <= 1 and all(len(key) <= 1 for key in entry)
+
+
+def generate_source(signature: tuple, name: str = 'forward') -> tuple[str, np.ndarray]:
+    """
+    Source of the specialized forward function of a chain signature, and the frame template it fills.
+
+    The function takes joint states (M, n_links) and an output buffer (M, n_links, 4, 4), like
+    KinematicChain.forward_batch. The template (n_links, 4, 4) holds every entry that does not depend on the joint
+    states, including the bottom rows.
+    """
+    links, base = signature
+    template = np.zeros((len(links), 4, 4))
+    template[:, 3, 3] = 1
+    lines = [f"def {name}(states, out):", "    out[...] = template"]
+    stored = {}
+
+    def store(entry: dict) -> dict:
+        # Entries equal to a stored one up to their sign, common in rotation blocks, reuse its temporary
+        key = frozenset(entry.items())
+        negated = frozenset((term, -coefficient) for term, coefficient in entry.items())
+        if key in stored:
+            return {(stored[key],): 1.0}
+        if negated in stored:
+            return {(stored[negated],): -1.0}
+        stored[key] = f't{len(stored)}'
+        lines.append(f"    {stored[key]} = {_expression(entry)}")
+        return {(stored[key],): 1.0}
+
+    previous = None
+    for i, (kind, axis, degrees, fixed) in enumerate(links):
+        joint = _constant_matrix(np.eye(4))
+        if kind == 'rotational':
+            angle = f"states[:, {i}]" + (f" * {np.pi / 180!r}" if degrees else "")
+            lines += [f"    c{i} = np.cos({angle})", f"    s{i} = np.sin({angle})"]
+            (c0_row, c0_col), (ms_row, ms_col), (s_row, s_col), (c1_row, c1_col) = ROTATION_INDICES[axis]
+            joint[c0_row][c0_col] = joint[c1_row][c1_col] = {(f'c{i}',): 1.0}
+            joint[ms_row][ms_col], joint[s_row][s_col] = {(f's{i}',): -1.0}, {(f's{i}',): 1.0}
+        else:
+            lines.append(f"    d{i} = states[:, {i}]")
+            joint[TRANSLATION_ROWS[axis]][3] = {(f'd{i}',): 1.0}
+
+        fixed = np.asarray(fixed).reshape(3, 4)
+        if i == 0:
+            # The base transform is constant too, so it is folded into the first fixed transform
+            frame = _matmul(_constant_matrix(np.asarray(base).reshape(3, 4) @ np.vstack([fixed, [0, 0, 0, 1]])),
+                            joint)
+        else:
+            local = _matmul(_constant_matrix(fixed), joint)
+            # Sums in the local transform are stored once instead of being expanded in each row of the product
+            for row in local:
+                for column, entry in enumerate(row):
+                    if not _is_atom(entry):
+                        row[column] = store(entry)
+            frame = _matmul(previous, local)
+
+        for row_index, row in enumerate(frame):
+            for column, entry in enumerate(row):
+                if all(not key for key in entry):
+                    template[i, row_index, column] = entry.get((), 0.0)
+                    continue
+                if not _is_atom(entry):
+                    row[column] = entry = store(entry)
+                lines.append(f"    out[:, {i}, {row_index}, {column}] = {_expression(entry)}")
+        previous = frame
+    lines.append("    return out")
+    return '\n'.join(lines) + '\n', template
+
+
+@lru_cache(maxsize=256)
+def _compile(signature: tuple):
+    source, template = generate_source(signature)
+    namespace = {'np': np, 'template': template}
+    exec(compile(source, f'<compiled chain {hash(signature):x}>', 'exec'), namespace)
+    return namespace['forward'], source
+
+
+class CompiledChain:
+    def __init__(self, signature: tuple):
+        """
+        Specialized forward kinematics of one chain signature, see compile_chain.
+
+        Args:
+            signature (tuple): Chain signature as returned by chain_signature.
+        """
+        self.signature = signature
+        self.function, self.source = _compile(signature)
+
+    def __len__(self):
+        return len(self.signature[0])
+
+    @hot_path
+    def forward_batch(self, joint_states, out: np.ndarray = None) -> np.ndarray:
+        """
+        Base-to-link frames for M joint configurations, equal to KinematicChain.forward_batch.
+
+        Args:
+            joint_states (np.ndarray): Joint states (M, n_links), in each link's own units.
+            out (np.ndarray): Optional (M, n_links, 4, 4) buffer receiving the frames.
+
+        Returns:
+            np.ndarray: Frames (M, n_links, 4, 4).
+        """
+        joint_states = np.atleast_2d(np.asarray(joint_states, dtype=float))
+        if joint_states.ndim != 2 or joint_states.shape[1] != len(self):
+            raise ValueError(f"Joint states must have shape (M, {len(self)})")
+        shape = (len(joint_states), len(self), 4, 4)
+        if out is None:
+            out = np.empty(shape)
+        elif out.shape != shape:
+            raise ValueError(f"Output buffer must have shape {shape}")
+        return self.function(joint_states, out)
+
+    def forward(self, joint_states) -> np.ndarray:
+        """Base-to-link frames (n_links, 4, 4) for one configuration."""
+        return self.forward_batch(joint_states)[0]
+
+    def tip_transform(self, joint_states) -> np.ndarray:
+        """Base-to-tip transform (4x4) for one configuration."""
+        return self.forward(joint_states)[-1]
+
+
+def compile_chain(chain: KinematicChain | list[Link], base_transform: np.ndarray = None) -> CompiledChain:
+    """
+    Compiles the forward kinematics of a chain or of a link list for its current structure.
+
+    The result is a snapshot: after editing a link offset or frame rotation, compile again, which reuses the cached
+    code of any structure seen before.
+
+    Args:
+        chain (KinematicChain or list): Chain, or links ordered from the base to the tip.
+        base_transform (np.ndarray): Pose of the chain base (4x4); defaults to the chain's own, else identity.
+    """
+    if isinstance(chain, KinematicChain):
+        links = chain.links
+        base_transform = chain.base_transform if base_transform is None else base_transform
+    else:
+        links = list(chain)
+    return CompiledChain(chain_signature(links, base_transform))
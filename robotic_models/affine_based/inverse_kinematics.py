@@ -0,0 +1,166 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from robotic_models.affine_based.jacobian import jacobian_from_frames
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+
+
+class IKResult(NamedTuple):
+    joint_states: np.ndarray  # (K, n_links)
+    converged: np.ndarray  # (K,) bool
+    iterations: np.ndarray  # (K,) iterations spent on each target
+    position_error: np.ndarray  # (K,) distance between the tip and the target
+    orientation_error: np.ndarray  # (K,) rotation angle (radians) between the tip and the target
+
+
+def rotation_error(target_rotations: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+    """Rotation vectors (..., 3) taking rotations to target_rotations, expressed in the base frame."""
+    relative = target_rotations @ np.swapaxes(rotations, -1, -2)
+    skew = np.stack([relative[..., 2, 1] - relative[..., 1, 2],
+                     relative[..., 0, 2] - relative[..., 2, 0],
+                     relative[..., 1, 0] - relative[..., 0, 1]], axis=-1) / 2
+    cos_angle = np.clip((np.trace(relative, axis1=-2, axis2=-1) - 1) / 2, -1, 1)
+    sin_angle = np.linalg.norm(skew, axis=-1)
+    angle = np.arctan2(sin_angle, cos_angle)
+    # angle / sin(angle) tends to 1 for small rotations
+    scale = np.where(sin_angle > 1e-12, angle / np.maximum(sin_angle, 1e-12), 1.0)
+    return skew * scale[..., None]
+
+
+class BatchedIKSolver:
+    def __init__(self, chain: KinematicChain, damping=1e-2, max_iterations=100, position_tolerance=1e-6,
+                 orientation_tolerance=1e-6, orientation_weight=1.0, joint_limits: np.ndarray = None,
+                 chunk_size=4096):
+        """
+        Damped least-squares (Levenberg-Marquardt) inverse kinematics solving many targets at once.
+
+        All active targets are iterated together as NumPy batches. Each target keeps its own damping, which is
+        relaxed after an improving step and increased after a rejected one, and leaves the batch as soon as it
+        converges or its damping saturates.
+
+        Args:
+            chain (KinematicChain): The chain to solve for.
+            damping (float): Initial damping of every target.
+            max_iterations (int): Maximum iterations per target.
+            position_tolerance (float): Convergence threshold on the tip position error.
+            orientation_tolerance (float): Convergence threshold on the tip rotation error (radians).
+            orientation_weight (float): Weight of the rotation error against the position error.
+            joint_limits (np.ndarray): Optional (n_links, 2) lower and upper joint state limits.
+            chunk_size (int): Targets solved together, bounding the memory used by Jacobians and frames.
+        """
+        self.chain = chain
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.position_tolerance = position_tolerance
+        self.orientation_tolerance = orientation_tolerance
+        self.orientation_weight = orientation_weight
+        self.joint_limits = None if joint_limits is None else np.asarray(joint_limits, dtype=float)
+        self.chunk_size = chunk_size
+        self.min_damping = 1e-6
+        self.max_damping = 1e10
+
+    def _clip(self, joint_states: np.ndarray) -> np.ndarray:
+        if self.joint_limits is None:
+            return joint_states
+        return np.clip(joint_states, self.joint_limits[:, 0], self.joint_limits[:, 1])
+
+    def _evaluate(self, joint_states, target_positions, target_rotations):
+        """Weighted errors (A, 6 or 3) and matching Jacobian rows (A, 6 or 3, n) at the given states."""
+        frames = self.chain.forward_batch(joint_states)
+        jacobians = jacobian_from_frames(self.chain, frames)
+        tips = frames[:, -1]
+        position_errors = target_positions - tips[:, :3, 3]
+        if target_rotations is None:
+            return position_errors, jacobians[:, :3]
+        rotation_errors = rotation_error(target_rotations, tips[:, :3, :3])
+        errors = np.concatenate([position_errors, self.orientation_weight * rotation_errors], axis=1)
+        jacobians[:, 3:] *= self.orientation_weight
+        return errors, jacobians
+
+    def _error_norms(self, errors):
+        position = np.linalg.norm(errors[:, :3], axis=1)
+        if errors.shape[1] == 3:
+            return position, np.zeros(len(errors))
+        orientation = np.linalg.norm(errors[:, 3:], axis=1) / (self.orientation_weight or 1.0)
+        return position, orientation
+
+    def solve(self, targets: np.ndarray, initial_joint_states: np.ndarray = None) -> IKResult:
+        """
+        Solves every target.
+
+        Args:
+            targets (np.ndarray): Tip poses (K, 4, 4), or tip positions (K, 3) for position-only solving.
+            initial_joint_states (np.ndarray): Warm start (K, n_links) or (n_links,), the chain's current joint
+                states by default.
+
+        Returns:
+            IKResult: Solutions and per-target convergence information.
+        """
+        targets = np.asarray(targets, dtype=float)
+        if targets.ndim not in (2, 3) or targets.shape[1:] not in ((3,), (4, 4)):
+            raise ValueError("Targets must be poses (K, 4, 4) or positions (K, 3)")
+        if initial_joint_states is None:
+            initial_joint_states = self.chain.joint_states
+        joint_states = self._clip(np.array(np.broadcast_to(initial_joint_states, (len(targets), len(self.chain))),
+                                           dtype=float))
+
+        converged = np.zeros(len(targets), dtype=bool)
+        iterations = np.zeros(len(targets), dtype=int)
+        position_error = np.zeros(len(targets))
+        orientation_error = np.zeros(len(targets))
+        for start in range(0, len(targets), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            self._solve_chunk(targets[chunk], joint_states[chunk], converged[chunk], iterations[chunk],
+                              position_error[chunk], orientation_error[chunk])
+        return IKResult(joint_states, converged, iterations, position_error, orientation_error)
+
+    def _solve_chunk(self, targets, joint_states, converged, iterations, position_error, orientation_error):
+        """Iterates one chunk of targets, writing the results into the given views."""
+        if targets.ndim == 3:
+            target_positions, target_rotations = targets[:, :3, 3], targets[:, :3, :3]
+        else:
+            target_positions, target_rotations = targets, None
+
+        active = np.arange(len(targets))
+        states = joint_states.copy()
+        damping = np.full(len(targets), self.damping)
+        errors, jacobians = self._evaluate(states, target_positions, target_rotations)
+        norms = np.linalg.norm(errors, axis=1)
+
+        for _ in range(self.max_iterations + 1):
+            positions, orientations = self._error_norms(errors)
+            done = (positions <= self.position_tolerance) & (orientations <= self.orientation_tolerance)
+            finished = done | (damping >= self.max_damping)
+            if finished.any():
+                # Per-target early termination: store the results and shrink the active batch
+                indices = active[finished]
+                joint_states[indices] = states[finished]
+                converged[indices] = done[finished]
+                position_error[indices], orientation_error[indices] = positions[finished], orientations[finished]
+                keep = ~finished
+                active, states, damping = active[keep], states[keep], damping[keep]
+                errors, jacobians, norms = errors[keep], jacobians[keep], norms[keep]
+                target_positions = target_positions[keep]
+                target_rotations = None if target_rotations is None else target_rotations[keep]
+            if len(active) == 0 or iterations[active[0]] == self.max_iterations:
+                break
+
+            # dq = J^T (J J^T + lambda^2 I)^-1 e, solved for every active target at once
+            normal = jacobians @ np.swapaxes(jacobians, 1, 2)
+            normal[:, np.arange(errors.shape[1]), np.arange(errors.shape[1])] += damping[:, None] ** 2
+            steps = np.swapaxes(jacobians, 1, 2) @ np.linalg.solve(normal, errors[..., None])
+            trial_states = self._clip(states + steps[..., 0])
+
+            trial_errors, trial_jacobians = self._evaluate(trial_states, target_positions, target_rotations)
+            trial_norms = np.linalg.norm(trial_errors, axis=1)
+            improved = trial_norms < norms
+            states[improved], errors[improved] = trial_states[improved], trial_errors[improved]
+            jacobians[improved], norms[improved] = trial_jacobians[improved], trial_norms[improved]
+            damping = np.where(improved, np.maximum(damping / 2, self.min_damping), damping * 4)
+            iterations[active] += 1
+
+        if len(active):
+            positions, orientations = self._error_norms(errors)
+            joint_states[active] = states
+            position_error[active], orientation_error[active] = positions, orientations
@@ -0,0 +1,72 @@
+import numpy as np
+
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+from robotic_models.affine_based.robot_link import TranslationalLink
+
+_AXIS_INDEX = {'x': 0, 'y': 1, 'z': 2}
+
+
+def joint_layout(chain: KinematicChain) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-joint data needed to read Jacobian columns from the link frames.
+
+    Returns:
+        tuple: Axis index (n,), prismatic mask (n,) and the factor converting each joint unit to radians or
+        length units (n,).
+    """
+    axes = np.array([_AXIS_INDEX[link.axis[-1]] for link in chain.links])
+    prismatic = np.array([isinstance(link, TranslationalLink) for link in chain.links])
+    scale = np.array([1.0 if is_prismatic or not link.degrees else np.pi / 180
+                      for link, is_prismatic in zip(chain.links, prismatic)])
+    return axes, prismatic, scale
+
+
+def jacobian_from_frames(chain: KinematicChain, frames: np.ndarray) -> np.ndarray:
+    """
+    Geometric Jacobian of the chain tip from already computed base-to-link frames.
+
+    A joint rotation or translation leaves its own axis unchanged, so joint i acts along column axis of frame i
+    and, for rotations, about the origin of frame i. Every column therefore comes from a single sweep over the
+    frames of the forward pass.
+
+    Args:
+        chain (KinematicChain): Chain the frames belong to.
+        frames (np.ndarray): Frames (..., n_links, 4, 4) as returned by forward or forward_batch.
+
+    Returns:
+        np.ndarray: Jacobian (..., 6, n_links); rows are the linear then the angular velocity of the tip per unit
+        of joint state, in the base frame.
+    """
+    axes, prismatic, scale = joint_layout(chain)
+    columns = np.swapaxes(frames[..., :3, :3], -1, -2)
+    joint_axes = columns[..., np.arange(len(axes)), axes, :]  # (..., n, 3)
+    origins = frames[..., :3, 3]
+    tip = origins[..., -1:, :]
+
+    linear = np.where(prismatic[:, None], joint_axes, np.cross(joint_axes, tip - origins))
+    angular = np.where(prismatic[:, None], 0.0, joint_axes)
+    jacobian = np.concatenate([linear, angular], axis=-1) * scale[:, None]
+    return np.swapaxes(jacobian, -1, -2)
+
+
+def geometric_jacobian(chain: KinematicChain, joint_states=None) -> np.ndarray:
+    """Jacobian (6, n_links) for one configuration, the chain's current one by default."""
+    frames = chain.frames if joint_states is None else chain.forward(joint_states)
+    return jacobian_from_frames(chain, frames)
+
+
+def batched_geometric_jacobian(chain: KinematicChain, joint_states, return_frames=False):
+    """
+    Jacobians for M configurations.
+
+    Args:
+        chain (KinematicChain): The chain to differentiate.
+        joint_states (np.ndarray): Joint states (M, n_links).
+        return_frames (bool): Also return the (M, n_links, 4, 4) frames of the forward pass.
+
+    Returns:
+        np.ndarray: Jacobians (M, 6, n_links), and the frames when requested.
+    """
+    frames = chain.forward_batch(joint_states)
+    jacobians = jacobian_from_frames(chain, frames)
+    return (jacobians, frames) if return_frames else jacobians
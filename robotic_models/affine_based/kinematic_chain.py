@@ -0,0 +1,149 @@
+import numpy as np
+
+from robotic_models.affine_based.robot_link import Link
+
+
+class KinematicChain:
+    def __init__(self, links: list[Link], base_transform: np.ndarray = None):
+        """
+        Serial chain of links composed into a manipulator.
+
+        Each link transform is fixed_transform @ joint_transform(state); the fixed part only changes when a
+        link's offset or frame rotation is edited, so it is cached and reused for every evaluation.
+
+        Joint updates made through set_joint_state / set_joint_states are tracked with a dirty index, so that
+        reading frames only recomputes the frames downstream of the first changed joint.
+
+        Args:
+            links (list): Links ordered from the base to the tip.
+            base_transform (np.ndarray): Pose of the chain base (4x4), identity by default.
+        """
+        if len(links) == 0:
+            raise ValueError("A kinematic chain needs at least one link")
+        for link in links:
+            if type(link).joint_transforms is Link.joint_transforms:
+                raise ValueError(f"Links of type {type(link).__name__} have no joint transforms, "
+                                 f"use a RotationalLink or a TranslationalLink")
+        self.links = list(links)
+        self.base_transform = np.eye(4) if base_transform is None else np.asarray(base_transform, dtype=float)
+        self.fixed_transforms = np.array([link.fixed_transform for link in self.links])
+        self._fixed_versions = [link.fixed_transform_version for link in self.links]
+
+        self._frames = np.empty((len(self.links), 4, 4))
+        self._states = self.joint_states
+        self._dirty_from = 0  # index of the first frame that must be recomputed
+
+        self.recomputed_frames = 0
+        self.reused_frames = 0
+        self.skipped_link_updates = 0
+
+    def __len__(self):
+        return len(self.links)
+
+    @property
+    def joint_states(self) -> np.ndarray:
+        return np.array([link.state for link in self.links], dtype=float)
+
+    def reset_counters(self):
+        self.recomputed_frames = 0
+        self.reused_frames = 0
+        self.skipped_link_updates = 0
+
+    def _sync_fixed_transforms(self) -> int:
+        """Refreshes the fixed transforms of edited links, returns the first edited index (n if none)."""
+        first_changed = len(self.links)
+        for i, link in enumerate(self.links):
+            if link.fixed_transform_version != self._fixed_versions[i]:
+                self.fixed_transforms[i] = link.fixed_transform
+                self._fixed_versions[i] = link.fixed_transform_version
+                link.update_transform()
+                first_changed = min(first_changed, i)
+        return first_changed
+
+    def set_joint_state(self, index: int, state: float):
+        """Sets one joint; only frames from this joint to the tip are recomputed on the next read."""
+        self.links[index].set_state(state)
+        self._states[index] = state
+        self._dirty_from = min(self._dirty_from, index)
+
+    def set_joint_states(self, joint_states):
+        """Sets every joint, skipping the link updates of joints whose state did not change."""
+        if len(joint_states) != len(self.links):
+            raise ValueError(f"Expected {len(self.links)} joint states")
+        for i, state in enumerate(joint_states):
+            # Compared with the link itself, which may have been moved directly through Link.set_state
+            if state == self.links[i].state:
+                self.skipped_link_updates += 1
+            else:
+                self.set_joint_state(i, state)
+
+    @property
+    def frames(self) -> np.ndarray:
+        """Base-to-link frames (n_links, 4, 4) for the current joint states, updated incrementally."""
+        dirty_from = min(self._dirty_from, self._sync_fixed_transforms())
+        # Links may also have been moved directly through Link.set_state
+        for i in range(dirty_from):
+            if self.links[i].state != self._states[i]:
+                dirty_from = i
+                break
+
+        for i in range(dirty_from, len(self.links)):
+            self._states[i] = self.links[i].state
+            previous = self.base_transform if i == 0 else self._frames[i - 1]
+            np.matmul(previous, self.links[i].transform, out=self._frames[i])
+        self.recomputed_frames += len(self.links) - dirty_from
+        self.reused_frames += dirty_from
+        self._dirty_from = len(self.links)
+        return self._frames
+
+    @property
+    def tip(self) -> np.ndarray:
+        """Base-to-tip transform (4x4) for the current joint states."""
+        return self.frames[-1]
+
+    def _batched_states(self, joint_states) -> np.ndarray:
+        joint_states = np.atleast_2d(np.asarray(joint_states, dtype=float))
+        if joint_states.ndim != 2 or joint_states.shape[1] != len(self.links):
+            raise ValueError(f"Joint states must have shape (M, {len(self.links)})")
+        return joint_states
+
+    def link_transforms_batch(self, joint_states) -> np.ndarray:
+        """Local transform of every link for M joint configurations, (M, n_links, 4, 4)."""
+        joint_states = self._batched_states(joint_states)
+        self._dirty_from = min(self._dirty_from, self._sync_fixed_transforms())
+        transforms = np.empty((len(joint_states), len(self.links), 4, 4))
+        for i, link in enumerate(self.links):
+            joint = link.joint_transforms(joint_states[:, i])
+            np.matmul(self.fixed_transforms[i], joint, out=transforms[:, i])
+        return transforms
+
+    def forward_batch(self, joint_states) -> np.ndarray:
+        """
+        Base-to-link frames for M joint configurations.
+
+        Args:
+            joint_states (np.ndarray): Joint states (M, n_links), in each link's own units.
+
+        Returns:
+            np.ndarray: Frames (M, n_links, 4, 4); frame i is the pose of link i in the base frame.
+        """
+        frames = self.link_transforms_batch(joint_states)
+        np.matmul(self.base_transform, frames[:, 0], out=frames[:, 0])
+        for i in range(1, len(self.links)):
+            np.matmul(frames[:, i - 1], frames[:, i], out=frames[:, i])
+        return frames
+
+    def forward(self, joint_states=None) -> np.ndarray:
+        """Base-to-link frames (n_links, 4, 4) for one configuration, the links' current states by default."""
+        if joint_states is None:
+            joint_states = self.joint_states
+        return self.forward_batch(joint_states)[0]
+
+    def tip_transform(self, joint_states=None) -> np.ndarray:
+        """Base-to-tip transform (4x4)."""
+        return self.forward(joint_states)[-1]
+
+    def compiled(self):
+        """Straight-line forward kinematics specialized for the current link structure, see chain_compiler."""
+        from robotic_models.affine_based.chain_compiler import compile_chain
+        return compile_chain(self)
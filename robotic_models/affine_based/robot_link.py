@@ -1,9 +1,11 @@
 import numpy as np
-from scipy.spatial.transform import Rotation
 
 from common.affine import rotational_affine, translational_affine
+from common.batched_affine import rotational_affines, translational_affines
+from common.profiling import hot_path
 
 
+@hot_path
 def process_translational_offset(offset) -> np.ndarray:
     """Processes translational offset input and returns the combined translation matrix."""
     result = np.eye(4)  # Start with identity matrix
@@ -29,6 +31,15 @@ def process_translational_offset(offset) -> np.ndarray:
     return result
 
 
+@hot_path
+def extrinsic_xyz_rotations(angles, degrees=True) -> np.ndarray:
+    """Rotation matrices (..., 3, 3) of extrinsic x-y-z Euler angles (..., 3), i.e. Rz @ Ry @ Rx."""
+    angles = np.asarray(angles, dtype=float)
+    return (rotational_affines('z', angles[..., 2], degrees) @ rotational_affines('y', angles[..., 1], degrees) @
+            rotational_affines('x', angles[..., 0], degrees))[..., :3, :3]
+
+
+@hot_path
 def chained_rotations(angles: list | tuple, degrees=True) -> np.ndarray:
     """
         Calculates the resulting affine matrix from a sequence of rotations.
@@ -47,7 +58,7 @@ def chained_rotations(angles: list | tuple, degrees=True) -> np.ndarray:
         """
     axis_rotation = np.eye(4)
     if isinstance(angles[0], list):
-        rotations = Rotation.from_euler('xyz', angles, degrees=degrees).as_matrix()
+        rotations = extrinsic_xyz_rotations(angles, degrees=degrees)
         for rotation in rotations:
             axis_rotation[:3, :3] = axis_rotation[:3, :3] @ rotation
     elif isinstance(angles[0], tuple):
@@ -56,12 +67,15 @@ def chained_rotations(angles: list | tuple, degrees=True) -> np.ndarray:
     elif isinstance(angles[0], str) and len(angles) == 2:
         axis_rotation = axis_rotation @ rotational_affine(angles[0], angles[1], degrees=degrees)
     elif isinstance(angles[0], float | int) and len(angles) == 3:
-        axis_rotation[:3, :3] = Rotation.from_euler('xyz', angles, degrees=degrees).as_matrix()
+        axis_rotation[:3, :3] = extrinsic_xyz_rotations(angles, degrees=degrees)
     else:
         raise ValueError("Invalid rotation specification.")
     return axis_rotation
 
 
+VALID_AXES = ('x', 'y', 'z', 'tx', 'ty', 'tz')
+
+
 class Link:
     def __init__(self, axis, translational_offset: float | list | tuple = 0.0,
                  initial_frame_rotation: list | tuple = None, initial_state=0.0,
@@ -75,15 +89,50 @@ class Link:
             initial_frame_rotation (list): Euler angles for initial frame rotation (x, y, z).
             initial_state (float): Initial angle (radians) or displacement (units).
         """
+        if axis not in VALID_AXES:
+            raise ValueError(f"Invalid axis: {axis}")
         self.degrees = degrees
         self.axis = axis
         self.state = initial_state
         self.transform = np.eye(4)  # Initialize as identity matrix
 
+        # Memoized axis transform, rebuilt only after the offset or the frame rotation change
+        self._fixed_transform = None
+        self.fixed_transform_version = 0
+
         self.translational_offset = translational_offset
         self.initial_frame_rotation = initial_frame_rotation
         self.update_transform()
 
+    @property
+    def translational_offset(self):
+        return self._translational_offset
+
+    @translational_offset.setter
+    def translational_offset(self, offset):
+        self._translational_offset = offset
+        self._invalidate_fixed_transform()
+
+    @property
+    def initial_frame_rotation(self):
+        return self._initial_frame_rotation
+
+    @initial_frame_rotation.setter
+    def initial_frame_rotation(self, rotation):
+        self._initial_frame_rotation = rotation
+        self._invalidate_fixed_transform()
+
+    def _invalidate_fixed_transform(self):
+        self._fixed_transform = None
+        self.fixed_transform_version += 1
+
+    @property
+    def fixed_transform(self) -> np.ndarray:
+        """Constant part of the link transform, computed once per offset / frame rotation."""
+        if self._fixed_transform is None:
+            self._fixed_transform = self.axis_transform(self.degrees)
+        return self._fixed_transform
+
     def update_transform(self):
         """Abstract method to be implemented by subclasses."""
         pass
@@ -93,6 +142,7 @@ class Link:
         self.state = new_state
         self.update_transform()
 
+    @hot_path
     def axis_transform(self, degrees=True):
         # Apply the local rotation to the link's transform
         axis_rotation = np.eye(4)
@@ -102,19 +152,33 @@ class Link:
         axis_translation = process_translational_offset(self.translational_offset)
         return axis_translation @ axis_rotation
 
+    def joint_transforms(self, states, out: np.ndarray = None) -> np.ndarray:
+        """Joint-only transforms (without the fixed axis transform) for an array of states (N,)."""
+        raise NotImplementedError("Joint transforms are defined by rotational and translational links")
+
 
 class RotationalLink(Link):
+    @hot_path
     def update_transform(self):
         """Update the transformation matrix for a rotational link."""
         local_rotation = rotational_affine(self.axis, self.state, self.degrees)
 
         # Apply the local rotation to the link's transform
-        self.transform = self.axis_transform(self.degrees) @ local_rotation
+        self.transform = self.fixed_transform @ local_rotation
+
+    @hot_path
+    def joint_transforms(self, states, out: np.ndarray = None) -> np.ndarray:
+        return rotational_affines(self.axis, states, self.degrees, out=out)
 
 
 class TranslationalLink(Link):
+    @hot_path
     def update_transform(self):
         """Update the transformation matrix for a translational link."""
         local_translation = translational_affine(self.axis, self.state)
 
-        self.transform = self.axis_transform(self.degrees) @ local_translation
+        self.transform = self.fixed_transform @ local_translation
+
+    @hot_path
+    def joint_transforms(self, states, out: np.ndarray = None) -> np.ndarray:
+        return translational_affines(self.axis, states, out=out)
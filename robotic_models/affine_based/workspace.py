@@ -0,0 +1,185 @@
+"""
+Reachability and dexterity maps of kinematic chains.
+
+Random joint configurations are pushed through KinematicChain.forward_batch in fixed-size chunks and the tool
+positions are binned into a 3D voxel grid. Every voxel holds a hit count and a bitmask of the tool z-axis
+directions seen in it, taken among DIRECTION_BINS directions spread evenly on the sphere, so the grid stays compact
+whatever the number of samples.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+
+DIRECTION_BINS = 32
+MANIFEST = 'manifest.json'
+
+
+def fibonacci_directions(count: int = DIRECTION_BINS) -> np.ndarray:
+    """Unit vectors (count, 3) spread evenly on the sphere."""
+    index = np.arange(count) + 0.5
+    z = 1 - 2 * index / count
+    angle = np.pi * (3 - np.sqrt(5)) * index
+    radius = np.sqrt(1 - z ** 2)
+    return np.column_stack([radius * np.cos(angle), radius * np.sin(angle), z])
+
+
+DIRECTIONS = fibonacci_directions()
+
+
+def chunk_rng(seed: int, index: int) -> np.random.Generator:
+    """Generator of one chunk, so a map does not depend on how chunks are spread across processes."""
+    return np.random.default_rng(np.random.SeedSequence([seed, index]))
+
+
+class WorkspaceMap:
+    def __init__(self, low, high, resolution: float):
+        """
+        Voxel grid of tool positions with per-voxel counts and orientation coverage.
+
+        Args:
+            low, high: Opposite corners (3,) of the mapped box.
+            resolution (float): Voxel edge length.
+        """
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        if resolution <= 0 or np.any(self.high <= self.low):
+            raise ValueError("The map needs a positive resolution and high > low on every axis")
+        self.resolution = float(resolution)
+        self.shape = tuple(int(n) for n in np.ceil((self.high - self.low) / self.resolution))
+        self.counts = np.zeros(self.shape, dtype=np.uint32)
+        self.orientations = np.zeros(self.shape, dtype=np.uint32)  # bit d set when direction d was reached
+        self.samples = 0
+        self.outside = 0  # samples that fell outside the box
+
+    @classmethod
+    def for_chain(cls, chain: KinematicChain, joint_limits, resolution: float, samples: int = 10000,
+                  margin: float = 0.05, seed: int = 0):
+        """Map whose box encloses the tool positions of a preliminary sample, padded by a relative margin."""
+        positions = tool_poses(chain, sample_configurations(joint_limits, samples, np.random.default_rng(seed)))[0]
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        padding = np.maximum((high - low) * margin, resolution)
+        return cls(low - padding, high + padding, resolution)
+
+    def empty_like(self) -> 'WorkspaceMap':
+        return WorkspaceMap(self.low, self.high, self.resolution)
+
+    def accumulate(self, positions: np.ndarray, directions: np.ndarray):
+        """Bins tool positions (M, 3) with their unit tool directions (M, 3)."""
+        cells = np.floor((positions - self.low) / self.resolution).astype(np.intp)
+        inside = np.all((cells >= 0) & (cells < self.shape), axis=1)
+        self.samples += len(positions)
+        self.outside += int(len(positions) - inside.sum())
+        flat = np.ravel_multi_index(cells[inside].T, self.shape)
+        # Work stays proportional to the chunk, not to the grid: only the voxels hit by the chunk are touched
+        voxels, hits = np.unique(flat, return_counts=True)
+        self.counts.reshape(-1)[voxels] += hits.astype(np.uint32)
+
+        bins = np.argmax(directions[inside] @ DIRECTIONS.T, axis=1)
+        seen = np.unique(flat * DIRECTION_BINS + bins)
+        np.bitwise_or.at(self.orientations.reshape(-1), seen // DIRECTION_BINS,
+                         np.left_shift(np.uint32(1), (seen % DIRECTION_BINS).astype(np.uint32)))
+
+    def merge(self, other: 'WorkspaceMap'):
+        """Adds another map of the same grid, e.g. one computed by another process."""
+        if other.shape != self.shape or not (np.array_equal(other.low, self.low) and
+                                             other.resolution == self.resolution):
+            raise ValueError("Only maps of the same grid can be merged")
+        self.counts += other.counts
+        self.orientations |= other.orientations
+        self.samples += other.samples
+        self.outside += other.outside
+
+    @property
+    def reachable(self) -> np.ndarray:
+        return self.counts > 0
+
+    def dexterity(self) -> np.ndarray:
+        """Fraction of the direction bins reached in every voxel, (nx, ny, nz) in [0, 1]."""
+        bits = np.unpackbits(self.orientations.view(np.uint8).reshape(self.shape + (4,)), axis=-1)
+        return bits.sum(axis=-1) / DIRECTION_BINS
+
+    def voxel_centers(self, cells: np.ndarray) -> np.ndarray:
+        """Centres (..., 3) of voxel indices (..., 3)."""
+        return self.low + (np.asarray(cells) + 0.5) * self.resolution
+
+    def save(self, directory: str):
+        """Writes the grids as .npy files, which load can memory-map, next to a JSON manifest."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'counts.npy'), self.counts)
+        np.save(os.path.join(directory, 'orientations.npy'), self.orientations)
+        manifest = {'low': self.low.tolist(), 'high': self.high.tolist(), 'resolution': self.resolution,
+                    'samples': self.samples, 'outside': self.outside, 'direction_bins': DIRECTION_BINS}
+        with open(os.path.join(directory, MANIFEST), 'w') as file:
+            json.dump(manifest, file)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: str | None = 'r') -> 'WorkspaceMap':
+        """Reopens a saved map; the grids are memory-mapped unless mmap_mode is None."""
+        with open(os.path.join(directory, MANIFEST)) as file:
+            manifest = json.load(file)
+        workspace = cls(manifest['low'], manifest['high'], manifest['resolution'])
+        workspace.counts = np.load(os.path.join(directory, 'counts.npy'), mmap_mode=mmap_mode)
+        workspace.orientations = np.load(os.path.join(directory, 'orientations.npy'), mmap_mode=mmap_mode)
+        workspace.samples, workspace.outside = manifest['samples'], manifest['outside']
+        return workspace
+
+
+def sample_configurations(joint_limits, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Joint states (count, n_links) drawn uniformly within the (n_links, 2) limits."""
+    joint_limits = np.asarray(joint_limits, dtype=float)
+    return rng.uniform(joint_limits[:, 0], joint_limits[:, 1], (count, len(joint_limits)))
+
+
+def tool_poses(chain: KinematicChain, joint_states: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Tool positions (M, 3) and tool z axes (M, 3) of M configurations."""
+    tips = chain.forward_batch(joint_states)[:, -1]
+    return tips[:, :3, 3], tips[:, :3, 2]
+
+
+def _map_chunks(chain: KinematicChain, joint_limits, workspace: WorkspaceMap, chunks: range, chunk_size: int,
+                num_samples: int, seed: int) -> WorkspaceMap:
+    partial = workspace.empty_like()
+    for index in chunks:
+        count = min(chunk_size, num_samples - index * chunk_size)
+        joint_states = sample_configurations(joint_limits, count, chunk_rng(seed, index))
+        partial.accumulate(*tool_poses(chain, joint_states))
+    return partial
+
+
+def build_workspace_map(chain: KinematicChain, joint_limits, num_samples: int, workspace: WorkspaceMap,
+                        chunk_size: int = 65536, seed: int = 0, max_workers: int = 0) -> WorkspaceMap:
+    """
+    Samples configurations uniformly within the joint limits and accumulates their tool poses into a map.
+
+    Configurations are generated and evaluated chunk by chunk, so memory is bounded by chunk_size whatever
+    num_samples is, and chunk i always uses chunk_rng(seed, i), so the map is the same for any max_workers.
+
+    Args:
+        chain (KinematicChain): The manipulator.
+        joint_limits: Lower and upper state of every joint (n_links, 2), in each link's own units.
+        num_samples (int): Configurations to evaluate.
+        workspace (WorkspaceMap): Map receiving the samples (see WorkspaceMap.for_chain); it is also returned.
+        chunk_size (int): Configurations evaluated together.
+        seed (int): Base seed of the chunk generators.
+        max_workers (int): Processes sharing the chunks; 0 evaluates them in the calling process.
+    """
+    if np.shape(joint_limits) != (len(chain), 2):
+        raise ValueError(f"Joint limits must have shape ({len(chain)}, 2)")
+    num_chunks = -(-num_samples // chunk_size)
+    if max_workers == 0:
+        workspace.merge(_map_chunks(chain, joint_limits, workspace, range(num_chunks), chunk_size, num_samples,
+                                    seed))
+        return workspace
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        # Strided chunk ranges balance the work and keep one partial grid per process
+        futures = [executor.submit(_map_chunks, chain, joint_limits, workspace.empty_like(),
+                                   range(worker, num_chunks, max_workers), chunk_size, num_samples, seed)
+                   for worker in range(min(max_workers, num_chunks))]
+        for future in futures:
+            workspace.merge(future.result())
+    return workspace
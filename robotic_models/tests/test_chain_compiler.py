@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+import numpy as np
+
+from robotic_models.affine_based.chain_compiler import CompiledChain, chain_signature, compile_chain
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+from robotic_models.affine_based.robot_link import Link, RotationalLink, TranslationalLink
+from robotic_models.tests.test_kinematic_chain import build_links
+
+
+def random_states(rng: np.random.Generator, count: int) -> np.ndarray:
+    # Columns match build_links: degrees, degrees, displacement, degrees, radians
+    return np.column_stack([rng.uniform(-180, 180, count), rng.uniform(-90, 90, count), rng.uniform(0, 1, count),
+                            rng.uniform(-180, 180, count), rng.uniform(-np.pi, np.pi, count)])
+
+
+class TestChainCompiler(TestCase):
+    def setUp(self):
+        self.chain = KinematicChain(build_links())
+        self.joint_states = random_states(np.random.default_rng(3), 50)
+
+    def test_matches_forward_batch(self):
+        compiled = compile_chain(self.chain)
+        np.testing.assert_allclose(compiled.forward_batch(self.joint_states),
+                                   self.chain.forward_batch(self.joint_states), atol=1e-12)
+        np.testing.assert_allclose(compiled.tip_transform(self.joint_states[0]),
+                                   self.chain.tip_transform(self.joint_states[0]), atol=1e-12)
+
+    def test_base_transform(self):
+        base = np.eye(4)
+        base[:3, :3] = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+        base[:3, 3] = [1, 2, 3]
+        chain = KinematicChain(build_links(), base_transform=base)
+        np.testing.assert_allclose(chain.compiled().forward_batch(self.joint_states),
+                                   chain.forward_batch(self.joint_states), atol=1e-12)
+        # An explicit base overrides the chain's own
+        np.testing.assert_allclose(compile_chain(chain, np.eye(4)).forward_batch(self.joint_states),
+                                   self.chain.forward_batch(self.joint_states), atol=1e-12)
+
+    def test_all_link_kinds(self):
+        rng = np.random.default_rng(4)
+        for axes in (('x', 'y', 'z'), ('tx', 'ty', 'tz'), ('z', 'tx', 'y', 'tz', 'x')):
+            links = [TranslationalLink(axis, translational_offset=tuple(rng.uniform(-1, 1, 3)),
+                                       initial_frame_rotation=list(rng.uniform(-180, 180, 3)))
+                     if axis.startswith('t') else
+                     RotationalLink(axis, translational_offset=tuple(rng.uniform(-1, 1, 3)),
+                                    initial_frame_rotation=[('z', 90), ('x', -90)])
+                     for axis in axes]
+            chain = KinematicChain(links)
+            joint_states = rng.uniform(-180, 180, (20, len(links)))
+            np.testing.assert_allclose(compile_chain(links).forward_batch(joint_states),
+                                       chain.forward_batch(joint_states), atol=1e-12)
+
+    def test_cached_by_signature(self):
+        compiled = compile_chain(self.chain)
+        self.assertIs(compile_chain(build_links()).function, compiled.function)
+        links = build_links()
+        links[2].translational_offset = ('y', 0.4)
+        edited = compile_chain(links)
+        self.assertIsNot(edited.function, compiled.function)
+        # Compiled chains are snapshots: edits need a new compile, which matches the interpreted chain again
+        np.testing.assert_allclose(edited.forward_batch(self.joint_states),
+                                   KinematicChain(links).forward_batch(self.joint_states), atol=1e-12)
+        self.assertNotEqual(chain_signature(links), chain_signature(self.chain.links))
+
+    def test_folds_known_zeros_and_ones(self):
+        links = [RotationalLink('z'), RotationalLink('z', translational_offset=1.0), TranslationalLink('tz')]
+        source = compile_chain(links).source
+        # Planar rotations never touch the z row and column, and unit factors are not multiplied
+        self.assertNotIn(', 2] =', source.replace('out[:, 2, 2, 3] =', ''))
+        self.assertNotIn('1.0*', source)
+        self.assertNotRegex(source, r'\b0\.0\b')
+        self.assertIn('out[:, 2, 2, 3] = d2', source)
+
+    def test_output_buffer_and_shapes(self):
+        compiled = compile_chain(self.chain)
+        out = np.full((50, 5, 4, 4), np.nan)
+        self.assertIs(compiled.forward_batch(self.joint_states, out=out), out)
+        np.testing.assert_allclose(out, self.chain.forward_batch(self.joint_states), atol=1e-12)
+        self.assertEqual(compiled.forward(self.joint_states[0]).shape, (5, 4, 4))
+        with self.assertRaises(ValueError):
+            compiled.forward_batch(self.joint_states[:, :4])
+        with self.assertRaises(ValueError):
+            compiled.forward_batch(self.joint_states, out=np.empty((50, 4, 4, 4)))
+
+    def test_invalid_chains(self):
+        with self.assertRaises(ValueError):
+            compile_chain([])
+        with self.assertRaises(ValueError):
+            compile_chain([Link('z')])
+        self.assertIsInstance(compile_chain([RotationalLink('x')]), CompiledChain)
@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+import numpy as np
+
+from robotic_models.affine_based.inverse_kinematics import BatchedIKSolver, rotation_error
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+from robotic_models.affine_based.robot_link import RotationalLink
+from common.batched_affine import rotational_affines
+
+
+def build_arm():
+    return KinematicChain([RotationalLink('z', 0.3), RotationalLink('y', [0, 0, 0.5]),
+                           RotationalLink('y', [0, 0, 0.6]), RotationalLink('z', [0, 0, 0.4]),
+                           RotationalLink('y', [0, 0, 0.2]), RotationalLink('z', [0, 0, 0.1])])
+
+
+class TestBatchedIKSolver(TestCase):
+    def setUp(self):
+        self.chain = build_arm()
+        rng = np.random.default_rng(4)
+        self.solutions = rng.uniform(-120, 120, (200, 6))
+        self.targets = self.chain.forward_batch(self.solutions)[:, -1]
+        self.initial = self.solutions + rng.normal(0, 10, self.solutions.shape)
+        self.solver = BatchedIKSolver(self.chain)
+
+    def test_solves_poses(self):
+        result = self.solver.solve(self.targets, self.initial)
+        self.assertTrue(result.converged.all())
+        tips = self.chain.forward_batch(result.joint_states)[:, -1]
+        np.testing.assert_allclose(tips, self.targets, atol=1e-5)
+        self.assertTrue((result.position_error <= 1e-6).all())
+        self.assertTrue((result.orientation_error <= 1e-6).all())
+
+    def test_solves_positions(self):
+        result = self.solver.solve(self.targets[:, :3, 3], self.initial)
+        self.assertTrue(result.converged.all())
+        tips = self.chain.forward_batch(result.joint_states)[:, -1]
+        np.testing.assert_allclose(tips[:, :3, 3], self.targets[:, :3, 3], atol=1e-5)
+
+    def test_solved_targets_terminate_immediately(self):
+        result = self.solver.solve(self.targets, self.solutions)
+        self.assertTrue(result.converged.all())
+        np.testing.assert_array_equal(result.iterations, 0)
+        np.testing.assert_array_equal(result.joint_states, self.solutions)
+
+    def test_warm_start_reduces_iterations(self):
+        cold = self.solver.solve(self.targets[:, :3, 3])
+        warm = self.solver.solve(self.targets[:, :3, 3], self.solutions + 1)
+        self.assertLess(warm.iterations.sum(), cold.iterations.sum())
+
+    def test_chunks_match_single_batch(self):
+        chunked = BatchedIKSolver(self.chain, chunk_size=7).solve(self.targets, self.initial)
+        single = self.solver.solve(self.targets, self.initial)
+        np.testing.assert_allclose(chunked.joint_states, single.joint_states)
+        np.testing.assert_array_equal(chunked.iterations, single.iterations)
+
+    def test_joint_limits_are_respected(self):
+        limits = np.tile([-90.0, 90.0], (6, 1))
+        result = BatchedIKSolver(self.chain, joint_limits=limits).solve(self.targets, self.initial)
+        self.assertTrue((np.abs(result.joint_states) <= 90).all())
+
+    def test_unreachable_target_is_not_converged(self):
+        result = self.solver.solve(np.array([[10.0, 0, 0]]))
+        self.assertFalse(result.converged[0])
+        self.assertGreater(result.position_error[0], 7)
+
+    def test_invalid_targets(self):
+        self.assertRaises(ValueError, self.solver.solve, np.zeros((3, 2)))
+
+    def test_rotation_error(self):
+        rotations = rotational_affines('x', [0, 10, 170])[:, :3, :3]
+        target = rotational_affines('x', 30)[:3, :3]
+        np.testing.assert_allclose(rotation_error(target, rotations)[:, 0], np.deg2rad([30, 20, -140]))
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import numpy as np
+
+from robotic_models.affine_based.jacobian import geometric_jacobian, batched_geometric_jacobian
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+from robotic_models.tests.test_kinematic_chain import build_links
+
+
+def numerical_jacobian(chain: KinematicChain, joint_states, step=1e-6):
+    jacobian = np.zeros((6, len(joint_states)))
+    for i in range(len(joint_states)):
+        forward, backward = np.array(joint_states, dtype=float), np.array(joint_states, dtype=float)
+        forward[i] += step
+        backward[i] -= step
+        tip_forward, tip_backward = chain.tip_transform(forward), chain.tip_transform(backward)
+        jacobian[:3, i] = (tip_forward[:3, 3] - tip_backward[:3, 3]) / (2 * step)
+        rotation_rate = (tip_forward[:3, :3] - tip_backward[:3, :3]) / (2 * step)
+        skew = rotation_rate @ chain.tip_transform(joint_states)[:3, :3].T
+        jacobian[3:, i] = skew[2, 1], skew[0, 2], skew[1, 0]
+    return jacobian
+
+
+class TestJacobian(TestCase):
+    def setUp(self):
+        self.chain = KinematicChain(build_links())
+        rng = np.random.default_rng(3)
+        self.joint_states = np.column_stack([rng.uniform(-180, 180, 10), rng.uniform(-90, 90, 10),
+                                             rng.uniform(0, 1, 10), rng.uniform(-180, 180, 10),
+                                             rng.uniform(-np.pi, np.pi, 10)])
+
+    def test_matches_numerical_differentiation(self):
+        for joint_states in self.joint_states:
+            np.testing.assert_allclose(geometric_jacobian(self.chain, joint_states),
+                                       numerical_jacobian(self.chain, joint_states), atol=1e-6)
+
+    def test_current_configuration(self):
+        self.chain.set_joint_states(self.joint_states[4])
+        np.testing.assert_allclose(geometric_jacobian(self.chain),
+                                   geometric_jacobian(self.chain, self.joint_states[4]), atol=1e-12)
+
+    def test_batched_jacobian(self):
+        jacobians, frames = batched_geometric_jacobian(self.chain, self.joint_states, return_frames=True)
+        self.assertEqual(jacobians.shape, (10, 6, 5))
+        np.testing.assert_allclose(frames, self.chain.forward_batch(self.joint_states), atol=1e-12)
+        for joint_states, jacobian in zip(self.joint_states, jacobians):
+            np.testing.assert_allclose(jacobian, numerical_jacobian(self.chain, joint_states), atol=1e-6)
+
+    def test_prismatic_joint_has_no_angular_component(self):
+        jacobian = geometric_jacobian(self.chain, self.joint_states[0])
+        np.testing.assert_array_equal(jacobian[3:, 2], 0)
+        self.assertAlmostEqual(np.linalg.norm(jacobian[:3, 2]), 1)
@@ -0,0 +1,139 @@
+from unittest import TestCase
+
+import numpy as np
+
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+from robotic_models.affine_based.robot_link import RotationalLink, TranslationalLink, Link
+
+
+def build_links():
+    return [
+        RotationalLink('z', translational_offset=0.5),
+        RotationalLink('y', translational_offset=[0, 0, 1], initial_frame_rotation=[('x', 90)]),
+        TranslationalLink('tz', translational_offset=('y', 0.3)),
+        RotationalLink('x', translational_offset=[('x', 0.2), ('z', 0.1)], initial_frame_rotation=[10, 20, 30]),
+        RotationalLink('z', translational_offset=0.1, degrees=False),
+    ]
+
+
+def interpreted_frames(links, joint_states):
+    frames = []
+    for link, state in zip(links, joint_states):
+        link.set_state(state)
+        frames.append(link.transform if not frames else frames[-1] @ link.transform)
+    return np.array(frames)
+
+
+class TestKinematicChain(TestCase):
+    def setUp(self):
+        self.links = build_links()
+        self.chain = KinematicChain(self.links)
+        rng = np.random.default_rng(2)
+        self.joint_states = np.column_stack([rng.uniform(-180, 180, 20), rng.uniform(-90, 90, 20),
+                                             rng.uniform(0, 1, 20), rng.uniform(-180, 180, 20),
+                                             rng.uniform(-np.pi, np.pi, 20)])
+
+    def test_forward_matches_links(self):
+        for joint_states in self.joint_states:
+            np.testing.assert_allclose(self.chain.forward(joint_states),
+                                       interpreted_frames(self.links, joint_states), atol=1e-12)
+
+    def test_forward_uses_current_link_states(self):
+        interpreted = interpreted_frames(self.links, self.joint_states[0])
+        np.testing.assert_allclose(self.chain.forward(), interpreted, atol=1e-12)
+
+    def test_tip_transform(self):
+        tip = np.eye(4)
+        for link, state in zip(self.links, self.joint_states[3]):
+            link.set_state(state)
+            tip = tip @ link.transform
+        np.testing.assert_allclose(self.chain.tip_transform(self.joint_states[3]), tip, atol=1e-12)
+
+    def test_forward_batch(self):
+        frames = self.chain.forward_batch(self.joint_states)
+        self.assertEqual(frames.shape, (20, 5, 4, 4))
+        for joint_states, expected in zip(self.joint_states, frames):
+            np.testing.assert_allclose(interpreted_frames(self.links, joint_states), expected, atol=1e-12)
+
+    def test_base_transform(self):
+        base = np.eye(4)
+        base[:3, 3] = [1, 2, 3]
+        chain = KinematicChain(self.links, base_transform=base)
+        np.testing.assert_allclose(chain.forward_batch(self.joint_states),
+                                   base @ self.chain.forward_batch(self.joint_states), atol=1e-12)
+
+    def test_invalid_joint_states(self):
+        self.assertRaises(ValueError, self.chain.forward_batch, np.zeros((3, 4)))
+
+    def test_empty_chain(self):
+        self.assertRaises(ValueError, KinematicChain, [])
+
+    def test_base_link_has_no_joint_transform(self):
+        self.assertRaises(NotImplementedError, Link('z').joint_transforms, [0.0])
+        self.assertRaises(ValueError, KinematicChain, [RotationalLink('z'), Link('z')])
+
+
+class TestKinematicChainDirtyFlags(TestCase):
+    def setUp(self):
+        self.links = build_links()
+        self.chain = KinematicChain(self.links)
+        self.joint_states = np.array([30, -45, 0.5, 60, 1.0])
+        self.chain.set_joint_states(self.joint_states)
+        self.chain.frames
+        self.chain.reset_counters()
+
+    def test_frames_match_forward(self):
+        np.testing.assert_allclose(self.chain.frames, self.chain.forward(self.joint_states), atol=1e-12)
+
+    def test_only_downstream_frames_recomputed(self):
+        self.chain.set_joint_state(3, 10)
+        self.joint_states[3] = 10
+        np.testing.assert_allclose(self.chain.frames, self.chain.forward(self.joint_states), atol=1e-12)
+        self.assertEqual(self.chain.recomputed_frames, 2)
+        self.assertEqual(self.chain.reused_frames, 3)
+
+    def test_clean_chain_recomputes_nothing(self):
+        self.chain.frames
+        self.assertEqual(self.chain.recomputed_frames, 0)
+        self.assertEqual(self.chain.reused_frames, 5)
+
+    def test_unchanged_joints_are_skipped(self):
+        self.joint_states[1] = 20
+        self.chain.set_joint_states(self.joint_states)
+        self.assertEqual(self.chain.skipped_link_updates, 4)
+        self.chain.frames
+        self.assertEqual(self.chain.recomputed_frames, 4)
+
+    def test_direct_link_update_is_detected(self):
+        self.links[2].set_state(0.9)
+        self.joint_states[2] = 0.9
+        np.testing.assert_allclose(self.chain.tip, self.chain.tip_transform(self.joint_states), atol=1e-12)
+        self.assertEqual(self.chain.recomputed_frames, 3)
+
+    def test_set_joint_states_after_direct_link_update(self):
+        self.links[1].set_state(45)
+        self.chain.set_joint_states(self.joint_states)
+        self.assertEqual(self.links[1].state, self.joint_states[1])
+        np.testing.assert_allclose(self.chain.tip, interpreted_frames(build_links(), self.joint_states)[-1],
+                                   atol=1e-12)
+
+    def test_offset_change_invalidates_fixed_transform(self):
+        link = self.links[1]
+        cached = link.fixed_transform
+        self.assertIs(link.fixed_transform, cached)
+        link.translational_offset = [0, 0, 2]
+        self.assertIsNot(link.fixed_transform, cached)
+        np.testing.assert_allclose(link.fixed_transform, link.axis_transform(link.degrees))
+
+        expected = build_links()
+        expected[1].translational_offset = [0, 0, 2]
+        np.testing.assert_allclose(self.chain.frames, interpreted_frames(expected, self.joint_states), atol=1e-12)
+        self.assertEqual(self.chain.recomputed_frames, 4)
+
+    def test_frame_rotation_change_invalidates_fixed_transform(self):
+        self.links[0].initial_frame_rotation = [('y', 15)]
+        expected = build_links()
+        expected[0].initial_frame_rotation = [('y', 15)]
+        np.testing.assert_allclose(self.chain.forward_batch(self.joint_states)[0],
+                                   interpreted_frames(expected, self.joint_states), atol=1e-12)
+        np.testing.assert_allclose(self.chain.frames, interpreted_frames(expected, self.joint_states), atol=1e-12)
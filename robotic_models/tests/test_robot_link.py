@@ -1,8 +1,19 @@
 from unittest import TestCase
 
-from robotic_models.affine_based.robot_link import Link
+import numpy as np
+
+from robotic_models.affine_based.robot_link import Link, chained_rotations
 
 
 class TestRobotLink(TestCase):
     def test__validate_axis(self):
         self.assertRaises(ValueError, Link, 'a')
+
+    def test_chained_rotations_match_scipy(self):
+        from scipy.spatial.transform import Rotation
+        np.testing.assert_allclose(chained_rotations([10, 20, 30])[:3, :3],
+                                   Rotation.from_euler('xyz', [10, 20, 30], degrees=True).as_matrix(), atol=1e-12)
+        expected = np.eye(3)
+        for angles in ([10, 20, 30], [-40, 5, 90]):
+            expected = expected @ Rotation.from_euler('xyz', angles, degrees=True).as_matrix()
+        np.testing.assert_allclose(chained_rotations([[10, 20, 30], [-40, 5, 90]])[:3, :3], expected, atol=1e-12)
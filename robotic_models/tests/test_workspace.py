@@ -0,0 +1,106 @@
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from robotic_models.affine_based.kinematic_chain import KinematicChain
+from robotic_models.affine_based.robot_link import RotationalLink, TranslationalLink
+from robotic_models.affine_based.workspace import (DIRECTIONS, WorkspaceMap, build_workspace_map, chunk_rng,
+                                                   sample_configurations, tool_poses)
+
+
+def planar_arm() -> KinematicChain:
+    # Two links of length 1 rotating about z: tool positions fill the disc of radius 2 in the plane z = 0
+    return KinematicChain([RotationalLink('z'), RotationalLink('z', translational_offset=('x', 1.0)),
+                           TranslationalLink('tx', translational_offset=('x', 1.0))])
+
+
+PLANAR_LIMITS = [[-180, 180], [-180, 180], [0, 0]]
+
+
+class TestWorkspaceMap(TestCase):
+    def setUp(self):
+        self.chain = planar_arm()
+        self.workspace = WorkspaceMap([-2.1, -2.1, -0.05], [2.1, 2.1, 0.05], 0.1)
+
+    def test_counts_every_sample(self):
+        build_workspace_map(self.chain, PLANAR_LIMITS, 10000, self.workspace, chunk_size=1024)
+        self.assertEqual(self.workspace.samples, 10000)
+        self.assertEqual(self.workspace.outside, 0)
+        self.assertEqual(self.workspace.counts.sum(), 10000)
+        self.assertEqual(self.workspace.counts.dtype, np.uint32)
+
+    def test_planar_reach(self):
+        build_workspace_map(self.chain, PLANAR_LIMITS, 50000, self.workspace, chunk_size=8192)
+        cells = np.argwhere(self.workspace.reachable)
+        radii = np.linalg.norm(self.workspace.voxel_centers(cells)[:, :2], axis=1)
+        self.assertLessEqual(radii.max(), 2 + self.workspace.resolution)
+        # The disc is covered: voxels near the base and near full reach are both hit
+        self.assertLess(radii.min(), 0.2)
+        self.assertGreater(radii.max(), 1.9)
+        # A planar arm keeps its tool axis along z, so a single direction bin is ever reached
+        self.assertTrue(np.all(self.workspace.dexterity()[self.workspace.reachable] == 1 / len(DIRECTIONS)))
+
+    def test_matches_chunk_samples(self):
+        build_workspace_map(self.chain, PLANAR_LIMITS, 3000, self.workspace, chunk_size=1000, seed=4)
+        positions = np.concatenate([tool_poses(self.chain, sample_configurations(PLANAR_LIMITS, 1000,
+                                                                                chunk_rng(4, index)))[0]
+                                    for index in range(3)])
+        cells = np.floor((positions - self.workspace.low) / self.workspace.resolution).astype(int)
+        expected = np.zeros(self.workspace.shape, dtype=int)
+        np.add.at(expected, tuple(cells.T), 1)
+        np.testing.assert_array_equal(self.workspace.counts, expected)
+
+    def test_dexterity_counts_directions(self):
+        workspace = WorkspaceMap([0, 0, 0], [1, 1, 1], 0.5)
+        positions = np.full((len(DIRECTIONS), 3), 0.25)
+        workspace.accumulate(positions, DIRECTIONS)
+        workspace.accumulate(positions[:1], DIRECTIONS[:1])
+        self.assertEqual(workspace.counts[0, 0, 0], len(DIRECTIONS) + 1)
+        self.assertEqual(workspace.orientations[0, 0, 0], np.iinfo(np.uint32).max)
+        self.assertEqual(workspace.dexterity()[0, 0, 0], 1.0)
+        self.assertEqual(workspace.dexterity()[1, 1, 1], 0.0)
+
+    def test_outside_samples(self):
+        workspace = WorkspaceMap([0, 0, 0], [1, 1, 1], 0.5)
+        workspace.accumulate(np.array([[0.5, 0.5, 0.5], [2.0, 0.5, 0.5], [-0.1, 0, 0]]), np.tile(DIRECTIONS[0], (3, 1)))
+        self.assertEqual((workspace.samples, workspace.outside, workspace.counts.sum()), (3, 2, 1))
+
+    def test_parallel_matches_serial(self):
+        serial = build_workspace_map(self.chain, PLANAR_LIMITS, 20000, self.workspace.empty_like(),
+                                     chunk_size=2048, seed=1)
+        parallel = build_workspace_map(self.chain, PLANAR_LIMITS, 20000, self.workspace.empty_like(),
+                                       chunk_size=2048, seed=1, max_workers=2)
+        np.testing.assert_array_equal(parallel.counts, serial.counts)
+        np.testing.assert_array_equal(parallel.orientations, serial.orientations)
+        self.assertEqual(parallel.samples, serial.samples)
+
+    def test_save_and_load(self):
+        build_workspace_map(self.chain, PLANAR_LIMITS, 5000, self.workspace)
+        with tempfile.TemporaryDirectory() as directory:
+            self.workspace.save(directory)
+            loaded = WorkspaceMap.load(directory)
+            self.assertIsInstance(loaded.counts, np.memmap)
+            np.testing.assert_array_equal(loaded.counts, self.workspace.counts)
+            np.testing.assert_array_equal(loaded.orientations, self.workspace.orientations)
+            np.testing.assert_array_equal(loaded.low, self.workspace.low)
+            self.assertEqual((loaded.samples, loaded.shape), (5000, self.workspace.shape))
+            del loaded
+
+    def test_for_chain_encloses_samples(self):
+        chain = KinematicChain([RotationalLink('z', translational_offset=0.5),
+                                RotationalLink('y', translational_offset=[0, 0, 1]),
+                                TranslationalLink('tx', translational_offset=('x', 0.3))])
+        limits = [[-180, 180], [-90, 90], [0, 0.5]]
+        workspace = build_workspace_map(chain, limits, 20000, WorkspaceMap.for_chain(chain, limits, 0.1),
+                                        chunk_size=4096)
+        self.assertLess(workspace.outside / workspace.samples, 0.01)
+        self.assertGreater(workspace.dexterity().max(), 1 / len(DIRECTIONS))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            WorkspaceMap([0, 0, 0], [1, 1, 0], 0.1)
+        with self.assertRaises(ValueError):
+            build_workspace_map(self.chain, PLANAR_LIMITS[:2], 10, self.workspace)
+        with self.assertRaises(ValueError):
+            self.workspace.merge(WorkspaceMap([0, 0, 0], [1, 1, 1], 0.1))